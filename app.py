@@ -1,11 +1,17 @@
 import logging
 from src.main import load_travel_planner_agent
+from src.helper.vector_store_helper import AttractionStoreRegistry
+from src.helper.airport_index_helper import AirportIndex
 from src.tools.logger import logger  # Shared logger import
+from src.tools.metrics import start_metrics_server
 
 
 if __name__ == "__main__":
     logger.info("Application started.")
     try:
+        AttractionStoreRegistry.warm_up()
+        AirportIndex.get_shared()
+        start_metrics_server()
         load_travel_planner_agent()
         logger.info("Application executed successfully.")
     except Exception as e:
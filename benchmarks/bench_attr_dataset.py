@@ -0,0 +1,50 @@
+"""
+Cold-load benchmark for the attractions dataset.
+
+Compares the original full `read_csv` + column slice with `load_attractions`
+(memory-mapped Arrow IPC with categorical columns), reporting load time and the
+in-memory size of the resulting frame.
+
+    python -m benchmarks.bench_attr_dataset --repeat 5
+"""
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from src.helper.attr_dataset_helper import ATTR_COLUMNS, ATTR_DATA_PATH, arrow_path_for, convert_csv_to_arrow, load_attractions
+
+
+def legacy_load(csv_path):
+    """The original loader: every column parsed, then sliced down."""
+    return pd.read_csv(csv_path)[ATTR_COLUMNS]
+
+
+def time_loader(loader, csv_path, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = loader(csv_path)
+        timings.append(time.perf_counter() - start)
+    return min(timings), df
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default=ATTR_DATA_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not os.path.exists(arrow_path_for(args.data)):
+        convert_csv_to_arrow(args.data)
+
+    print(f"{'loader':<10} {'best s':>8} {'frame MB':>9}")
+    for label, loader in (("csv", legacy_load), ("arrow", load_attractions)):
+        seconds, df = time_loader(loader, args.data, args.repeat)
+        size_mb = df.memory_usage(deep=True).sum() / 1e6
+        print(f"{label:<10} {seconds:>8.3f} {size_mb:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
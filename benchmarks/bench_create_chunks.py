@@ -0,0 +1,92 @@
+"""
+Throughput benchmark for attraction chunk construction.
+
+Compares the original per-row `iterrows` builder with the columnar
+`build_city_chunks` on synthetic datasets sampled from combined.csv.
+
+    python -m benchmarks.bench_create_chunks --rows 10000 100000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.helper.attr_chunk_helper import build_city_chunks
+
+COLUMNS = ["name", "main_category", "categories", "city", "country", "state", "broader_category"]
+
+
+def legacy_create_chunks(attractions_df):
+    """The original row-by-row implementation, kept here as the baseline."""
+    grouped = attractions_df.groupby('city')
+    chunks, metadata = [], []
+
+    for city, city_df in grouped:
+        state = city_df["state"].iloc[0]
+        country = city_df["country"].iloc[0]
+
+        text = (
+            f"Tourist attractions in {city}, {state}, {country} include: " +
+            " ".join(
+                f"{row['name']} ({row['main_category']}, {row['broader_category']}) — "
+                f"{row['categories']}."
+                for _, row in city_df.iterrows()
+            )
+        )
+
+        chunks.append(text)
+        metadata.append({
+            "city": city,
+            "state": state,
+            "country": country,
+            "num_attractions": len(city_df),
+            "unique_categories": ", ".join(city_df["broader_category"].unique())
+        })
+
+    return chunks, metadata
+
+
+def make_dataset(base_df, rows, rows_per_city=50, seed=7):
+    """Sample `rows` POIs from the real data and spread them over ~rows/rows_per_city synthetic cities."""
+    rng = np.random.default_rng(seed)
+    sample = base_df.iloc[rng.integers(0, len(base_df), rows)].reset_index(drop=True)
+    num_cities = max(1, rows // rows_per_city)
+    sample["city"] = [f"City{i:06d}" for i in rng.integers(0, num_cities, rows)]
+    return sample
+
+
+def time_builder(builder, df):
+    start = time.perf_counter()
+    chunks, metadata = builder(df)
+    return time.perf_counter() - start, chunks, metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--data", default="src/Data/combined.csv")
+    parser.add_argument("--legacy-max-rows", type=int, default=1_000_000,
+                        help="skip the slow iterrows baseline above this size")
+    args = parser.parse_args()
+
+    base_df = pd.read_csv(args.data, usecols=COLUMNS).dropna(subset=["broader_category"])
+    print(f"{'rows':>10} {'cities':>8} {'legacy s':>10} {'legacy rows/s':>14} {'columnar s':>11} {'columnar rows/s':>16} {'speedup':>8}  same")
+
+    for rows in args.rows:
+        df = make_dataset(base_df, rows)
+        new_time, new_chunks, new_meta = time_builder(build_city_chunks, df)
+
+        if rows <= args.legacy_max_rows:
+            old_time, old_chunks, old_meta = time_builder(legacy_create_chunks, df)
+            same = old_chunks == new_chunks and old_meta == new_meta
+            legacy = f"{old_time:>10.2f} {rows / old_time:>14,.0f}"
+            speedup = f"{old_time / new_time:>7.1f}x"
+        else:
+            same, legacy, speedup = "n/a", f"{'skipped':>10} {'':>14}", f"{'':>8}"
+
+        print(f"{rows:>10,} {len(new_chunks):>8,} {legacy} {new_time:>11.2f} {rows / new_time:>16,.0f} {speedup}  {same}")
+
+
+if __name__ == "__main__":
+    main()
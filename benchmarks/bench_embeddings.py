@@ -0,0 +1,104 @@
+"""
+Retrieval quality and latency benchmark for attraction embedding providers.
+
+Embeds one chunk per city from combined.csv, then runs city-name queries
+(exact, lowercase, hyphen/space variants, one-letter typos and phrased
+queries) and reports recall@1, recall@5, MRR and embedding latency.
+
+    python -m benchmarks.bench_embeddings --providers local
+    python -m benchmarks.bench_embeddings --providers local azure   # needs Azure credentials
+"""
+import argparse
+import math
+import random
+import statistics
+import time
+
+import pandas as pd
+
+from src.helper.attr_chunk_helper import build_city_chunks
+from src.LLMs.embeddingprovider import EmbeddingProvider
+
+COLUMNS = ["name", "main_category", "categories", "city", "country", "state", "broader_category"]
+
+
+def make_queries(cities, seed=11):
+    """Return `(query, expected_city, kind)` triples for every city."""
+    rng = random.Random(seed)
+    queries = []
+    for city in cities:
+        spaced = city.replace("-", " ")
+        queries.append((city, city, "exact"))
+        queries.append((spaced.lower(), city, "lowercase"))
+        queries.append((f"Things to do in {spaced}", city, "phrased"))
+        if len(spaced) > 4:
+            i = rng.randrange(1, len(spaced) - 1)
+            queries.append((spaced[:i] + spaced[i + 1:], city, "typo"))
+    return queries
+
+
+def cosine_rank(query_vec, doc_vecs):
+    scores = [sum(q * d for q, d in zip(query_vec, doc)) for doc in doc_vecs]
+    return sorted(range(len(doc_vecs)), key=lambda i: -scores[i])
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def run_provider(provider, chunks, cities, queries):
+    embedding = EmbeddingProvider.get_embedding(provider)
+
+    start = time.perf_counter()
+    doc_vecs = embedding.embed_documents(chunks)
+    index_time = time.perf_counter() - start
+
+    latencies, ranks, by_kind = [], [], {}
+    for query, expected, kind in queries:
+        t0 = time.perf_counter()
+        query_vec = embedding.embed_query(query)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        order = cosine_rank(query_vec, doc_vecs)
+        rank = next(pos for pos, idx in enumerate(order, start=1) if cities[idx] == expected)
+        ranks.append(rank)
+        by_kind.setdefault(kind, []).append(rank)
+
+    return {
+        "provider": provider,
+        "docs": len(chunks),
+        "index_s": index_time,
+        "recall@1": sum(r == 1 for r in ranks) / len(ranks),
+        "recall@5": sum(r <= 5 for r in ranks) / len(ranks),
+        "mrr": statistics.fmean(1 / r for r in ranks),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "recall@1_by_kind": {k: sum(r == 1 for r in v) / len(v) for k, v in by_kind.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--providers", nargs="+", default=["local"])
+    parser.add_argument("--data", default="src/Data/combined.csv")
+    args = parser.parse_args()
+
+    chunks, metadata = build_city_chunks(pd.read_csv(args.data, usecols=COLUMNS))
+    cities = [meta["city"] for meta in metadata]
+    queries = make_queries(cities)
+    print(f"{len(chunks)} city chunks, {len(queries)} queries\n")
+
+    for provider in args.providers:
+        result = run_provider(provider, chunks, cities, queries)
+        print(
+            f"{result['provider']:>8}: recall@1 {result['recall@1']:.3f}  recall@5 {result['recall@5']:.3f}  "
+            f"MRR {result['mrr']:.3f}  query p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms  "
+            f"index {result['index_s']:.1f} s"
+        )
+        print("          recall@1 by query kind: " + ", ".join(
+            f"{kind} {value:.3f}" for kind, value in result["recall@1_by_kind"].items()
+        ))
+
+
+if __name__ == "__main__":
+    main()
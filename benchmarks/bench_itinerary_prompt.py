@@ -0,0 +1,85 @@
+"""
+Itinerary prompt size benchmark.
+
+Builds synthetic plan states for a range of trip lengths and compares the original
+prompt (`str()` of the user data and pydantic summaries, fixed 3000-token completion
+cap) with `build_itinerary_prompt` (compact lines, per-section token budgets, tiered
+completion budget). No LLM calls are made.
+
+    python -m benchmarks.bench_itinerary_prompt --days 1 3 7 14 --attractions 40
+"""
+import argparse
+import os
+
+# Offline defaults; must be set before the src modules read them at import time.
+os.environ.setdefault("EMBEDDING_PROVIDER", "local")
+os.environ.setdefault("AMADEUS_CLIENT_ID", "offline")
+os.environ.setdefault("AMADEUS_CLIENT_SECRET", "offline")
+os.environ.setdefault("SERP_API_KEY", "offline")
+os.environ.setdefault("METRICS_JSONL_PATH", "")
+
+from src.helper.itinerary_prompt_helper import ITINERARY_TEMPLATE, build_itinerary_prompt
+from src.helper.token_helper import count_tokens
+from src.nodes.attr_nodes import DestinationRecommendations, POIRecommendation
+from src.nodes.flights_nodes import FlightOption, FlightRecommendations
+from src.nodes.hotels_nodes import HotelRecommendation, HotelRecommendations
+
+LEGACY_COMPLETION_TOKENS = 3000
+
+
+def synthetic_state(num_days, flights, hotels, attractions):
+    return {
+        "user_data": {
+            "origin_city": "Mumbai", "destination_city": "Jaipur", "departure_date": "2026-12-01",
+            "return_date": None, "num_days": num_days, "num_travelers": 2, "budget": "moderate",
+            "preferences": "history, forts, local food and markets",
+        },
+        "flights": {"top_flight_summary": FlightRecommendations(recommendations=[
+            FlightOption(airline=f"AI{100 + i}", origin="BOM", destination="JAI", price=5200.0 + 150 * i,
+                         currency="INR", duration="PT1H55M", stops=i % 2)
+            for i in range(flights)
+        ])},
+        "hotels": {"top_hotel_data": HotelRecommendations(recommendations=[
+            HotelRecommendation(name=f"Heritage Haveli {i}", rating=f"{4.6 - i / 10:.1f}",
+                                address=f"{i + 12} MI Road, near Panch Batti, C-Scheme, Jaipur, Rajasthan 302001, India",
+                                price=14500.0 + 900 * i, currency="INR")
+            for i in range(hotels)
+        ])},
+        "attractions": {"top_attr_data": DestinationRecommendations(recommendations=[
+            POIRecommendation(name=f"Attraction {i} of the Pink City", category=("Cultural", "Nature", "Shopping")[i % 3])
+            for i in range(attractions)
+        ])},
+    }
+
+
+def legacy_prompt(state):
+    """The original prompt: every section formatted with `str()`."""
+    return ITINERARY_TEMPLATE.template.format(
+        num_days="N", word_budget="-",
+        user_data=state["user_data"],
+        top_flight_data=state["flights"]["top_flight_summary"],
+        top_hotel_data=state["hotels"]["top_hotel_data"],
+        top_attr_data=state["attractions"]["top_attr_data"],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="+", default=[1, 3, 7, 14])
+    parser.add_argument("--flights", type=int, default=6)
+    parser.add_argument("--hotels", type=int, default=5)
+    parser.add_argument("--attractions", type=int, default=40)
+    args = parser.parse_args()
+
+    print(f"{'days':>4} {'legacy prompt':>14} {'budgeted prompt':>16} {'legacy max out':>15} {'budgeted max out':>17}  sections")
+    for num_days in args.days:
+        state = synthetic_state(num_days, args.flights, args.hotels, args.attractions)
+        prompt = build_itinerary_prompt(state)
+        print(
+            f"{num_days:>4} {count_tokens(legacy_prompt(state)):>14} {prompt.prompt_tokens:>16} "
+            f"{LEGACY_COMPLETION_TOKENS:>15} {prompt.max_completion_tokens:>17}  {prompt.section_tokens}"
+        )
+
+
+if __name__ == "__main__":
+    main()
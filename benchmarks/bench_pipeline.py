@@ -0,0 +1,184 @@
+"""
+End-to-end planner benchmark with record/replay fakes; runs with no network.
+
+Drives the compiled graph from `GraphBuilder.setup_graph()` over a corpus of trip
+requests, with `FakeChatModel`, `FakeAmadeusClient` and `FakeGoogleSearch` (see
+benchmarks/fakes.py) in place of Azure OpenAI, Amadeus and SerpAPI. Attractions come
+from the real Chroma store using the offline "local" embedding provider.
+
+For each concurrency level it reports end-to-end latency percentiles, throughput,
+peak traced Python memory and max RSS, plus per-node / LLM / external-call latency
+percentiles from the in-process metrics registry.
+
+    python -m benchmarks.bench_pipeline --requests 30 --concurrency 1 4 16
+    python -m benchmarks.bench_pipeline --async --llm-latency-ms 1200 --token-latency-ms 20
+    python -m benchmarks.bench_pipeline --mode record --requests 5   # needs Azure, Amadeus and SerpAPI credentials
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+# Offline defaults; must be set before the src modules read them at import time.
+os.environ.setdefault("EMBEDDING_PROVIDER", "local")
+os.environ.setdefault("AMADEUS_CLIENT_ID", "offline")
+os.environ.setdefault("AMADEUS_CLIENT_SECRET", "offline")
+os.environ.setdefault("SERP_API_KEY", "offline")
+os.environ.setdefault("METRICS_JSONL_PATH", "")
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+CORPUS_PATH = os.path.join("benchmarks", "fixtures", "trip_messages.jsonl")
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+
+def load_messages(path, count):
+    with open(path, encoding="utf-8") as f:
+        messages = [json.loads(line)["message"] for line in f if line.strip()]
+    return [messages[i % len(messages)] for i in range(count)]
+
+
+def max_rss_mb():
+    if resource is None:
+        return float("nan")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def install_fakes(args):
+    """Swap the external clients for fakes and return the fake chat model."""
+    import src.tools.tools_for_hotels as tools_for_hotels
+    from benchmarks.fakes import FakeAmadeusClient, FakeChatModel, FakeGoogleSearch, Recordings
+    from src.helper.amadeus_helper import AmadeusHelper
+    from src.LLMs.openaillm import OpenAiLLM
+    from src.tools.metrics import LLMMetricsCallback
+
+    recordings = Recordings(args.recordings, mode=args.mode)
+    recording = args.mode == "record"
+
+    real_create_client = AmadeusHelper.create_client
+    real_amadeus = real_create_client(hostname="test") if recording else None
+    AmadeusHelper.create_client = staticmethod(
+        lambda hostname="test": FakeAmadeusClient(recordings, real_amadeus, latency_ms=args.amadeus_latency_ms)
+    )
+
+    FakeGoogleSearch.recordings = recordings
+    FakeGoogleSearch.real_search_cls = tools_for_hotels.GoogleSearch if recording else None
+    FakeGoogleSearch.latency_ms = args.serpapi_latency_ms
+    tools_for_hotels.GoogleSearch = FakeGoogleSearch
+
+    return FakeChatModel(
+        recordings=recordings,
+        real_llm=OpenAiLLM.get_llm_model() if recording else None,
+        latency_ms=args.llm_latency_ms,
+        token_latency_ms=args.token_latency_ms,
+        callbacks=[LLMMetricsCallback()],
+    )
+
+
+def clear_caches():
+    from src.helper.plan_cache_helper import PLAN_CACHE
+    from src.nodes.user_nodes import USER_PARSE_CACHE
+    from src.tools.tools_for_flights import FLIGHT_OFFERS_CACHE
+    from src.tools.tools_for_hotels import HOTEL_SEARCH_CACHE
+
+    for cache in (FLIGHT_OFFERS_CACHE, HOTEL_SEARCH_CACHE, USER_PARSE_CACHE, PLAN_CACHE):
+        if cache is not None:
+            cache.clear()
+
+
+def run_level(graph, messages, concurrency, use_async, warm_caches):
+    """Run every message through the graph with `concurrency` sessions in flight; return per-request seconds and wall time."""
+    def run_one(message):
+        if not warm_caches:
+            clear_caches()
+        start = time.perf_counter()
+        graph.invoke({"user_data": message})
+        return time.perf_counter() - start
+
+    async def arun_one(message, semaphore):
+        async with semaphore:
+            if not warm_caches:
+                clear_caches()
+            start = time.perf_counter()
+            await graph.ainvoke({"user_data": message})
+            return time.perf_counter() - start
+
+    async def arun_all():
+        semaphore = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(*(arun_one(message, semaphore) for message in messages))
+
+    wall_start = time.perf_counter()
+    if use_async:
+        latencies = asyncio.run(arun_all())
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = list(executor.map(run_one, messages))
+    return list(latencies), time.perf_counter() - wall_start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--async", dest="use_async", action="store_true", help="use the async graph and ainvoke")
+    parser.add_argument("--mode", choices=["replay", "record", "synthetic"], default="replay")
+    parser.add_argument("--recordings", default=os.path.join("benchmarks", "fixtures", "recordings.jsonl"))
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--token-latency-ms", type=float, default=2.0)
+    parser.add_argument("--amadeus-latency-ms", type=float, default=400.0)
+    parser.add_argument("--serpapi-latency-ms", type=float, default=600.0)
+    parser.add_argument("--warm-caches", action="store_true", help="keep response/plan caches between requests")
+    args = parser.parse_args()
+
+    from src.graphs.graph_builder import GraphBuilder
+    from src.helper.plan_cache_helper import PLAN_CACHE
+    from src.helper.vector_store_helper import AttractionStoreRegistry
+    from src.tools.metrics import METRICS
+
+    fake_llm = install_fakes(args)
+    print("Loading attraction store (first run builds the local vector DB)...", file=sys.stderr)
+    AttractionStoreRegistry.get_store()
+    graph = GraphBuilder(fake_llm, use_async=args.use_async,
+                         plan_cache=PLAN_CACHE if args.warm_caches else None).setup_graph()
+    messages = load_messages(args.corpus, args.requests)
+
+    print(f"{len(messages)} requests, mode={args.mode}, async={args.use_async}, warm caches={args.warm_caches}\n")
+    for concurrency in args.concurrency:
+        METRICS.reset()
+        tracemalloc.start()
+        latencies, wall = run_level(graph, messages, concurrency, args.use_async, args.warm_caches)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"concurrency {concurrency:>3}: e2e p50 {percentile(latencies, 50):.2f}s  p95 {percentile(latencies, 95):.2f}s  "
+            f"p99 {percentile(latencies, 99):.2f}s  throughput {len(latencies) / wall:.2f} req/s  "
+            f"peak traced {peak / 1e6:.1f} MB  max RSS {max_rss_mb():.0f} MB"
+        )
+        print(f"  {'kind':<9} {'name':<28} {'count':>5} {'p50 s':>7} {'p95 s':>7} {'errors':>6} {'tokens in/out':>14}")
+        for row in METRICS.snapshot():
+            print(
+                f"  {row['kind']:<9} {row['name']:<28} {row['count']:>5} {row['p50_s']:>7.3f} {row['p95_s']:>7.3f} "
+                f"{row['errors']:>6} {row['prompt_tokens']:>7}/{row['completion_tokens']:<6}"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
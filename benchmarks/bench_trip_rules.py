@@ -0,0 +1,90 @@
+"""
+Hit-rate and accuracy benchmark for the rule-based trip extractor.
+
+Runs `RuleBasedTripExtractor` over a labelled corpus of user messages and reports
+how many it handles without the LLM (hit rate), per-field accuracy against the
+labels on those hits, and extraction latency. Cases marked `"rule_miss": true` are
+ambiguous on purpose and should always fall through to the LLM. With `--llm`, every message is also
+sent to the structured-output LLM extractor and per-field agreement between the
+two is reported for the rule hits.
+
+    python -m benchmarks.bench_trip_rules
+    python -m benchmarks.bench_trip_rules --llm   # needs Azure credentials
+"""
+import argparse
+import json
+import time
+
+from src.helper.trip_rules_helper import RuleBasedTripExtractor
+
+CORPUS_PATH = "benchmarks/fixtures/trip_messages.jsonl"
+COMPARED_FIELDS = ["origin_city", "destination_city", "departure_date", "return_date", "num_days", "num_travelers"]
+
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def same(a, b) -> bool:
+    if isinstance(a, str) and isinstance(b, str):
+        return a.strip().lower() == b.strip().lower()
+    return a == b
+
+
+def llm_extract(message):
+    from src.LLMs.openaillm import OpenAiLLM
+    from src.nodes.user_nodes import UserNodes
+
+    nodes = UserNodes(OpenAiLLM.get_shared_llm_model(), parse_cache=None, rule_extractor=None)
+    return nodes.parse_user_input({"user_data": message})["user_data"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--llm", action="store_true", help="also compare against the LLM extractor")
+    args = parser.parse_args()
+
+    extractor = RuleBasedTripExtractor()
+    corpus = load_corpus(args.corpus)
+    hits, latencies = 0, []
+    expected_misses, unexpected_hits = 0, []
+    label_checks, label_matches = {}, {}
+    llm_checks, llm_matches = {}, {}
+
+    for case in corpus:
+        start = time.perf_counter()
+        fields, confidence = extractor.extract(case["message"])
+        latencies.append((time.perf_counter() - start) * 1000)
+        expected_misses += bool(case.get("rule_miss"))
+        if not extractor.is_confident(fields, confidence):
+            continue
+        if case.get("rule_miss"):
+            unexpected_hits.append(case["message"])
+        hits += 1
+        for field, value in case["expected"].items():
+            label_checks[field] = label_checks.get(field, 0) + 1
+            label_matches[field] = label_matches.get(field, 0) + same(fields.get(field), value)
+        if args.llm:
+            llm_fields = llm_extract(case["message"])
+            for field in COMPARED_FIELDS:
+                llm_checks[field] = llm_checks.get(field, 0) + 1
+                llm_matches[field] = llm_matches.get(field, 0) + same(fields.get(field), llm_fields.get(field))
+
+    print(f"{len(corpus)} messages, rule hit rate {hits / len(corpus):.1%}, "
+          f"mean extraction {sum(latencies) / len(latencies):.3f} ms")
+    print("accuracy vs labels on hits: " + ", ".join(
+        f"{field} {label_matches[field] / label_checks[field]:.2f}" for field in label_checks
+    ))
+    print(f"expected misses answered by the rules: {len(unexpected_hits)}/{expected_misses}")
+    for message in unexpected_hits:
+        print(f"  {message}")
+    if args.llm:
+        print("agreement with LLM on hits: " + ", ".join(
+            f"{field} {llm_matches[field] / llm_checks[field]:.2f}" for field in llm_checks
+        ))
+
+
+if __name__ == "__main__":
+    main()
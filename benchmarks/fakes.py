@@ -0,0 +1,350 @@
+"""
+Record/replay fakes for the planner's external services.
+
+- `FakeChatModel` stands in for `AzureChatOpenAI`, including `with_structured_output`
+  and token streaming.
+- `FakeAmadeusClient` stands in for the Amadeus `Client` (airport lookup and flight
+  offers search).
+- `FakeGoogleSearch` stands in for SerpAPI's `GoogleSearch` (Google Hotels).
+
+Each fake has a configurable synthetic latency and shares a `Recordings` store:
+
+- "replay" serves recorded responses and synthesizes deterministic ones for misses,
+  so it runs with no network;
+- "record" calls the real service and appends its response to the recordings file;
+- "synthetic" ignores recordings entirely.
+"""
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import date, timedelta
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+from src.helper.trip_rules_helper import RuleBasedTripExtractor
+
+RECORDINGS_PATH = os.path.join("benchmarks", "fixtures", "recordings.jsonl")
+
+
+def _sleep_ms(latency_ms, jitter=0.2, rng=random):
+    if latency_ms > 0:
+        time.sleep(latency_ms * (1 + rng.uniform(-jitter, jitter)) / 1000)
+
+
+def _prompt_text(value) -> str:
+    if hasattr(value, "to_string"):
+        return value.to_string()
+    if isinstance(value, list):
+        return "\n".join(str(getattr(m, "content", m)) for m in value)
+    return str(value)
+
+
+class Recordings:
+    """Thread-safe JSONL store of service responses keyed by a hash of the request."""
+
+    def __init__(self, path=RECORDINGS_PATH, mode="replay"):
+        self.path = path
+        self.mode = mode
+        self._entries = {}
+        self._lock = threading.Lock()
+        if mode == "replay" and path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry["value"]
+
+    @staticmethod
+    def key(service, request) -> str:
+        payload = json.dumps({"service": service, "request": request}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, service, request):
+        if self.mode != "replay":
+            return None
+        return self._entries.get(self.key(service, request))
+
+    def put(self, service, request, value):
+        if self.mode != "record":
+            return
+        key = self.key(service, request)
+        with self._lock:
+            self._entries[key] = value
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "service": service, "value": value}, default=str) + "\n")
+
+
+# ---------------------------------------------------------------------------
+# LLM
+# ---------------------------------------------------------------------------
+
+_RULES = None
+
+
+def _rules():
+    global _RULES
+    if _RULES is None:
+        _RULES = RuleBasedTripExtractor()
+    return _RULES
+
+
+def _synthetic_user_details(prompt):
+    message = prompt.split("User message:", 1)[-1].strip()
+    fields, _ = _rules().extract(message)
+    start = date(2026, 3, 2)
+    fields["destination_city"] = fields["destination_city"] or "Goa"
+    fields["origin_city"] = fields["origin_city"] or "Mumbai"
+    fields["num_days"] = fields["num_days"] or 4
+    fields["departure_date"] = fields["departure_date"] or start.isoformat()
+    fields["return_date"] = fields["return_date"] or (
+        date.fromisoformat(fields["departure_date"]) + timedelta(days=fields["num_days"] - 1)
+    ).isoformat()
+    fields["preferences"] = fields["preferences"] or "sightseeing"
+    return fields
+
+
+def _context_names(prompt):
+    """Names from '- Name (...' or '- Name | ...' candidate lines in the prompt."""
+    return [m.strip() for m in re.findall(r"^\s*-\s+([^(|\n]+?)\s*[(|]", prompt, flags=re.M)]
+
+
+def _sample_value(annotation, field_name, index, names):
+    if field_name == "name" and names:
+        return names[index % len(names)]
+    if annotation in (int,):
+        return index % 2
+    if annotation in (float,):
+        return round(100.0 + 37.5 * index, 2)
+    if field_name == "rating":
+        return "4.3"
+    if field_name == "duration":
+        return "PT2H10M"
+    if field_name == "currency":
+        return "USD"
+    return f"{field_name.replace('_', ' ').title()} {index + 1}"
+
+
+def synthesize_structured(schema, prompt, items=5):
+    """Deterministic instance of a pydantic `schema`, using prompt content where it helps."""
+    if schema.__name__ == "UserDetails":
+        return schema(**_synthetic_user_details(prompt))
+
+    names = _context_names(prompt)
+    values = {}
+    for field_name, field in schema.model_fields.items():
+        args = getattr(field.annotation, "__args__", ())
+        item_model = args[0] if args and hasattr(args[0], "model_fields") else None
+        if item_model is not None:
+            values[field_name] = [
+                item_model(**{
+                    name: _sample_value(f.annotation, name, i, names) for name, f in item_model.model_fields.items()
+                })
+                for i in range(items)
+            ]
+        else:
+            values[field_name] = _sample_value(field.annotation, field_name, 0, names)
+    return schema(**values)
+
+
+def synthesize_itinerary(prompt, days=None):
+    match = re.search(r"'?num_days'?: (\d+)", prompt)
+    days = days or (int(match.group(1)) if match else 4)
+    names = _context_names(prompt) or ["the old town", "the city museum", "the central market"]
+    sections = []
+    for day in range(1, days + 1):
+        picks = [names[(day * 3 + i) % len(names)] for i in range(3)]
+        sections.append(
+            f"## Day {day}\n"
+            + "".join(f"- **{name}**: spend about two hours exploring; take a short cab ride to the next stop.\n"
+                      for name in picks)
+            + "- *Tip:* start early to avoid crowds and keep the evening free for local food.\n"
+        )
+    return "# Final Itinerary\n\n" + "\n".join(sections) + f"\n**Total travel time:** about {days * 2} hours.\n"
+
+
+class FakeChatModel(BaseChatModel):
+    """Offline `AzureChatOpenAI` stand-in with record/replay, synthetic latency and token streaming."""
+
+    recordings: Any = None
+    real_llm: Any = None
+    latency_ms: float = 800.0
+    token_latency_ms: float = 15.0
+    seed: int = 7
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-azure-chat"
+
+    def _text_response(self, prompt):
+        request = {"prompt": prompt}
+        text = self.recordings.get("llm.text", request) if self.recordings else None
+        if text is None and self.real_llm is not None:
+            text = self.real_llm.invoke(prompt).content
+            self.recordings.put("llm.text", request, text)
+        return text if text is not None else synthesize_itinerary(prompt)
+
+    @staticmethod
+    def _usage(prompt, text):
+        prompt_tokens, completion_tokens = len(prompt) // 4, len(text) // 4
+        return {"input_tokens": prompt_tokens, "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens}
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = _prompt_text(messages)
+        _sleep_ms(self.latency_ms)
+        text = self._text_response(prompt)
+        message = AIMessage(content=text, usage_metadata=self._usage(prompt, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = _prompt_text(messages)
+        text = self._text_response(prompt)
+        # Time to first token is the full call latency, as in `_generate`; decoding adds per-token time
+        _sleep_ms(self.latency_ms)
+        tokens = re.findall(r"\S+\s*|\s+", text)
+        for token in tokens:
+            _sleep_ms(self.token_latency_ms, jitter=0.5)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+        yield ChatGenerationChunk(message=AIMessageChunk(content="", usage_metadata=self._usage(prompt, text)))
+
+    def _structured(self, schema, value):
+        prompt = _prompt_text(value)
+        request = {"schema": schema.__name__, "prompt": prompt}
+        _sleep_ms(self.latency_ms)
+        recorded = self.recordings.get("llm.structured", request) if self.recordings else None
+        if recorded is not None:
+            return schema(**recorded)
+        if self.real_llm is not None:
+            result = self.real_llm.with_structured_output(schema).invoke(value)
+            self.recordings.put("llm.structured", request, result.model_dump())
+            return result
+        return synthesize_structured(schema, prompt)
+
+    def with_structured_output(self, schema, **kwargs):
+        return RunnableLambda(lambda value: self._structured(schema, value), name=f"fake_structured_{schema.__name__}")
+
+
+# ---------------------------------------------------------------------------
+# Amadeus
+# ---------------------------------------------------------------------------
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Endpoint:
+    def __init__(self, handler):
+        self.get = handler
+
+
+class FakeAmadeusClient:
+    """Offline Amadeus `Client` with `reference_data.locations` and `shopping.flight_offers_search`."""
+
+    def __init__(self, recordings=None, real_client=None, latency_ms=600.0):
+        self.recordings = recordings
+        self.real_client = real_client
+        self.latency_ms = latency_ms
+        self.reference_data = type("ReferenceData", (), {})()
+        self.reference_data.locations = _Endpoint(self._locations)
+        self.shopping = type("Shopping", (), {})()
+        self.shopping.flight_offers_search = _Endpoint(self._flight_offers)
+
+    def _replay(self, service, request, live_call, synthesize):
+        _sleep_ms(self.latency_ms)
+        recorded = self.recordings.get(service, request) if self.recordings else None
+        if recorded is not None:
+            return _Response(recorded)
+        if self.real_client is not None:
+            data = live_call().data
+            self.recordings.put(service, request, data)
+            return _Response(data)
+        return _Response(synthesize())
+
+    def _locations(self, **params):
+        return self._replay(
+            "amadeus.locations", params,
+            lambda: self.real_client.reference_data.locations.get(**params),
+            lambda: [{"iataCode": re.sub(r"[^A-Z]", "", (params.get("keyword") or "XXX").upper())[:3] or "XXX"}]
+        )
+
+    def _flight_offers(self, **params):
+        def synthesize():
+            rng = random.Random(json.dumps(params, sort_keys=True))
+            offers = []
+            for _ in range(params.get("max", 10)):
+                stops = rng.choice([0, 0, 1, 1, 2])
+                minutes = rng.randint(70, 300) + stops * 90
+                depart = f"{params['departureDate']}T{rng.randint(5, 22):02d}:{rng.choice(['00', '15', '30', '45'])}:00"
+                segments = [
+                    {"departure": {"iataCode": params["originLocationCode"] if i == 0 else "HUB", "at": depart},
+                     "arrival": {"iataCode": params["destinationLocationCode"] if i == stops else "HUB", "at": depart},
+                     "carrierCode": rng.choice(["AI", "6E", "UK", "SG", "EK"])}
+                    for i in range(stops + 1)
+                ]
+                offers.append({
+                    "price": {"total": f"{rng.uniform(60, 600):.2f}", "currency": params.get("currencyCode", "USD")},
+                    "itineraries": [{"duration": f"PT{minutes // 60}H{minutes % 60}M", "segments": segments}],
+                })
+            return offers
+
+        return self._replay(
+            "amadeus.flight_offers", params,
+            lambda: self.real_client.shopping.flight_offers_search.get(**params),
+            synthesize
+        )
+
+
+# ---------------------------------------------------------------------------
+# SerpAPI
+# ---------------------------------------------------------------------------
+
+class FakeGoogleSearch:
+    """Offline SerpAPI `GoogleSearch` for the google_hotels engine. Configure via class attributes."""
+
+    recordings = None
+    real_search_cls = None
+    latency_ms = 900.0
+
+    def __init__(self, params):
+        self.params = params
+
+    def _request(self):
+        return {k: v for k, v in self.params.items() if k != "api_key"}
+
+    def get_dict(self):
+        _sleep_ms(self.latency_ms)
+        request = self._request()
+        recorded = self.recordings.get("serpapi.google_hotels", request) if self.recordings else None
+        if recorded is not None:
+            return recorded
+        if self.real_search_cls is not None:
+            result = self.real_search_cls(self.params).get_dict()
+            self.recordings.put("serpapi.google_hotels", request, result)
+            return result
+
+        rng = random.Random(json.dumps(request, sort_keys=True))
+        city = self.params.get("q", "City")
+        return {"properties": [
+            {
+                "name": f"{city} {rng.choice(['Grand', 'Residency', 'Inn', 'Palace', 'Suites'])} {i + 1}",
+                "overall_rating": round(rng.uniform(3.0, 4.9), 1),
+                "address": f"{rng.randint(1, 200)} Main Road, {city}",
+                "description": "Comfortable rooms, free wifi, breakfast included, close to the city centre. " * 3,
+                "total_rate": {"extracted_lowest": round(rng.uniform(80, 900), 2)},
+                "amenities": ["Free Wi-Fi", "Pool", "Air conditioning", "Restaurant", "Parking"],
+                "images": [{"thumbnail": f"https://example.invalid/{i}/{j}.jpg"} for j in range(5)],
+            }
+            for i in range(20)
+        ]}
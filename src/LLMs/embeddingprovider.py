@@ -0,0 +1,44 @@
+import os
+
+from src.LLMs.openaillm import OpenAiLLM
+from src.LLMs.localembedding import HashedNgramEmbeddings
+from src.tools.logger import logger
+
+# "azure" uses the Azure OpenAI deployment; "local" uses the offline hashed n-gram model.
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "azure")
+
+
+class EmbeddingProvider:
+    """
+    Pluggable source of LangChain `Embeddings` for the attraction retriever.
+
+    Providers are registered by name; each one gets its own vector DB directory because
+    embedding dimensions differ between models.
+    """
+
+    _factories = {
+        "azure": OpenAiLLM.get_llm_embedding,
+        "local": HashedNgramEmbeddings,
+    }
+
+    @classmethod
+    def register(cls, name, factory):
+        """Register a zero-argument factory returning an `Embeddings` instance."""
+        cls._factories[name] = factory
+
+    @classmethod
+    def available(cls):
+        return sorted(cls._factories)
+
+    @classmethod
+    def get_embedding(cls, provider=None):
+        provider = provider or EMBEDDING_PROVIDER
+        if provider not in cls._factories:
+            raise ValueError(f"Unknown embedding provider '{provider}'. Available: {cls.available()}")
+        logger.info(f"Initializing '{provider}' embedding provider...")
+        return cls._factories[provider]()
+
+    @staticmethod
+    def get_vector_db_path(provider=None):
+        provider = provider or EMBEDDING_PROVIDER
+        return "./vector_db/" if provider == "azure" else f"./vector_db_{provider}/"
@@ -0,0 +1,63 @@
+import hashlib
+import math
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from src.helper.place_name_helper import normalize_place_name
+
+
+class HashedNgramEmbeddings(Embeddings):
+    """
+    CPU-only, offline embedding model based on the hashing trick.
+
+    Each text is broken into word tokens and character n-grams (of padded words), each
+    feature is hashed into one of `dimensions` buckets with a signed hash, counts are
+    log-scaled and the vector is L2-normalized. Features in the leading clause (up to the
+    first ':' within `head_chars`, e.g. "Tourist attractions in Pune, Maharashtra, India include:")
+    are weighted by `head_weight` so a long chunk still points at what it is about.
+    No model files or network are needed and the output is stable across processes.
+    """
+
+    def __init__(self, dimensions=512, ngram_range=(3, 4), word_weight=2.0, head_weight=8.0, head_chars=200):
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+        self.word_weight = word_weight
+        self.head_weight = head_weight
+        self.head_chars = head_chars
+
+    def _word_features(self, text, scale):
+        for word in normalize_place_name(text).split():
+            yield f"w:{word}", self.word_weight * scale
+            padded = f" {word} "
+            for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+                for i in range(max(1, len(padded) - n + 1)):
+                    yield f"{n}:{padded[i:i + n]}", scale
+
+    def _features(self, text):
+        split_at = text.find(":", 0, self.head_chars)
+        if split_at == -1:
+            yield from self._word_features(text, 1.0)
+            return
+        yield from self._word_features(text[:split_at], self.head_weight)
+        yield from self._word_features(text[split_at + 1:], 1.0)
+
+    def _embed(self, text) -> List[float]:
+        buckets = {}
+        for feature, weight in self._features(text):
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            index = digest % self.dimensions
+            sign = 1.0 if digest >> 63 else -1.0
+            buckets[index] = buckets.get(index, 0.0) + sign * weight
+
+        vector = [0.0] * self.dimensions
+        for index, value in buckets.items():
+            vector[index] = math.copysign(math.log1p(abs(value)), value)
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
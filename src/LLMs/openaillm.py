@@ -1,8 +1,11 @@
 from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
 import os
+import threading
 from dotenv import load_dotenv
 
 from src.tools.logger import logger
+from src.tools.metrics import LLMMetricsCallback
+from src.helper.rate_limit_helper import RateLimiterRegistry
 
 load_dotenv()
 
@@ -19,23 +22,39 @@ env_vars = [
 for var in env_vars:
     if not os.getenv(var):
         logger.warning(f"Environment Variable Missing: {var}")
-    os.environ[var] = os.getenv(var)  # retain your existing approach
+    else:
+        os.environ[var] = os.getenv(var)  # retain your existing approach
 
 
 class OpenAiLLM:
+    _shared_models = {}
+    _shared_models_lock = threading.Lock()
 
     @staticmethod
-    def get_llm_model():
+    def get_model_config(temperature=0, max_tokens=1000):
+        """Settings that identify a chat model; used as the cache key for shared clients."""
+        return {
+            "azure_deployment": os.environ["AZURE_DEPLOYMENT_NAME"],
+            "api_version": os.environ["AZURE_OPENAI_API_VERSION"],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+
+    @staticmethod
+    def get_llm_model(temperature=0, max_tokens=1000):
         logger.info("Initializing AzureChatOpenAI LLM model...")
         try:
             llm = AzureChatOpenAI(
                 api_key=os.environ["AZURE_OPENAI_API_KEY"],
                 azure_deployment=os.environ["AZURE_DEPLOYMENT_NAME"],
                 api_version=os.environ["AZURE_OPENAI_API_VERSION"],
-                temperature=0,
-                max_tokens=1000,
+                temperature=temperature,
+                max_tokens=max_tokens,
                 timeout=None,
-                max_retries=2
+                max_retries=2,
+                stream_usage=True,
+                callbacks=[LLMMetricsCallback()],
+                rate_limiter=RateLimiterRegistry.get("azure_openai")
             )
             logger.info("✅ AzureChatOpenAI model initialized successfully")
             return llm
@@ -44,6 +63,19 @@ class OpenAiLLM:
             logger.error("❌ Failed to initialize AzureChatOpenAI model", exc_info=True)
             raise
 
+    @classmethod
+    def get_shared_llm_model(cls, temperature=0, max_tokens=1000):
+        """Return a process-wide chat model client for the given config, creating it once."""
+        key = tuple(sorted(cls.get_model_config(temperature, max_tokens).items()))
+        llm = cls._shared_models.get(key)
+        if llm is None:
+            with cls._shared_models_lock:
+                llm = cls._shared_models.get(key)
+                if llm is None:
+                    llm = cls.get_llm_model(temperature, max_tokens)
+                    cls._shared_models[key] = llm
+        return llm
+
     @staticmethod
     def get_llm_embedding():
         logger.info("Initializing Azure embeddings model...")
@@ -0,0 +1,49 @@
+import asyncio
+
+from src.graphs.graph_registry import GraphRegistry
+from src.tools.logger import logger
+from src.tools.metrics import new_run_id
+
+
+class AsyncTravelPlannerRunner:
+    """
+    Runs the async travel planner graph with `graph.astream`.
+
+    A single event loop can serve many itinerary requests at once; `max_concurrency`
+    bounds how many graph runs are in flight together.
+    """
+
+    def __init__(self, graph=None, max_concurrency=16):
+        self.graph = graph or GraphRegistry.get_graph(use_async=True)
+        self.max_concurrency = max_concurrency
+        logger.info("AsyncTravelPlannerRunner initialized (max_concurrency=%s)", max_concurrency)
+
+    async def arun(self, user_message: str) -> dict:
+        """Stream one request through the graph and return the final state."""
+        run_id = new_run_id()
+        logger.info(f"Async graph run {run_id} started")
+        final_state = {}
+        async for event in self.graph.astream({"user_data": user_message}):
+            for key, value in event.items():
+                if isinstance(value, dict):
+                    final_state.update(value)
+                logger.debug(f"Async graph step completed: {key}")
+        return final_state
+
+    async def arun_many(self, user_messages) -> list:
+        """Run many requests concurrently on the current event loop."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _run_one(message):
+            async with semaphore:
+                try:
+                    return await self.arun(message)
+                except Exception as e:
+                    logger.exception(f"❌ Async itinerary run failed: {e}")
+                    return {"error": str(e)}
+
+        return await asyncio.gather(*(_run_one(message) for message in user_messages))
+
+    def run_many(self, user_messages) -> list:
+        """Blocking entry point for callers without an event loop."""
+        return asyncio.run(self.arun_many(user_messages))
@@ -0,0 +1,232 @@
+"""
+Headless batch itinerary planning over a JSONL file of trip messages.
+
+    python -m src.graphs.batch_runner trips.jsonl --output itineraries.jsonl --concurrency 16 \
+        --azure-rps 5 --amadeus-rps 8 --serpapi-rps 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import threading
+import time
+
+from src.graphs.async_runner import AsyncTravelPlannerRunner
+from src.helper.rate_limit_helper import RateLimiterRegistry
+from src.tools.logger import logger
+
+PARQUET_FLUSH_ROWS = 200
+
+
+def iter_requests(path, field="message"):
+    """Yield `(request_id, message)` from a JSONL file; ids default to the line number."""
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            message = record.get(field) or record.get("body") or record.get("message")
+            if not message:
+                logger.warning(f"⚠️ Skipping line {line_no}: no '{field}' field")
+                continue
+            yield str(record.get("id") or record.get("request_id") or line_no), message
+
+
+def _to_plain(value):
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, dict):
+        return {k: _to_plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_plain(v) for v in value]
+    return value
+
+
+def result_row(request_id, message, state, seconds, error=None) -> dict:
+    state = state or {}
+    return {
+        "id": request_id,
+        "message": message,
+        "status": "error" if error else "ok",
+        "error": error,
+        "seconds": round(seconds, 3),
+        "user_data": _to_plain(state.get("user_data")),
+        "top_flights": _to_plain((state.get("flights") or {}).get("top_flight_summary")),
+        "top_hotels": _to_plain((state.get("hotels") or {}).get("top_hotel_data")),
+        "top_attractions": _to_plain((state.get("attractions") or {}).get("top_attr_data")),
+        "final_itinerary": state.get("final_itinerary"),
+    }
+
+
+class JsonlResultWriter:
+    """Appends one JSON line per finished request and flushes it, so the output doubles as the checkpoint."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def completed_ids(self) -> set:
+        if not os.path.exists(self.path):
+            return set()
+        done = set()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn last line from an interrupted run
+                if row.get("status") == "ok":
+                    done.add(row["id"])
+        return done
+
+    def write(self, row):
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(row, default=str) + "\n")
+            f.flush()
+
+    def close(self):
+        pass
+
+
+class ParquetResultWriter:
+    """Buffers rows and writes them as numbered part files in a directory; each part is a checkpoint."""
+
+    def __init__(self, path, flush_rows=PARQUET_FLUSH_ROWS):
+        self.path = path
+        self.flush_rows = flush_rows
+        self._rows = []
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    def completed_ids(self) -> set:
+        import pyarrow.parquet as pq
+
+        done = set()
+        for name in sorted(os.listdir(self.path)):
+            if name.endswith(".parquet"):
+                table = pq.read_table(os.path.join(self.path, name), columns=["id", "status"])
+                done.update(i for i, s in zip(table["id"].to_pylist(), table["status"].to_pylist()) if s == "ok")
+        return done
+
+    def _flush(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not self._rows:
+            return
+        # Nested fields are stored as JSON text so parts always share one schema
+        rows = [{k: json.dumps(v, default=str) if isinstance(v, (dict, list)) else v for k, v in row.items()}
+                for row in self._rows]
+        part = len([n for n in os.listdir(self.path) if n.endswith(".parquet")])
+        tmp_path = os.path.join(self.path, f"part-{part:05d}.parquet.tmp")
+        pq.write_table(pa.Table.from_pylist(rows), tmp_path)
+        os.replace(tmp_path, tmp_path[:-len(".tmp")])
+        self._rows = []
+
+    def write(self, row):
+        with self._lock:
+            self._rows.append(row)
+            if len(self._rows) >= self.flush_rows:
+                self._flush()
+
+    def close(self):
+        with self._lock:
+            self._flush()
+
+
+class BatchItineraryRunner:
+    """
+    Streams a JSONL file of trip messages through the async travel graph.
+
+    At most `max_concurrency` requests are in flight, external calls share the
+    per-provider limiters in `RateLimiterRegistry`, and each finished request is written
+    out immediately. Requests already written with status "ok" are skipped, so an
+    interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, writer, graph=None, max_concurrency=8):
+        self.writer = writer
+        self.max_concurrency = max_concurrency
+        self.runner = AsyncTravelPlannerRunner(graph=graph, max_concurrency=max_concurrency)
+
+    async def _run_one(self, request_id, message, semaphore, latencies, counts):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                state = await self.runner.arun(message)
+                row = result_row(request_id, message, state, time.perf_counter() - start)
+                counts["ok"] += 1
+                latencies.append(row["seconds"])
+            except Exception as e:
+                logger.exception(f"❌ Batch request {request_id} failed: {e}")
+                row = result_row(request_id, message, None, time.perf_counter() - start, error=str(e))
+                counts["error"] += 1
+            self.writer.write(row)
+
+    async def arun(self, requests) -> dict:
+        done = self.writer.completed_ids()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        latencies, counts = [], {"ok": 0, "error": 0, "skipped": 0}
+        pending = set()
+        start = time.perf_counter()
+
+        for request_id, message in requests:
+            if request_id in done:
+                counts["skipped"] += 1
+                continue
+            # Keep the task set bounded so huge input files are streamed, not loaded
+            if len(pending) >= self.max_concurrency * 4:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.add(asyncio.create_task(self._run_one(request_id, message, semaphore, latencies, counts)))
+        if pending:
+            await asyncio.wait(pending)
+        self.writer.close()
+
+        wall = time.perf_counter() - start
+        processed = counts["ok"] + counts["error"]
+        report = {
+            **counts,
+            "wall_seconds": round(wall, 2),
+            "throughput_per_min": round(60 * processed / wall, 2) if wall else 0.0,
+            "p50_seconds": round(statistics.median(latencies), 2) if latencies else None,
+            "p95_seconds": round(sorted(latencies)[int(0.95 * (len(latencies) - 1))], 2) if latencies else None,
+        }
+        logger.info(f"📦 Batch run finished: {report}")
+        return report
+
+    def run(self, requests) -> dict:
+        return asyncio.run(self.arun(requests))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL file with one trip message per line")
+    parser.add_argument("--output", default="itineraries.jsonl", help="JSONL file, or a directory for --format parquet")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--field", default="message", help="JSON field holding the trip message")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--azure-rps", type=float, default=None,
+                        help="Azure OpenAI requests/s, 0 = unlimited (default: RATE_LIMIT_AZURE_OPENAI_RPS)")
+    parser.add_argument("--amadeus-rps", type=float, default=None,
+                        help="Amadeus requests/s, 0 = unlimited (default: RATE_LIMIT_AMADEUS_RPS)")
+    parser.add_argument("--serpapi-rps", type=float, default=None,
+                        help="SerpAPI requests/s, 0 = unlimited (default: RATE_LIMIT_SERPAPI_RPS)")
+    args = parser.parse_args()
+
+    # Limiters must exist before the LLM client is created; unset flags keep the env rates
+    rates = {"azure_openai": args.azure_rps, "amadeus": args.amadeus_rps, "serpapi": args.serpapi_rps}
+    RateLimiterRegistry.configure({provider: rps for provider, rps in rates.items() if rps is not None})
+    from src.LLMs.openaillm import OpenAiLLM
+    from src.graphs.graph_builder import GraphBuilder
+
+    graph = GraphBuilder(OpenAiLLM.get_llm_model(), use_async=True).setup_graph()
+    writer = JsonlResultWriter(args.output) if args.format == "jsonl" else ParquetResultWriter(args.output)
+    report = BatchItineraryRunner(writer, graph=graph, max_concurrency=args.concurrency).run(
+        iter_requests(args.input, args.field)
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,54 @@ from src.nodes.hotels_nodes import HotelNodes
 from src.nodes.flights_nodes import FlightNodes
 from src.nodes.user_nodes import UserNodes
 from src.nodes.itineary_nodes import ItineraryNodes
+from src.helper.plan_cache_helper import PLAN_CACHE
 
 from src.tools.logger import logger
+from src.tools.metrics import instrument_node
+
+# Branch -> first node of that branch, fanned out from fetch_user_data
+BRANCH_ENTRY_NODES = {
+    "flights": "fetch_flight_data",
+    "hotels": "fetch_hotel_data",
+    "attractions": "fetch_attr_data",
+}
+
+
+def route_branches(state):
+    """
+    Fan out to every branch, or only to those listed in `replan_branches` when a
+    checkpointed plan is re-planned. An empty list goes straight to the itinerary.
+    """
+    branches = state.get("replan_branches")
+    if branches is None:
+        return list(BRANCH_ENTRY_NODES.values())
+    return [BRANCH_ENTRY_NODES[branch] for branch in branches] or ["generate_itinerary"]
 
 
 class GraphBuilder:
-    def __init__(self, model):
+    def __init__(self, model, use_async=False, plan_cache=PLAN_CACHE, checkpointer=None):
         self.llm = model
+        self.use_async = use_async
+        self.plan_cache = plan_cache
+        self.checkpointer = checkpointer
         self.graph_builder = StateGraph(TravelPlanState)
-        logger.info("GraphBuilder initialized with provided LLM model")
+        logger.info("GraphBuilder initialized with provided LLM model (async=%s)", use_async)
+
+    def _node(self, nodes, name):
+        """Pick the async (`a`-prefixed) or sync variant of a node method."""
+        return getattr(nodes, f"a{name}" if self.use_async else name)
+
+    def _add_node(self, name, node_fn):
+        self.graph_builder.add_node(name, instrument_node(name, node_fn))
+
+    def _branch_node(self, nodes, name, component):
+        """Node for a flights/hotels/attractions branch, served from the plan cache when enabled."""
+        node_fn = self._node(nodes, name)
+        if self.plan_cache is None:
+            return node_fn
+        if name.startswith("fetch_"):
+            return self.plan_cache.wrap_fetch(component, node_fn)
+        return self.plan_cache.wrap_summarize(component, node_fn)
 
     def create_travel_planner_agent_graph(self):
         logger.info("Building travel planner state graph...")
@@ -27,20 +66,23 @@ class GraphBuilder:
         itinerary_nodes = ItineraryNodes(self.llm)
 
         logger.info("Adding nodes to the state graph")
-        self.graph_builder.add_node("fetch_user_data", user_nodes.parse_user_input)
-        self.graph_builder.add_node("fetch_flight_data", flight_nodes.fetch_flight_data)
-        self.graph_builder.add_node("summarize_flight_data", flight_nodes.summarize_flight_data)
-        self.graph_builder.add_node("fetch_hotel_data", hotel_nodes.fetch_hotel_data)
-        self.graph_builder.add_node("summarize_hotel_data", hotel_nodes.summarize_hotel_data)
-        self.graph_builder.add_node("fetch_attr_data", attr_nodes.fetch_attr_data)
-        self.graph_builder.add_node("summarize_attr_data", attr_nodes.summarize_attr_data)
-        self.graph_builder.add_node("generate_itinerary", itinerary_nodes.generate_itinerary)
+        self._add_node("fetch_user_data", self._node(user_nodes, "parse_user_input"))
+        self._add_node("fetch_flight_data", self._branch_node(flight_nodes, "fetch_flight_data", "flights"))
+        self._add_node("summarize_flight_data", self._branch_node(flight_nodes, "summarize_flight_data", "flights"))
+        self._add_node("fetch_hotel_data", self._branch_node(hotel_nodes, "fetch_hotel_data", "hotels"))
+        self._add_node("summarize_hotel_data", self._branch_node(hotel_nodes, "summarize_hotel_data", "hotels"))
+        self._add_node("fetch_attr_data", self._branch_node(attr_nodes, "fetch_attr_data", "attractions"))
+        self._add_node("summarize_attr_data", self._branch_node(attr_nodes, "summarize_attr_data", "attractions"))
+        generate_itinerary = self._node(itinerary_nodes, "generate_itinerary")
+        if self.plan_cache is not None:
+            generate_itinerary = self.plan_cache.wrap_itinerary(generate_itinerary)
+        self._add_node("generate_itinerary", generate_itinerary)
 
         logger.info("Setting entry point and transitions between nodes")
         self.graph_builder.set_entry_point("fetch_user_data")
-        self.graph_builder.add_edge("fetch_user_data", "fetch_flight_data")
-        self.graph_builder.add_edge("fetch_user_data", "fetch_hotel_data")
-        self.graph_builder.add_edge("fetch_user_data", "fetch_attr_data")
+        self.graph_builder.add_conditional_edges(
+            "fetch_user_data", route_branches, [*BRANCH_ENTRY_NODES.values(), "generate_itinerary"]
+        )
         self.graph_builder.add_edge("fetch_hotel_data", "summarize_hotel_data")
         self.graph_builder.add_edge("fetch_flight_data", "summarize_flight_data")
         self.graph_builder.add_edge("fetch_attr_data", "summarize_attr_data")
@@ -58,7 +100,8 @@ class GraphBuilder:
         logger.info("Setting up state graph for travel planner agent")
 
         self.create_travel_planner_agent_graph()
-        graph = self.graph_builder.compile()
+        # With a checkpointer every run needs a `thread_id`; a failed run resumes from its last completed node
+        graph = self.graph_builder.compile(checkpointer=self.checkpointer)
 
         logger.info("Graph compiled successfully ✅")
         return graph  # optional: return image as well if needed
\ No newline at end of file
@@ -0,0 +1,45 @@
+import threading
+
+from src.LLMs.openaillm import OpenAiLLM
+from src.graphs.graph_builder import GraphBuilder
+from src.helper.checkpoint_helper import create_checkpointer
+from src.tools.logger import logger
+
+
+class GraphRegistry:
+    """
+    Caches compiled travel planner graphs keyed by model config.
+
+    Compiling the graph and creating the LLM client happen once per config, so a chat
+    turn only pays for running the graph. Sync graphs are checkpointed so UI sessions
+    can resume and re-plan; the async graph serves headless runners and is not.
+    """
+
+    _graphs = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_graph(cls, temperature=0, max_tokens=1000, use_async=False):
+        key = tuple(sorted(OpenAiLLM.get_model_config(temperature, max_tokens).items())) + (("use_async", use_async),)
+        graph = cls._graphs.get(key)
+        if graph is None:
+            with cls._lock:
+                graph = cls._graphs.get(key)
+                if graph is None:
+                    logger.info("Compiling travel planner graph for model config: %s", dict(key))
+                    model = OpenAiLLM.get_shared_llm_model(temperature, max_tokens)
+                    checkpointer = None if use_async else create_checkpointer()
+                    graph = GraphBuilder(model, use_async=use_async, checkpointer=checkpointer).setup_graph()
+                    cls._graphs[key] = graph
+        return graph
+
+    @classmethod
+    def self_check(cls):
+        """Build the default graph once so configuration errors surface at startup."""
+        try:
+            cls.get_graph()
+            logger.info("✅ Travel planner graph self-check passed")
+            return True
+        except Exception as e:
+            logger.exception(f"❌ Travel planner graph self-check failed: {e}")
+            return False
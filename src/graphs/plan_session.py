@@ -0,0 +1,81 @@
+import uuid
+
+from src.graphs.graph_builder import BRANCH_ENTRY_NODES
+from src.helper.replan_helper import REPLAN_ENABLED
+from src.tools.logger import logger
+
+
+class PlanSession:
+    """
+    One conversation's view of a checkpointed travel planner graph.
+
+    Every run of the session shares a LangGraph `thread_id`, so the latest state is
+    kept in the checkpointer. A run that failed part-way is resumed from its last
+    completed node instead of being restarted, and a finished plan can be forked
+    to rerun only some branches while reusing the others' checkpointed results.
+    A message sent after a finished plan is treated as a follow-up: only the
+    branches depending on the trip fields it changes are run again.
+    """
+
+    def __init__(self, graph, thread_id=None, replan=REPLAN_ENABLED):
+        self.graph = graph
+        self.thread_id = thread_id or uuid.uuid4().hex
+        self.replan = replan
+        self.config = {"configurable": {"thread_id": self.thread_id}}
+
+    @property
+    def checkpointed(self) -> bool:
+        return getattr(self.graph, "checkpointer", None) is not None
+
+    def state(self):
+        return self.graph.get_state(self.config) if self.checkpointed else None
+
+    def pending_nodes(self) -> tuple:
+        """Nodes still to run for the thread's last run; empty when it finished or never started."""
+        snapshot = self.state()
+        return tuple(snapshot.next) if snapshot is not None else ()
+
+    def previous_user_data(self):
+        """Parsed trip details of the thread's last finished plan, or None."""
+        snapshot = self.state()
+        if snapshot is None or snapshot.next or not snapshot.values.get("final_itinerary"):
+            return None
+        user_data = snapshot.values.get("user_data")
+        return dict(user_data) if isinstance(user_data, dict) and user_data else None
+
+    def run_input(self, user_message=None):
+        """
+        Graph input for the next run: a request for `user_message`, or None to continue
+        the thread from its checkpoint (an interrupted run or a `fork`). With re-planning
+        on, a message after a finished plan carries that plan's details so
+        `parse_user_input` can refine them instead of starting over.
+        """
+        if user_message is None:
+            logger.info(f"🔁 Continuing plan {self.thread_id} at {', '.join(self.pending_nodes()) or 'start'}")
+            return None
+        previous = self.previous_user_data() if self.replan else None
+        if previous:
+            logger.info(f"🔀 Treating message as a follow-up to plan {self.thread_id}")
+        # Clear any branch selection left in the thread by an earlier re-plan
+        return {"user_data": user_message, "replan_branches": None, "previous_user_data": previous}
+
+    def fork(self, branches, user_data_updates=None):
+        """
+        Re-plan only `branches` (subset of flights/hotels/attractions) of the last plan.
+
+        The parsed `user_data` is updated as if `fetch_user_data` had produced it, and
+        the router then fans out only to the selected branches. Running the graph with
+        `run_input()` continues from that fork; untouched branches keep their state.
+        """
+        unknown = set(branches) - set(BRANCH_ENTRY_NODES)
+        if unknown:
+            raise ValueError(f"Unknown plan branches: {sorted(unknown)}")
+        snapshot = self.state()
+        if snapshot is None or not snapshot.values.get("final_itinerary"):
+            raise ValueError("No completed plan to re-plan in this session")
+
+        user_data = {**(snapshot.values.get("user_data") or {}), **(user_data_updates or {})}
+        self.graph.update_state(
+            self.config, {"user_data": user_data, "replan_branches": list(branches)}, as_node="fetch_user_data"
+        )
+        logger.info(f"🔀 Re-planning {', '.join(branches) or 'itinerary only'} for plan {self.thread_id}")
@@ -0,0 +1,107 @@
+import csv
+import difflib
+import json
+import os
+import threading
+import time
+
+from src.helper.place_name_helper import normalize_place_name
+from src.tools.logger import logger
+
+AIRPORT_INDEX_PATH = os.path.join("src", "Data", "airports.csv")
+AIRPORT_CACHE_PATH = os.path.join("src", "Data", "airport_cache.json")
+AIRPORT_CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+
+class AirportIndex:
+    """
+    In-memory city → IATA code index.
+
+    Seeded from the prefilled `airports.csv` (city, code, country, aliases) and
+    extended by a write-through TTL cache of codes learned from the Amadeus API.
+    Lookups try an exact normalized match, then learned codes, then a fuzzy match.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, index_path=AIRPORT_INDEX_PATH, cache_path=AIRPORT_CACHE_PATH,
+                 cache_ttl=AIRPORT_CACHE_TTL_SECONDS, fuzzy_cutoff=0.8):
+        self.index_path = index_path
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._codes = {}
+        self._learned = {}
+        self._lock = threading.Lock()
+        self._load_index()
+        self._load_cache()
+
+    @classmethod
+    def get_shared(cls):
+        """Process-wide index, loaded on first use (or at startup via warm-up)."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    code = row["iata"].strip().upper()
+                    names = [row["city"]] + [a for a in (row.get("aliases") or "").split("|") if a]
+                    for name in names:
+                        self._codes.setdefault(normalize_place_name(name), code)
+            self._names = list(self._codes)
+            logger.info(f"🗺️ Loaded airport index with {len(self._codes)} names from {self.index_path}")
+        except Exception as e:
+            logger.exception(f"❌ Failed to load airport index: {e}")
+            self._names = []
+
+    def _load_cache(self):
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                self._learned = json.load(f)
+            logger.info(f"🗺️ Loaded {len(self._learned)} learned airport codes from {self.cache_path}")
+        except Exception as e:
+            logger.exception(f"❌ Failed to load airport code cache: {e}")
+            self._learned = {}
+
+    def lookup(self, city_name):
+        """Return the IATA code for a city name, or None if it is not known locally."""
+        key = normalize_place_name(city_name)
+        if not key:
+            return None
+
+        code = self._codes.get(key)
+        if code:
+            return code
+
+        entry = self._learned.get(key)
+        if entry and time.time() - entry["ts"] < self.cache_ttl:
+            return entry["code"]
+
+        match = difflib.get_close_matches(key, self._names, n=1, cutoff=self.fuzzy_cutoff)
+        if match:
+            logger.info(f"🛫 Fuzzy-matched '{city_name}' to '{match[0]}'")
+            return self._codes[match[0]]
+        return None
+
+    def remember(self, city_name, code):
+        """Record a code learned from the API and write it through to disk."""
+        key = normalize_place_name(city_name)
+        if not key or not code:
+            return
+        with self._lock:
+            self._learned[key] = {"code": code, "ts": time.time()}
+            try:
+                tmp_path = f"{self.cache_path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._learned, f)
+                os.replace(tmp_path, self.cache_path)
+            except Exception as e:
+                logger.exception(f"❌ Failed to persist airport code cache: {e}")
@@ -0,0 +1,46 @@
+import pandas as pd
+
+
+def build_city_chunks(attractions_df: pd.DataFrame):
+    """
+    Build one text chunk and metadata dict per city using columnar pandas operations.
+
+    Produces the same text as formatting each row in turn:
+    "Tourist attractions in {city}, {state}, {country} include: {name} ({main_category}, {broader_category}) — {categories}. ..."
+    Cities are ordered by name (or category order for a categorical `city`) and rows keep
+    their order within a city.
+    """
+    df = attractions_df[attractions_df["city"].notna()]
+    if df.empty:
+        return [], []
+
+    poi_text = (
+        df["name"].astype(str) + " (" + df["main_category"].astype(str) + ", "
+        + df["broader_category"].astype(str) + ") — " + df["categories"].astype(str) + "."
+    )
+    city_key = df["city"]
+    joined = poi_text.groupby(city_key, sort=True, observed=True).agg(" ".join)
+    counts = city_key.groupby(city_key, sort=True, observed=True).size()
+    first_rows = df.drop_duplicates("city").set_index("city")[["state", "country"]].reindex(joined.index)
+    unique_categories = (
+        df.drop_duplicates(["city", "broader_category"])
+        .assign(broader_category=lambda d: d["broader_category"].astype(str))
+        .groupby("city", sort=True, observed=True)["broader_category"]
+        .agg(", ".join)
+        .reindex(joined.index)
+    )
+
+    chunks, metadata = [], []
+    for city, state, country, text, count, categories in zip(
+        joined.index, first_rows["state"], first_rows["country"], joined.values, counts.values, unique_categories.values
+    ):
+        chunks.append(f"Tourist attractions in {city}, {state}, {country} include: {text}")
+        metadata.append({
+            "city": city,
+            "state": state,
+            "country": country,
+            "num_attractions": int(count),
+            "unique_categories": categories
+        })
+
+    return chunks, metadata
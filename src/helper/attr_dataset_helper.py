@@ -0,0 +1,67 @@
+import os
+
+import pandas as pd
+
+from src.tools.logger import logger
+
+ATTR_DATA_PATH = os.getenv("ATTR_DATA_PATH", os.path.join("src", "Data", "combined.csv"))
+ATTR_COLUMNS = ["name", "main_category", "categories", "city", "country", "state", "broader_category"]
+ATTR_CATEGORICAL_COLUMNS = ["main_category", "city", "country", "state", "broader_category"]
+
+
+def arrow_path_for(csv_path) -> str:
+    return os.path.splitext(csv_path)[0] + ".arrow"
+
+
+def convert_csv_to_arrow(csv_path=ATTR_DATA_PATH, arrow_path=None) -> str:
+    """
+    One-time conversion of the attractions CSV to an Arrow IPC file holding only the
+    columns the app uses, with dictionary (categorical) encoding for the low-cardinality
+    ones. Dictionaries are sorted, so groupby order matches the CSV-loaded frame.
+    """
+    import pyarrow as pa
+
+    arrow_path = arrow_path or arrow_path_for(csv_path)
+    df = pd.read_csv(
+        csv_path,
+        usecols=ATTR_COLUMNS,
+        dtype={col: "category" for col in ATTR_CATEGORICAL_COLUMNS}
+    )[ATTR_COLUMNS]
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    tmp_path = f"{arrow_path}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, arrow_path)
+    logger.info(f"🗜️ Converted {csv_path} to {arrow_path} ({len(df)} rows)")
+    return arrow_path
+
+
+def load_attractions(csv_path=ATTR_DATA_PATH, columns=None) -> pd.DataFrame:
+    """
+    Load the attractions table.
+
+    Reads the memory-mapped Arrow copy of the CSV (converting it first if missing or
+    older than the CSV) and materializes only `columns`. Falls back to a column-pruned
+    CSV read when pyarrow is not installed or the conversion fails.
+    """
+    columns = list(columns or ATTR_COLUMNS)
+    arrow_path = arrow_path_for(csv_path)
+    try:
+        import pyarrow as pa
+
+        if not os.path.exists(arrow_path) or os.path.getmtime(arrow_path) < os.path.getmtime(csv_path):
+            convert_csv_to_arrow(csv_path, arrow_path)
+        # Buffers reference the mapping, so it stays open as long as the table does
+        table = pa.ipc.open_file(pa.memory_map(arrow_path, "r")).read_all().select(columns)
+        return table.to_pandas(split_blocks=True)
+    except ImportError:
+        logger.info("pyarrow not installed, reading attractions from CSV")
+    except Exception as e:
+        logger.exception(f"❌ Arrow load failed for {arrow_path}, reading CSV instead: {e}")
+
+    return pd.read_csv(
+        csv_path,
+        usecols=columns,
+        dtype={col: "category" for col in ATTR_CATEGORICAL_COLUMNS if col in columns}
+    )[columns]
@@ -0,0 +1,209 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from src.tools.logger import logger
+
+
+class MemoryCacheBackend:
+    """In-process LRU storage for `ResponseCache`."""
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key, value, stored_at) -> int:
+        """Store an entry and return how many entries were evicted to make room."""
+        self._entries[key] = (value, stored_at)
+        self._entries.move_to_end(key)
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        return evicted
+
+    def clear(self):
+        self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """
+    On-disk storage for `ResponseCache`, so cached responses survive restarts and can
+    be shared by worker processes on one host. Values must be JSON-serializable.
+    """
+
+    def __init__(self, path, max_entries=5000):
+        self.path = path
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value, stored_at FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, value, stored_at) -> int:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), stored_at, time.time())
+            )
+            excess = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)", (excess,)
+                )
+        return max(0, excess)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class _InFlight:
+    """A single upstream call that concurrent callers for the same key wait on."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    """
+    Thread-safe, size-bounded LRU cache for upstream API responses.
+
+    - Storage is pluggable: `MemoryCacheBackend` (default) or `SQLiteCacheBackend`.
+    - Entries are fresh for `ttl` seconds.
+    - Concurrent misses for the same key are coalesced into one upstream call.
+    - If the upstream call raises, an expired entry up to `stale_ttl` seconds past
+      its freshness window is served instead.
+    - `stats()` exposes hit/miss/coalesce counters for sizing the cache.
+    """
+
+    def __init__(self, name, ttl=600, max_entries=512, stale_ttl=3600, backend=None):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._backend = backend or MemoryCacheBackend(max_entries)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "stale_served": 0, "evictions": 0, "errors": 0}
+
+    def get_or_fetch(self, key, fetch_fn):
+        """Return the cached value for `key`, calling `fetch_fn()` at most once per miss."""
+        key = self._make_key(key)
+        now = time.time()
+        with self._lock:
+            entry = self._backend.get(key)
+            if entry and now - entry[1] < self.ttl:
+                self._stats["hits"] += 1
+                return entry[0]
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = self._inflight[key] = _InFlight()
+                leader = True
+                self._stats["misses"] += 1
+            else:
+                leader = False
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            inflight.event.wait()
+            if inflight.error is not None:
+                raise inflight.error
+            return inflight.value
+
+        try:
+            value = fetch_fn()
+            self._store(key, value)
+            inflight.value = value
+            return value
+        except Exception as e:
+            stale = self._get_stale(key)
+            if stale is not None:
+                logger.warning(f"⚠️ [{self.name}] upstream failed, serving stale entry: {e}")
+                inflight.value = stale
+                return stale
+            with self._lock:
+                self._stats["errors"] += 1
+            inflight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            inflight.event.set()
+
+    def get(self, key):
+        """Return the fresh cached value for `key`, or None. Never calls upstream."""
+        key = self._make_key(key)
+        with self._lock:
+            entry = self._backend.get(key)
+            if entry and time.time() - entry[1] < self.ttl:
+                self._stats["hits"] += 1
+                return entry[0]
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key, value):
+        self._store(self._make_key(key), value)
+
+    @staticmethod
+    def _make_key(key) -> str:
+        return key if isinstance(key, str) else json.dumps(key, default=str)
+
+    def _store(self, key, value):
+        with self._lock:
+            self._stats["evictions"] += self._backend.set(key, value, time.time())
+
+    def _get_stale(self, key):
+        with self._lock:
+            entry = self._backend.get(key)
+            if entry and time.time() - entry[1] < self.ttl + self.stale_ttl:
+                self._stats["stale_served"] += 1
+                return entry[0]
+        return None
+
+    def clear(self):
+        with self._lock:
+            self._backend.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "backend": type(self._backend).__name__,
+                "size": self._backend.size(),
+                "max_entries": self.max_entries,
+                **self._stats
+            }
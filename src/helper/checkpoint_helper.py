@@ -0,0 +1,33 @@
+import os
+import sqlite3
+
+from src.tools.logger import logger
+
+CHECKPOINTS_ENABLED = os.getenv("CHECKPOINTS_ENABLED", "true").lower() == "true"
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", os.path.join("cache", "graph_checkpoints.sqlite"))
+
+
+def create_checkpointer(path=CHECKPOINT_DB_PATH):
+    """
+    SQLite-backed LangGraph checkpointer shared by every session of a compiled graph.
+
+    Returns None when checkpointing is disabled or the backend is unavailable, in
+    which case the graph is compiled without one and every run starts from scratch.
+    """
+    if not CHECKPOINTS_ENABLED:
+        return None
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # One connection serves all Streamlit sessions; SqliteSaver serializes access with its own lock
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        saver = SqliteSaver(conn)
+        saver.setup()
+        logger.info(f"💾 Graph checkpoints stored in {path}")
+        return saver
+    except Exception as e:
+        logger.warning(f"⚠️ Graph checkpointing unavailable, runs will not be resumable: {e}")
+        return None
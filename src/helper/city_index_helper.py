@@ -0,0 +1,109 @@
+import difflib
+
+from langchain_core.documents import Document
+
+from src.helper.place_name_helper import normalize_place_name
+from src.tools.logger import logger
+
+# Normalized alternate name -> normalized city name as it appears in the dataset.
+CITY_ALIASES = {
+    "bengaluru": "bangalore",
+    "calcutta": "kolkata",
+    "madras": "chennai",
+    "new delhi": "delhi",
+    "trivandrum": "thiruvananthapuram",
+    "cochin": "kochi",
+    "ernakulam": "kochi",
+    "mysuru": "mysore",
+    "banaras": "varanasi",
+    "benares": "varanasi",
+    "kashi": "varanasi",
+    "puducherry": "pondicherry",
+    "alappuzha": "alleppey",
+    "udhagamandalam": "ooty",
+    "ootacamund": "ooty",
+    "vizag": "visakhapatnam",
+    "vishakhapatnam": "visakhapatnam",
+    "baroda": "vadodara",
+    "dharamsala": "dharamshala",
+    "mcleod ganj": "mcleodganj",
+    "bodh gaya": "bodh",
+    "bodhgaya": "bodh",
+    "vaishno devi": "vaishno",
+    "katra": "vaishno",
+    "jim corbett": "jim",
+    "corbett": "jim",
+    "mount abu": "mount",
+    "jog falls": "jog",
+    "madikeri": "coorg",
+    "kodagu": "coorg",
+    "esfahan": "isfahan",
+    "orumiyeh": "urmia",
+    "hamadan": "hamedan",
+    "new york": "new york city",
+    "nyc": "new york city",
+    "manhattan": "new york city",
+    "washington": "washington d c",
+    "washington dc": "washington d c",
+    "dc": "washington d c",
+    "la": "los angeles",
+    "san fran": "san francisco",
+    "sf": "san francisco",
+    "saint louis": "st louis",
+    "vegas": "las vegas",
+}
+
+
+class CityChunkIndex:
+    """
+    Normalized city → chunk lookup built from the Chroma metadata (`city`, `state`, `country`).
+
+    Resolves "Pune", "pune, maharashtra", "Bengaluru" or "Zürich"-style spellings
+    directly to the stored city chunk, so retrieval only falls back to embedding
+    similarity when the name is unknown.
+    """
+
+    def __init__(self, fuzzy_cutoff=0.88):
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._by_key = {}
+        self._cities = []
+
+    @classmethod
+    def from_chroma(cls, db, **kwargs):
+        index = cls(**kwargs)
+        data = db.get(include=["metadatas", "documents"])
+        for document, metadata in zip(data["documents"], data["metadatas"]):
+            if metadata and metadata.get("city"):
+                index.add(Document(page_content=document, metadata=metadata))
+        logger.info(f"🗂️ City index built with {len(index._cities)} cities")
+        return index
+
+    def add(self, document: Document):
+        meta = document.metadata
+        city = normalize_place_name(meta.get("city"))
+        state = normalize_place_name(meta.get("state"))
+        country = normalize_place_name(meta.get("country"))
+        # Exact city keys win over the combined forms if two chunks collide
+        for key in (city, f"{city} {state}", f"{city} {country}", f"{city} {state} {country}"):
+            if key.strip() and (key not in self._by_key or key == city):
+                self._by_key[key.strip()] = document
+        self._cities.append(city)
+
+    def lookup(self, city_name):
+        """Return the chunk `Document` for a city name, or None on a miss."""
+        key = normalize_place_name(city_name)
+        if not key:
+            return None
+
+        document = self._by_key.get(key) or self._by_key.get(CITY_ALIASES.get(key, ""))
+        if document is not None:
+            return document
+
+        match = difflib.get_close_matches(key, self._cities, n=1, cutoff=self.fuzzy_cutoff)
+        if match:
+            logger.info(f"🗂️ Fuzzy-matched city '{city_name}' to '{match[0]}'")
+            return self._by_key[match[0]]
+        return None
+
+    def __len__(self):
+        return len(self._cities)
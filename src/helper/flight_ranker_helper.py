@@ -0,0 +1,83 @@
+import os
+import re
+from dataclasses import dataclass
+
+from src.tools.logger import logger
+
+# "rank" uses the deterministic scorer below; "llm" keeps the structured-output LLM summarizer.
+FLIGHT_SUMMARY_MODE = os.getenv("FLIGHT_SUMMARY_MODE", "rank")
+
+_ISO_DURATION = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+def parse_iso_duration(value) -> int | None:
+    """Parse an ISO-8601 duration such as 'PT2H35M' or 'P1DT3H' into minutes. Returns None if unparseable."""
+    if not value or not isinstance(value, str):
+        return None
+    match = _ISO_DURATION.match(value.strip().upper())
+    if not match or not any(match.groups()):
+        return None
+    days, hours, minutes, seconds = (int(g) if g else 0 for g in match.groups())
+    return days * 1440 + hours * 60 + minutes + (1 if seconds >= 30 else 0)
+
+
+@dataclass(frozen=True)
+class FlightScoreWeights:
+    """Relative importance of price, stops and duration. Lower scores rank first."""
+    price: float = float(os.getenv("FLIGHT_WEIGHT_PRICE", 0.5))
+    stops: float = float(os.getenv("FLIGHT_WEIGHT_STOPS", 0.3))
+    duration: float = float(os.getenv("FLIGHT_WEIGHT_DURATION", 0.2))
+
+
+def _normalize(value, low, high) -> float:
+    return 0.0 if high == low else (value - low) / (high - low)
+
+
+def score_flights(flights, weights: FlightScoreWeights = None):
+    """
+    Return `(score, flight)` pairs sorted best first.
+
+    Price and duration are min-max scaled within the given offers, and stops are scaled
+    by the largest stop count, so the weights trade off comparable 0–1 terms. Offers with
+    an unparseable duration are treated as the longest. Ties break on price, then departure time.
+    """
+    weights = weights or FlightScoreWeights()
+    if not flights:
+        return []
+
+    durations = [parse_iso_duration(f.get("duration")) for f in flights]
+    known = [d for d in durations if d is not None]
+    longest = max(known) if known else 0
+    durations = [d if d is not None else longest for d in durations]
+
+    prices = [float(f.get("price", 0.0)) for f in flights]
+    stops = [int(f.get("stops", 0)) for f in flights]
+    low_price, high_price = min(prices), max(prices)
+    low_dur, high_dur = min(durations), max(durations)
+    max_stops = max(stops) or 1
+
+    scored = []
+    for flight, price, stop_count, duration in zip(flights, prices, stops, durations):
+        score = (
+            weights.price * _normalize(price, low_price, high_price)
+            + weights.stops * stop_count / max_stops
+            + weights.duration * _normalize(duration, low_dur, high_dur)
+        )
+        scored.append((round(score, 6), flight))
+
+    scored.sort(key=lambda pair: (pair[0], float(pair[1].get("price", 0.0)), pair[1].get("departure_time", "")))
+    return scored
+
+
+def rank_flights(outbound_flights, return_flights=None, top_n=3, weights: FlightScoreWeights = None):
+    """
+    Pick the best `top_n` outbound and return offers.
+    Returns dicts with the `FlightOption` schema fields, outbound first.
+    """
+    fields = ("airline", "origin", "destination", "price", "currency", "duration", "stops")
+    picks = []
+    for leg in (outbound_flights or [], return_flights or []):
+        for _, flight in score_flights(leg, weights)[:top_n]:
+            picks.append({field: flight.get(field) for field in fields})
+    logger.info(f"✈️ Ranked flights deterministically: {len(picks)} recommendation(s)")
+    return picks
@@ -0,0 +1,129 @@
+import os
+from dataclasses import dataclass, asdict
+from datetime import date
+
+from src.helper.token_helper import count_tokens
+from src.tools.logger import logger
+
+HOTEL_MAX_CANDIDATES = int(os.getenv("HOTEL_MAX_CANDIDATES", 15))
+HOTEL_ADDRESS_MAX_CHARS = 120
+
+# What `CompactHotel.price` covers; prices are only compared within the same basis
+PRICE_LABELS = {
+    "total": "total price",
+    "estimated_total": "est. total price (nightly rate x nights)",
+    "per_night": "price per night",
+}
+
+
+@dataclass(slots=True, frozen=True)
+class CompactHotel:
+    """The subset of a SerpAPI hotel property that `HotelRecommendation` needs."""
+    name: str
+    rating: str
+    address: str
+    price: float | None
+    currency: str
+    price_basis: str = "total"
+
+    def to_prompt_line(self) -> str:
+        price = f"{self.price:.2f} {self.currency}" if self.price is not None else "N/A"
+        label = PRICE_LABELS.get(self.price_basis, "price")
+        return f"- {self.name} | rating: {self.rating} | address: {self.address} | {label}: {price}"
+
+
+def stay_nights(check_in, check_out) -> int | None:
+    """Nights between ISO `check_in` and `check_out`, or None when either is missing or invalid."""
+    try:
+        nights = (date.fromisoformat(check_out) - date.fromisoformat(check_in)).days
+    except (TypeError, ValueError):
+        return None
+    return nights if nights > 0 else None
+
+
+def compact_hotel(prop: dict, currency: str, nights: int | None = None) -> CompactHotel | None:
+    """
+    Reduce one raw SerpAPI `properties` entry to a `CompactHotel`, or None if it has no name.
+    Without a stay total the nightly rate is multiplied by `nights`, or kept per night
+    when the stay length is unknown.
+    """
+    name = (prop.get("name") or "").strip()
+    if not name:
+        return None
+
+    rating = prop.get("overall_rating")
+    address = prop.get("address") or prop.get("description") or "N/A"
+    price, basis = (prop.get("total_rate") or {}).get("extracted_lowest"), "total"
+    if price is None:
+        price = (prop.get("rate_per_night") or {}).get("extracted_lowest")
+        if price is not None and nights:
+            price, basis = float(price) * nights, "estimated_total"
+        elif price is not None:
+            basis = "per_night"
+
+    return CompactHotel(
+        name=name,
+        rating=str(rating) if rating is not None else "N/A",
+        address=address[:HOTEL_ADDRESS_MAX_CHARS],
+        price=float(price) if price is not None else None,
+        currency=currency,
+        price_basis=basis,
+    )
+
+
+def rank_hotels(hotels, max_candidates=HOTEL_MAX_CANDIDATES, rating_weight=0.6, price_weight=0.4):
+    """
+    Deterministically order hotels by a rating/price score and keep the top `max_candidates`.
+    Rating is scaled to 0–1 out of 5, price is scaled against the cheapest and most
+    expensive candidates with the same kind of price. Hotels with a stay total (quoted or
+    estimated) come first, then those priced only per night, and hotels without a price
+    sort last. Ties break on name.
+    """
+    ranges = {}
+    for hotel in hotels:
+        if hotel.price is not None:
+            basis = "per_night" if hotel.price_basis == "per_night" else "total"
+            low, high = ranges.get(basis, (hotel.price, hotel.price))
+            ranges[basis] = (min(low, hotel.price), max(high, hotel.price))
+
+    def score(hotel):
+        try:
+            rating = float(hotel.rating) / 5.0
+        except ValueError:
+            rating = 0.0
+        if hotel.price is None:
+            return (2, 0.0, hotel.name)
+        group = 1 if hotel.price_basis == "per_night" else 0
+        low, high = ranges["per_night" if group else "total"]
+        price = (hotel.price - low) / ((high - low) or 1.0)
+        return (group, -(rating_weight * rating - price_weight * price), hotel.name)
+
+    return sorted(hotels, key=score)[:max_candidates]
+
+
+def build_hotel_candidates(properties, currency="USD", max_candidates=HOTEL_MAX_CANDIDATES, nights=None):
+    """
+    Compact, rank and cap raw SerpAPI properties for a stay of `nights` (None if unknown).
+    Returns `(candidates, report)` where candidates are plain dicts (state-friendly) and
+    report compares the prompt token cost of the raw and compact payloads.
+    """
+    properties = properties or []
+    compacted = [h for h in (compact_hotel(p, currency, nights) for p in properties) if h is not None]
+    ranked = rank_hotels(compacted, max_candidates)
+
+    report = {
+        "raw_hotels": len(properties),
+        "candidates": len(ranked),
+        "raw_tokens": count_tokens(str(properties)),
+        "compact_tokens": count_tokens(format_hotel_context([asdict(h) for h in ranked])),
+    }
+    logger.info(
+        f"🏨 Hotel context: {report['raw_hotels']} → {report['candidates']} hotels, "
+        f"{report['raw_tokens']} → {report['compact_tokens']} tokens"
+    )
+    return [asdict(h) for h in ranked], report
+
+
+def format_hotel_context(candidates) -> str:
+    """Render compact hotel dicts as one prompt line per hotel."""
+    return "\n".join(CompactHotel(**c).to_prompt_line() for c in candidates)
@@ -0,0 +1,192 @@
+import os
+from dataclasses import dataclass
+from datetime import date
+
+from langchain_core.prompts import PromptTemplate
+
+from src.helper.output_check_helper import _extract_recos
+from src.helper.token_helper import count_tokens
+from src.tools.logger import logger
+
+ITINERARY_DEFAULT_DAYS = int(os.getenv("ITINERARY_DEFAULT_DAYS", 3))
+# Prompt and completion budgets stop growing past this many days; the prompt keeps the real length
+ITINERARY_MAX_DAYS = int(os.getenv("ITINERARY_MAX_DAYS", 14))
+
+# Prompt token budget per section; attractions grow with the trip length, the rest are fixed
+ITINERARY_SECTION_TOKENS = {
+    "user_data": int(os.getenv("ITINERARY_USER_TOKENS", 120)),
+    "flights": int(os.getenv("ITINERARY_FLIGHT_TOKENS", 220)),
+    "hotels": int(os.getenv("ITINERARY_HOTEL_TOKENS", 220)),
+}
+ITINERARY_ATTR_TOKENS_PER_DAY = int(os.getenv("ITINERARY_ATTR_TOKENS_PER_DAY", 45))
+ITINERARY_ATTR_MIN_TOKENS = int(os.getenv("ITINERARY_ATTR_MIN_TOKENS", 160))
+
+# Completion sizing: estimated tokens per planned day plus headers/tips, rounded up to a tier
+ITINERARY_COMPLETION_BASE_TOKENS = int(os.getenv("ITINERARY_COMPLETION_BASE_TOKENS", 350))
+ITINERARY_COMPLETION_TOKENS_PER_DAY = int(os.getenv("ITINERARY_COMPLETION_TOKENS_PER_DAY", 380))
+ITINERARY_COMPLETION_TIERS = (1024, 1536, 2048, 3072, 4096)
+
+HOTEL_ADDRESS_PROMPT_CHARS = 80
+
+ITINERARY_TEMPLATE = PromptTemplate(
+    input_variables=["num_days", "word_budget", "user_data", "top_flight_data", "top_hotel_data", "top_attr_data"],
+    template="""
+        You are a travel planning agent. Using only the provided information, create a **clear and structured** final travel itinerary.
+
+        Trip Details:
+        {user_data}
+
+        Top Selected Flights:
+        {top_flight_data}
+
+        Best Matched Hotels:
+        {top_hotel_data}
+
+        Major Attractions to Visit:
+        {top_attr_data}
+
+        Guidelines:
+        - Organize by **Day 1** to **Day {num_days}**
+        - Include flight timings, hotel check-in/out
+        - Include 2-3 attractions per day with travel flow.
+        - Mention what do at the attractions.
+        - Add short tips (travel mode, time to spend).
+        - Format neatly using bullet points + bold headers
+        - Do not mention the total cost or anything like that.
+        - Mention the total travel time at the end of the itinerary.
+        - Keep the whole itinerary under about {word_budget} words.
+
+        Now create the **final itinerary**.
+    """
+)
+
+
+@dataclass(frozen=True)
+class ItineraryPrompt:
+    """An assembled itinerary prompt with its measured size and completion budget."""
+    text: str
+    num_days: int
+    prompt_tokens: int
+    max_completion_tokens: int
+    section_tokens: dict
+
+
+def _field(item, name):
+    return item.get(name) if isinstance(item, dict) else getattr(item, name, None)
+
+
+def _flight_line(flight) -> str:
+    stops = _field(flight, "stops")
+    stops = "nonstop" if stops in (0, "0") else f"{stops} stop(s)"
+    return (f"- {_field(flight, 'airline')} {_field(flight, 'origin')}→{_field(flight, 'destination')} | "
+            f"{_field(flight, 'duration')} | {stops} | {_field(flight, 'price')} {_field(flight, 'currency')}")
+
+
+def _hotel_line(hotel) -> str:
+    address = str(_field(hotel, "address") or "")[:HOTEL_ADDRESS_PROMPT_CHARS]
+    return (f"- {_field(hotel, 'name')} | rating {_field(hotel, 'rating')} | "
+            f"{_field(hotel, 'price')} {_field(hotel, 'currency')} | {address}")
+
+
+def _attraction_line(attraction) -> str:
+    category = _field(attraction, "category")
+    return f"- {_field(attraction, 'name')} ({category})" if category else f"- {_field(attraction, 'name')}"
+
+
+SECTION_FORMATTERS = {
+    "flights": _flight_line,
+    "hotels": _hotel_line,
+    "attractions": _attraction_line,
+}
+
+
+def trip_days(user_data) -> int:
+    """Trip length from `num_days`, else from the travel dates, else `ITINERARY_DEFAULT_DAYS`."""
+    user_data = user_data or {}
+    try:
+        days = int(user_data.get("num_days") or 0)
+    except (TypeError, ValueError):
+        days = 0
+    if not days:
+        try:
+            days = (date.fromisoformat(user_data["return_date"]) - date.fromisoformat(user_data["departure_date"])).days + 1
+        except (KeyError, TypeError, ValueError):
+            days = 0
+    return days if days > 0 else ITINERARY_DEFAULT_DAYS
+
+
+def section_budgets(num_days) -> dict:
+    num_days = min(num_days, ITINERARY_MAX_DAYS)
+    return {
+        **ITINERARY_SECTION_TOKENS,
+        "attractions": max(ITINERARY_ATTR_MIN_TOKENS, ITINERARY_ATTR_TOKENS_PER_DAY * num_days),
+    }
+
+
+def completion_budget(num_days) -> int:
+    """Smallest completion tier that fits an itinerary of `num_days` days (capped at the largest tier)."""
+    needed = ITINERARY_COMPLETION_BASE_TOKENS + ITINERARY_COMPLETION_TOKENS_PER_DAY * min(num_days, ITINERARY_MAX_DAYS)
+    return next((tier for tier in ITINERARY_COMPLETION_TIERS if tier >= needed), ITINERARY_COMPLETION_TIERS[-1])
+
+
+def fit_lines(lines, budget) -> str:
+    """Keep lines in order while they fit `budget` tokens and note how many were dropped."""
+    kept, used = [], 0
+    for line in lines:
+        tokens = count_tokens(line) + 1
+        if used + tokens > budget:
+            break
+        kept.append(line)
+        used += tokens
+    dropped = len(lines) - len(kept)
+    if dropped:
+        kept.append(f"(+{dropped} more omitted)")
+    return "\n".join(kept)
+
+
+def format_user_data(user_data, budget) -> str:
+    lines = [f"{key}: {value}" for key, value in (user_data or {}).items() if value not in (None, "")]
+    return fit_lines(lines, budget)
+
+
+def format_recommendations(section, result, budget) -> str:
+    """Compact one line per recommendation; fallback strings ("[No ...]") are passed through, truncated."""
+    if not isinstance(result, str) and result is not None:
+        lines = [SECTION_FORMATTERS[section](item) for item in _extract_recos(result)]
+        return fit_lines(lines, budget) if lines else "None available."
+    text = result or "None available."
+    # Fallback messages are prose; cut by the ~4 characters/token estimate when over budget
+    return text if count_tokens(text) <= budget else text[: budget * 4] + "…"
+
+
+def build_itinerary_prompt(state) -> ItineraryPrompt:
+    """
+    Assemble the itinerary prompt within per-section token budgets scaled to the trip
+    length, and choose the completion budget for it.
+    """
+    user_data = state.get("user_data") or {}
+    num_days = trip_days(user_data)
+    budgets = section_budgets(num_days)
+    sections = {
+        "user_data": format_user_data(user_data, budgets["user_data"]),
+        "top_flight_data": format_recommendations("flights", (state.get("flights") or {}).get("top_flight_summary"), budgets["flights"]),
+        "top_hotel_data": format_recommendations("hotels", (state.get("hotels") or {}).get("top_hotel_data"), budgets["hotels"]),
+        "top_attr_data": format_recommendations("attractions", (state.get("attractions") or {}).get("top_attr_data"), budgets["attractions"]),
+    }
+    max_completion_tokens = completion_budget(num_days)
+    # ~0.75 words per token, with headroom so the model finishes before the cap
+    word_budget = int(max_completion_tokens * 0.75 * 0.8)
+    text = ITINERARY_TEMPLATE.format(num_days=num_days, word_budget=word_budget, **sections)
+
+    prompt = ItineraryPrompt(
+        text=text,
+        num_days=num_days,
+        prompt_tokens=count_tokens(text),
+        max_completion_tokens=max_completion_tokens,
+        section_tokens={name: count_tokens(value) for name, value in sections.items()},
+    )
+    logger.info(
+        f"🧮 Itinerary prompt: {prompt.prompt_tokens} tokens for {num_days} day(s), "
+        f"completion budget {max_completion_tokens} | sections {prompt.section_tokens}"
+    )
+    return prompt
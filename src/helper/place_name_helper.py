@@ -0,0 +1,17 @@
+import re
+import unicodedata
+
+
+def normalize_place_name(name) -> str:
+    """
+    Normalize a city/place name for lookups: strip diacritics, lowercase, treat
+    hyphens/underscores/dots as spaces and collapse whitespace.
+    e.g. "New-york-city" -> "new york city", "Zürich" -> "zurich".
+    """
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"[-_.,']", " ", text.lower())
+    text = re.sub(r"[^a-z0-9 ]", "", text)
+    return re.sub(r"\s+", " ", text).strip()
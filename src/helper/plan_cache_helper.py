@@ -0,0 +1,159 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+
+from src.helper.cache_helper import ResponseCache
+from src.helper.output_check_helper import _extract_recos
+from src.helper.place_name_helper import normalize_place_name
+from src.tools.logger import logger
+
+PLAN_CACHE_ENABLED = os.getenv("PLAN_CACHE_ENABLED", "true").lower() == "true"
+PLAN_CACHE_MAX_ENTRIES = int(os.getenv("PLAN_CACHE_MAX_ENTRIES", 256))
+
+# Flight prices move fast, hotel rates slower, attraction picks hardly at all. The itinerary
+# embeds the flight picks, so it expires with them.
+PLAN_CACHE_TTLS = {
+    "flights": int(os.getenv("PLAN_CACHE_FLIGHTS_TTL_SECONDS", 900)),
+    "hotels": int(os.getenv("PLAN_CACHE_HOTELS_TTL_SECONDS", 3600)),
+    "attractions": int(os.getenv("PLAN_CACHE_ATTRACTIONS_TTL_SECONDS", 7 * 24 * 3600)),
+    "itinerary": int(os.getenv("PLAN_CACHE_ITINERARY_TTL_SECONDS", 900)),
+}
+
+# The `user_data` fields each component's result depends on
+COMPONENT_FIELDS = {
+    "flights": ("origin_city", "destination_city", "departure_date", "return_date", "num_travelers", "preferences"),
+    "hotels": ("destination_city", "departure_date", "return_date", "num_travelers", "preferences"),
+    "attractions": ("destination_city", "num_days", "num_travelers", "preferences"),
+    "itinerary": ("origin_city", "destination_city", "departure_date", "return_date", "num_days",
+                  "num_travelers", "budget", "preferences"),
+}
+
+# Branch state key -> field holding the summarized recommendations
+RESULT_FIELDS = {
+    "flights": "top_flight_summary",
+    "hotels": "top_hotel_data",
+    "attractions": "top_attr_data",
+}
+
+
+def _canonical_value(field, value):
+    if value is None or value == "":
+        return None
+    if field.endswith("_city"):
+        return normalize_place_name(value)
+    if field.startswith("num_"):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return str(value)
+    return " ".join(str(value).lower().split())
+
+
+def component_key(component, user_data) -> str:
+    """Canonical hash of the `user_data` fields a component depends on."""
+    canonical = {field: _canonical_value(field, (user_data or {}).get(field)) for field in COMPONENT_FIELDS[component]}
+    payload = json.dumps(canonical, sort_keys=True)
+    return f"{component}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+
+def _is_cacheable(component, branch) -> bool:
+    """Fallback messages ("[No ...]") and empty summaries are never cached."""
+    if not isinstance(branch, dict):
+        return False
+    result = branch.get(RESULT_FIELDS[component])
+    if isinstance(result, str):
+        return bool(result) and not result.startswith("[")
+    return bool(_extract_recos(result))
+
+
+class PlanCache:
+    """
+    Plan-level cache for the travel graph, one TTL cache per component.
+
+    Each branch (flights, hotels, attractions) is cached under a hash of only the
+    `user_data` fields it depends on, so branches are reused independently: a cached
+    attraction summary can be combined with fresh flight data when only the dates
+    change. The final itinerary is cached under the hash of all parsed fields.
+    """
+
+    def __init__(self, ttls=None, max_entries=PLAN_CACHE_MAX_ENTRIES):
+        ttls = {**PLAN_CACHE_TTLS, **(ttls or {})}
+        self._caches = {
+            component: ResponseCache(f"plan_{component}", ttl=ttl, max_entries=max_entries, stale_ttl=0)
+            for component, ttl in ttls.items()
+        }
+
+    def lookup(self, component, user_data):
+        value = self._caches[component].get(component_key(component, user_data))
+        if value is not None:
+            logger.info(f"♻️ Plan cache hit for {component}")
+        return value
+
+    def store(self, component, user_data, value):
+        self._caches[component].set(component_key(component, user_data), value)
+
+    def _wrap(self, node_fn, before, after):
+        """Apply `before(state)` (a cached update or None) and `after(state, update)` around a sync or async node."""
+        if inspect.iscoroutinefunction(node_fn):
+            @functools.wraps(node_fn)
+            async def wrapper(state):
+                cached = before(state)
+                if cached is not None:
+                    return cached
+                return after(state, await node_fn(state))
+        else:
+            @functools.wraps(node_fn)
+            def wrapper(state):
+                cached = before(state)
+                if cached is not None:
+                    return cached
+                return after(state, node_fn(state))
+        return wrapper
+
+    def _cached_branch(self, component):
+        def before(state):
+            branch = self.lookup(component, state.get("user_data"))
+            return {component: branch} if branch is not None else None
+        return before
+
+    def wrap_fetch(self, component, node_fn):
+        """Skip a branch's fetch node when its summarized result is cached."""
+        return self._wrap(node_fn, self._cached_branch(component), lambda state, update: update)
+
+    def wrap_summarize(self, component, node_fn):
+        """Serve a branch's summary from the cache, or run the node and cache its result."""
+        def after(state, update):
+            branch = (update or {}).get(component)
+            if _is_cacheable(component, branch):
+                self.store(component, state.get("user_data"), branch)
+            return update
+
+        return self._wrap(node_fn, self._cached_branch(component), after)
+
+    def wrap_itinerary(self, node_fn):
+        """Serve the final itinerary from the cache when the whole plan was seen recently."""
+        def before(state):
+            itinerary = self.lookup("itinerary", state.get("user_data"))
+            return {**state, "final_itinerary": itinerary} if itinerary is not None else None
+
+        def after(state, update):
+            itinerary = (update or {}).get("final_itinerary")
+            # An itinerary built around a fallback branch summary must be regenerated next time
+            if itinerary and all(_is_cacheable(c, state.get(c)) for c in RESULT_FIELDS):
+                self.store("itinerary", state.get("user_data"), itinerary)
+            return update
+
+        return self._wrap(node_fn, before, after)
+
+    def clear(self):
+        for cache in self._caches.values():
+            cache.clear()
+
+    def stats(self) -> list:
+        return [cache.stats() for cache in self._caches.values()]
+
+
+# Shared by every compiled graph in the process
+PLAN_CACHE = PlanCache() if PLAN_CACHE_ENABLED else None
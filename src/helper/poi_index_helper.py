@@ -0,0 +1,134 @@
+import hashlib
+import os
+import re
+
+import pandas as pd
+
+from src.helper.place_name_helper import normalize_place_name
+from src.tools.logger import logger
+from src.tools.metrics import timed
+
+POI_COLLECTION_NAME = "attraction_pois"
+POI_MANIFEST_FILENAME = "poi_manifest.json"
+ATTR_TOP_K = int(os.getenv("ATTR_TOP_K", 40))
+
+# Dataset `broader_category` -> preference keywords. Each keyword belongs to one category; they are
+# matched as whole words (plural "s"/"es" allowed), longest first so "theme park" is not also "park"
+PREFERENCE_CATEGORIES = {
+    "Nature": ("nature", "natural", "relax", "relaxing", "relaxed", "leisure", "outdoor", "hiking", "hike",
+               "trek", "trekking", "beach", "wildlife", "scenic", "mountain", "hill", "lake", "park", "garden",
+               "adventure", "adventurous", "waterfall", "forest"),
+    "Cultural": ("culture", "cultural", "history", "historic", "historical", "heritage", "museum", "art",
+                 "architecture", "monument", "fort", "palace", "sightseeing"),
+    "Entertainment": ("entertainment", "entertaining", "fun", "family", "kid", "child", "children", "nightlife",
+                      "shopping", "amusement", "theme park", "water park", "zoo", "aquarium"),
+    "Religious": ("religion", "religious", "spiritual", "spirituality", "pilgrim", "pilgrimage", "temple",
+                  "church", "mosque", "shrine", "gurudwara", "monastery", "monasteries", "devotion", "devotional"),
+}
+_KEYWORD_CATEGORIES = {kw: category for category, keywords in PREFERENCE_CATEGORIES.items() for kw in keywords}
+_PREFERENCE_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(kw) for kw in sorted(_KEYWORD_CATEGORIES, key=len, reverse=True)) + r")(?:s|es)?\b"
+)
+
+
+def preference_categories(preferences) -> list:
+    """Map free-text preferences (e.g. 'cultural and relaxing') to broader categories."""
+    text = (preferences or "").lower()
+    return sorted({_KEYWORD_CATEGORIES[m.group(1)] for m in _PREFERENCE_PATTERN.finditer(text)})
+
+
+def build_poi_records(attractions_df: pd.DataFrame):
+    """
+    One document per attraction, with city/category metadata for filtering.
+    Returns `(ids, texts, metadatas)`; ids are stable hashes of city, name and category.
+    """
+    df = attractions_df[attractions_df["city"].notna()].astype(str)
+    texts = (
+        df["name"] + " (" + df["main_category"] + ", " + df["broader_category"] + ") — " + df["categories"] + "."
+    ).tolist()
+
+    ids, kept_texts, metadatas, seen = [], [], [], set()
+    for text, row in zip(texts, df.itertuples(index=False)):
+        city_key = normalize_place_name(row.city)
+        digest = hashlib.sha1(f"{city_key}|{row.name}|{row.main_category}".encode("utf-8")).hexdigest()[:16]
+        doc_id = f"poi:{city_key}:{digest}"
+        if doc_id in seen:
+            continue
+        seen.add(doc_id)
+        ids.append(doc_id)
+        kept_texts.append(text)
+        metadatas.append({
+            "city": row.city,
+            "city_key": city_key,
+            "state": row.state,
+            "country": row.country,
+            "name": row.name,
+            "main_category": row.main_category,
+            "broader_category": row.broader_category,
+        })
+    return ids, kept_texts, metadatas
+
+
+class PoiIndex:
+    """Preference-aware, top-k attraction search over the per-POI Chroma collection."""
+
+    def __init__(self, db):
+        self.db = db
+
+    @staticmethod
+    def _filter(city_key, categories=None, main_categories=None):
+        clauses = [{"city_key": {"$eq": city_key}}]
+        if categories:
+            clauses.append({"broader_category": {"$in": list(categories)}})
+        if main_categories:
+            clauses.append({"main_category": {"$in": list(main_categories)}})
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    @staticmethod
+    def _plan(city, preferences):
+        city_key = normalize_place_name(city)
+        categories = preference_categories(preferences)
+        query = preferences or f"top tourist attractions in {city}"
+        return city_key, categories, query
+
+    @staticmethod
+    def _merge(results, extra, k):
+        seen = {doc.page_content for doc in results}
+        return results + [doc for doc in extra if doc.page_content not in seen][:k - len(results)]
+
+    def search(self, city, preferences=None, k=ATTR_TOP_K, main_categories=None):
+        """
+        Return up to `k` POI documents for a city, preferring the categories implied by
+        `preferences` and topping up from the rest of the city when those run short.
+        """
+        city_key, categories, query = self._plan(city, preferences)
+        results = []
+        with timed("external", "chroma.poi_search"):
+            if categories or main_categories:
+                results = self.db.similarity_search(query, k=k, filter=self._filter(city_key, categories, main_categories))
+            if len(results) < k:
+                extra = self.db.similarity_search(query, k=k, filter=self._filter(city_key))
+                results = self._merge(results, extra, k)
+        logger.info(f"📍 Selected {len(results)} POIs for {city} (categories: {categories or 'any'})")
+        return results
+
+    async def asearch(self, city, preferences=None, k=ATTR_TOP_K, main_categories=None):
+        city_key, categories, query = self._plan(city, preferences)
+        results = []
+        with timed("external", "chroma.poi_search"):
+            if categories or main_categories:
+                results = await self.db.asimilarity_search(
+                    query, k=k, filter=self._filter(city_key, categories, main_categories)
+                )
+            if len(results) < k:
+                extra = await self.db.asimilarity_search(query, k=k, filter=self._filter(city_key))
+                results = self._merge(results, extra, k)
+        logger.info(f"📍 Selected {len(results)} POIs for {city} (categories: {categories or 'any'})")
+        return results
+
+
+def format_poi_context(city, documents) -> str:
+    """Render selected POI documents as the attraction context for the summarizer prompt."""
+    meta = documents[0].metadata
+    header = f"Tourist attractions in {meta.get('city', city)}, {meta.get('state')}, {meta.get('country')} include:"
+    return "\n".join([header] + [f"- {doc.page_content}" for doc in documents])
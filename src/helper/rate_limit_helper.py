@@ -0,0 +1,50 @@
+import os
+import threading
+
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+from src.tools.logger import logger
+
+# External providers that can be throttled; RATE_LIMIT_<PROVIDER>_RPS unset or 0 means unlimited.
+PROVIDERS = ("azure_openai", "amadeus", "serpapi")
+
+
+class RateLimiterRegistry:
+    """
+    Process-wide token-bucket rate limiters, one per external provider.
+
+    Shared by every session and worker thread so a batch run stays under each
+    provider's quota. Rates come from `RATE_LIMIT_<PROVIDER>_RPS` or `configure`.
+    """
+
+    _limiters = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, rates: dict):
+        """Set requests-per-second per provider; a falsy rate removes the limit."""
+        with cls._lock:
+            for provider, rps in rates.items():
+                if rps:
+                    cls._limiters[provider] = InMemoryRateLimiter(
+                        requests_per_second=float(rps), check_every_n_seconds=0.05, max_bucket_size=max(1, int(rps))
+                    )
+                    logger.info(f"🚦 Rate limit for {provider}: {rps} req/s")
+                else:
+                    cls._limiters.pop(provider, None)
+
+    @classmethod
+    def get(cls, provider):
+        return cls._limiters.get(provider)
+
+    @classmethod
+    def throttle(cls, provider):
+        """Block until the provider's bucket has a token. No-op when it is not limited."""
+        limiter = cls._limiters.get(provider)
+        if limiter is not None:
+            limiter.acquire()
+
+
+RateLimiterRegistry.configure({
+    provider: float(os.getenv(f"RATE_LIMIT_{provider.upper()}_RPS", 0)) for provider in PROVIDERS
+})
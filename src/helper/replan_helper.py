@@ -0,0 +1,71 @@
+import os
+from datetime import date, timedelta
+
+from src.helper.plan_cache_helper import COMPONENT_FIELDS, _canonical_value
+from src.tools.logger import logger
+
+REPLAN_ENABLED = os.getenv("REPLAN_ENABLED", "true").lower() == "true"
+
+# Graph branches, in fan-out order; the itinerary is always regenerated
+REPLAN_BRANCHES = ("flights", "hotels", "attractions")
+
+
+def changed_fields(previous, current) -> set:
+    """`user_data` fields whose canonical values differ between two parses."""
+    previous, current = previous or {}, current or {}
+    return {
+        field for field in set(previous) | set(current)
+        if _canonical_value(field, previous.get(field)) != _canonical_value(field, current.get(field))
+    }
+
+
+def affected_branches(changed) -> list:
+    """Branches whose results depend on any of the `changed` fields (see `COMPONENT_FIELDS`)."""
+    return [branch for branch in REPLAN_BRANCHES if set(COMPONENT_FIELDS[branch]) & set(changed)]
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def apply_refinement(previous, refined, set_fields=None) -> dict:
+    """
+    Merge a follow-up's parsed details into the previous trip.
+
+    Fields the follow-up left empty, or that the model did not set (when `set_fields`
+    is given; schema defaults such as `num_travelers=1` are not changes), keep their
+    previous values unless it names a different destination. When only the trip length changed on a dated round trip,
+    the return date moves with it, so flights and hotels are re-planned too; with
+    no dates, a new length only touches attractions and the itinerary.
+    """
+    previous, refined = dict(previous or {}), dict(refined or {})
+    same_trip = _canonical_value("destination_city", refined.get("destination_city")) in (
+        None, _canonical_value("destination_city", previous.get("destination_city"))
+    )
+    updates = {k: v for k, v in refined.items() if v not in (None, "") and (set_fields is None or k in set_fields)}
+    merged = {**previous, **updates} if same_trip else refined
+
+    departure = _parse_date(merged.get("departure_date"))
+    length_changed = "num_days" in changed_fields(previous, merged)
+    return_unchanged = "return_date" not in changed_fields(previous, merged)
+    if length_changed and return_unchanged and departure and previous.get("return_date") and merged.get("num_days"):
+        try:
+            merged["return_date"] = (departure + timedelta(days=int(merged["num_days"]) - 1)).isoformat()
+        except (TypeError, ValueError):
+            pass
+    return merged
+
+
+def plan_refinement(previous, refined, set_fields=None):
+    """Return the merged `user_data` and the branches that must run again for it."""
+    user_data = apply_refinement(previous, refined, set_fields)
+    changed = changed_fields(previous, user_data)
+    branches = affected_branches(changed)
+    logger.info(
+        f"🔀 Follow-up changed {sorted(changed) or 'nothing'}; "
+        f"re-planning {', '.join(branches) or 'itinerary only'}"
+    )
+    return user_data, branches
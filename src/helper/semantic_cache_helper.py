@@ -0,0 +1,119 @@
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from src.tools.logger import logger
+
+PARSE_CACHE_MAX_ENTRIES = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", 512))
+PARSE_CACHE_SIMILARITY = float(os.getenv("PARSE_CACHE_SIMILARITY", 0.97))
+
+
+def normalize_message(text) -> str:
+    """Lowercase, drop punctuation that does not change meaning and collapse whitespace."""
+    text = re.sub(r"[!?.,;:\"'()]+", " ", str(text or "").lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def message_numbers(text) -> tuple:
+    """Numbers in a normalized message, in order; the default semantic-hit signature."""
+    return tuple(re.findall(r"\d+", text))
+
+
+def _unit(vector):
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class SemanticCache:
+    """
+    Two-tier, size-bounded LRU cache for LLM extraction results.
+
+    - Tier 1: exact match on the normalized message.
+    - Tier 2: cosine similarity between message embeddings, at or above `threshold`.
+      A semantic hit also needs both messages to have the same `signature` (by default
+      their numbers in order), so "2 people" and "3 people" or two different dates
+      never share an entry. Embeddings can be order-invariant, so callers caching
+      anything that depends on named entities should include them in the signature.
+
+    Entries are namespaced (e.g. by model and prompt version) and each tier holds at
+    most `max_entries`. Without an `embedding`, only the exact tier is used.
+    """
+
+    def __init__(self, name, embedding=None, threshold=PARSE_CACHE_SIMILARITY, max_entries=PARSE_CACHE_MAX_ENTRIES,
+                 signature=message_numbers):
+        self.name = name
+        self.embedding = embedding
+        self.signature = signature
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._exact = OrderedDict()
+        self._vectors = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "evictions": 0}
+
+    def _embed(self, normalized):
+        if self.embedding is None:
+            return None
+        try:
+            return _unit(self.embedding.embed_query(normalized))
+        except Exception as e:
+            logger.warning(f"⚠️ [{self.name}] embedding failed, semantic tier skipped: {e}")
+            return None
+
+    def get(self, namespace, message):
+        """Return `(value, tier)` for a cached message, or `(None, None)` on a miss."""
+        normalized = normalize_message(message)
+        key = (namespace, normalized)
+        with self._lock:
+            if key in self._exact:
+                self._exact.move_to_end(key)
+                self._stats["exact_hits"] += 1
+                return self._exact[key], "exact"
+
+        vector = self._embed(normalized)
+        if vector is not None:
+            signature = self.signature(normalized)
+            with self._lock:
+                best_key, best_score = None, self.threshold
+                for (entry_ns, entry_text), (entry_signature, entry_vector) in self._vectors.items():
+                    if entry_ns != namespace or entry_signature != signature:
+                        continue
+                    score = sum(a * b for a, b in zip(vector, entry_vector))
+                    if score >= best_score:
+                        best_key, best_score = (entry_ns, entry_text), score
+                if best_key is not None and best_key in self._exact:
+                    self._vectors.move_to_end(best_key)
+                    self._exact.move_to_end(best_key)
+                    self._stats["semantic_hits"] += 1
+                    logger.info(f"🧠 [{self.name}] semantic cache hit (similarity {best_score:.3f})")
+                    return self._exact[best_key], "semantic"
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None, None
+
+    def set(self, namespace, message, value):
+        normalized = normalize_message(message)
+        key = (namespace, normalized)
+        vector = self._embed(normalized)
+        with self._lock:
+            self._exact[key] = value
+            self._exact.move_to_end(key)
+            if vector is not None:
+                self._vectors[key] = (self.signature(normalized), vector)
+                self._vectors.move_to_end(key)
+            for entries in (self._exact, self._vectors):
+                while len(entries) > self.max_entries:
+                    entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._exact.clear()
+            self._vectors.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"name": self.name, "size": len(self._exact), "max_entries": self.max_entries, **self._stats}
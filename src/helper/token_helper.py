@@ -0,0 +1,18 @@
+from src.tools.logger import logger
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional; fall back to a character heuristic
+    _ENCODING = None
+    logger.info("tiktoken not available; using ~4 chars/token estimate for prompt sizing")
+
+
+def count_tokens(text) -> int:
+    """Count prompt tokens locally (tiktoken when installed, otherwise ~4 characters per token)."""
+    if text is None:
+        return 0
+    text = text if isinstance(text, str) else str(text)
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return (len(text) + 3) // 4
@@ -0,0 +1,235 @@
+import csv
+import os
+import re
+from datetime import date, datetime
+
+from src.helper.airport_index_helper import AIRPORT_INDEX_PATH
+from src.helper.place_name_helper import normalize_place_name
+from src.tools.logger import logger
+
+RULE_MIN_CONFIDENCE = float(os.getenv("RULE_MIN_CONFIDENCE", 0.8))
+
+NUMBER_WORDS = {
+    "a": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "fourteen": 14, "fifteen": 15,
+}
+NUMBER = r"(\d{1,2}|" + "|".join(NUMBER_WORDS) + r")"
+
+MONTHS = r"(jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*"
+DATE_PATTERNS = [
+    (re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b"), lambda m: date(int(m[1]), int(m[2]), int(m[3]))),
+    (re.compile(rf"\b(\d{{1,2}})(?:st|nd|rd|th)?\s+{MONTHS},?\s+(\d{{4}})\b"),
+     lambda m: datetime.strptime(f"{m[1]} {m[2][:3]} {m[3]}", "%d %b %Y").date()),
+    (re.compile(rf"\b{MONTHS}\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s+(\d{{4}})\b"),
+     lambda m: datetime.strptime(f"{m[2]} {m[1][:3]} {m[3]}", "%d %b %Y").date()),
+]
+
+PREFERENCE_WORDS = (
+    "relaxing", "relaxed", "leisure", "adventure", "adventurous", "cultural", "culture", "historical", "heritage",
+    "religious", "spiritual", "pilgrimage", "nature", "beach", "beaches", "wildlife", "hiking", "trekking",
+    "shopping", "nightlife", "food", "foodie", "romantic", "honeymoon", "family", "museums", "sightseeing",
+)
+PREFERENCE_PATTERN = re.compile(r"\b(" + "|".join(PREFERENCE_WORDS) + r")\b")
+
+BUDGET_PATTERN = re.compile(
+    r"(?:budget(?: of| is|:)?|under|within|around|upto|up to)\s*"
+    r"((?:rs\.?|inr|usd|eur|₹|\$|€)?\s*\d[\d,]*(?:\.\d+)?\s*(?:k|lakh|lakhs|inr|usd|eur|rupees|dollars)?)"
+)
+
+# Gazetteer names that are also common words
+AMBIGUOUS_CITY_NAMES = {"la", "male", "mobile", "sari", "gir", "buffalo", "providence", "lafayette", "augusta"}
+
+# Messages with these need judgement the rules do not have, so they go to the LLM.
+AMBIGUOUS_PATTERN = re.compile(
+    r"\b(next|this|coming|tomorrow|weekend|sometime|maybe|or|either|not sure|flexible|instead|except|"
+    r"kids?|children|infant)\b"
+)
+
+# People who may be travelling along; outside a matched count phrase they make the count doubtful.
+COMPANION_PATTERN = re.compile(
+    r"\b(friends?|family|colleagues?|others|parents?|mother|mom|father|dad|brothers?|sisters?|sons?|"
+    r"daughters?|cousins?|wife|husband|partner|girlfriend|boyfriend|fianc[eé]e?|in-laws|grand\w+|"
+    r"couples?|joining|joins|accompany\w*)\b"
+)
+
+# (pattern, count from match, confidence), tried in order; the first match wins.
+TRAVELER_RULES = [
+    (re.compile(rf"\bwith\s+(?:my\s+)?{NUMBER}\s+(?:friends?|colleagues?|others?)\b"),
+     lambda m: _to_int(m[1]) + 1, 0.9),
+    (re.compile(rf"\b{NUMBER}\s+(?:people|persons?|travell?ers|adults|pax|guests|of us)\b"),
+     lambda m: _to_int(m[1]), 0.95),
+    (re.compile(rf"\b{NUMBER}\s+couples\b"), lambda m: 2 * _to_int(m[1]), 0.9),
+    (re.compile(r"\b(solo|alone|by myself|just me)\b"), lambda m: 1, 0.9),
+    (re.compile(r"\b(couple(?!\s+of\b)|with my (?:wife|husband|partner|girlfriend|boyfriend)|honeymoon)\b"),
+     lambda m: 2, 0.85),
+]
+
+
+def _to_int(token):
+    return int(token) if token.isdigit() else NUMBER_WORDS[token]
+
+
+class RuleBasedTripExtractor:
+    """
+    Deterministic extractor for formulaic trip requests such as
+    "Mumbai to Delhi from 2025-12-01 to 2025-12-05 for 2 people".
+
+    Fills the `UserDetails` fields from a city gazetteer (the city and alias names in the
+    prefilled airport index), date patterns, traveler-count phrases and "for X days", and
+    reports a confidence per field. `is_confident` decides whether the result can be used
+    without the LLM.
+    """
+
+    def __init__(self, gazetteer_path=AIRPORT_INDEX_PATH, min_confidence=RULE_MIN_CONFIDENCE):
+        self.min_confidence = min_confidence
+        self._cities = {}
+        try:
+            with open(gazetteer_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    names = [row["city"]] + [a for a in (row.get("aliases") or "").split("|") if a]
+                    for name in names:
+                        key = normalize_place_name(name)
+                        if key not in AMBIGUOUS_CITY_NAMES:
+                            # Keep the name as listed: aliases like "Munnar" are places of their own
+                            self._cities.setdefault(key, name)
+        except Exception as e:
+            logger.exception(f"❌ Failed to load city gazetteer for rule-based extraction: {e}")
+        # Longest names first so "new delhi" wins over "delhi"
+        names = sorted(self._cities, key=len, reverse=True)
+        self._city_pattern = re.compile(r"\b(" + "|".join(map(re.escape, names)) + r")\b") if names else None
+
+    def place_mentions(self, text) -> tuple:
+        """Gazetteer places mentioned in lowercased `text`, in order of appearance."""
+        if self._city_pattern is None:
+            return ()
+        return tuple(self._cities[m.group(1)] for m in self._city_pattern.finditer(text))
+
+    def _find_cities(self, text):
+        """
+        Return `(origin, destination, confidence)` from gazetteer mentions and their markers.
+        With two cities the origin must be explicit ("from X" or "X to Y"); any other pair
+        ("Goa and Mumbai", "in Goa, not Delhi") is left to the LLM.
+        """
+        if self._city_pattern is None:
+            return None, None, {}
+        mentions = [(m.start(), m.end(), self._cities[m.group(1)]) for m in self._city_pattern.finditer(text)]
+        unique = list(dict.fromkeys(city for _, _, city in mentions))
+        if not unique or len(unique) > 2:
+            return None, None, {}
+
+        def marker(position):
+            words = text[:position].split()
+            return words[-1] if words else ""
+
+        origin = destination = None
+        for start, _, city in mentions:
+            word = marker(start)
+            if word == "from" and origin is None:
+                origin = city
+            elif word in ("to", "visit", "visiting", "in", "explore", "at", "for") and destination is None:
+                destination = city
+
+        if len(unique) == 2:
+            if origin is None:
+                # "X to Y": the first city directly followed by "to" and the other city
+                for (_, end, first), (start, _, second) in zip(mentions, mentions[1:]):
+                    if first != second and re.fullmatch(r"\s+to\s+", text[end:start]):
+                        origin = first
+                        break
+            if origin is None:
+                return None, None, {}
+            destination = next(city for city in unique if city != origin)
+            return origin, destination, {"origin_city": 0.9, "destination_city": 0.9}
+
+        if origin:
+            return origin, None, {"origin_city": 0.9}
+        return None, unique[0], {"destination_city": 0.95 if destination else 0.7}
+
+    @staticmethod
+    def _find_dates(text):
+        found = []
+        for pattern, build in DATE_PATTERNS:
+            for m in pattern.finditer(text):
+                try:
+                    found.append((m.start(), build(m)))
+                except ValueError:
+                    continue
+        return [d for _, d in sorted(found)]
+
+    @staticmethod
+    def _find_travelers(text):
+        """
+        Return `(num_travelers, confidence)`. Only an explicit count or solo marker is
+        confident; a companion mentioned outside the matched phrase means the count may be
+        incomplete, and with no marker at all 1 is just the schema default.
+        """
+        for pattern, count, conf in TRAVELER_RULES:
+            m = pattern.search(text)
+            if m:
+                rest = text[:m.start()] + " " + text[m.end():]
+                return count(m), conf if not COMPANION_PATTERN.search(rest) else 0.5
+        if re.search(r"\bwith (?:my )?(?:friends|family|colleagues)\b", text):
+            return 1, 0.2
+        return 1, 0.5
+
+    def extract(self, message):
+        """Return `(fields, confidence)`; `fields` has every `UserDetails` key, `confidence` only the filled ones."""
+        text = re.sub(r"\s+", " ", str(message or "").lower()).strip()
+        fields = {
+            "origin_city": None, "destination_city": None, "departure_date": None, "return_date": None,
+            "num_days": None, "num_travelers": 1, "budget": None, "preferences": None,
+        }
+        confidence = {}
+
+        city_text = re.sub(r"[,.;:!?()]", " ", text)
+        origin, destination, city_conf = self._find_cities(city_text)
+        fields["origin_city"], fields["destination_city"] = origin, destination
+        confidence.update(city_conf)
+
+        dates = self._find_dates(text)
+        if dates:
+            fields["departure_date"] = dates[0].isoformat()
+            confidence["departure_date"] = 0.95
+        if len(dates) >= 2 and dates[1] > dates[0]:
+            fields["return_date"] = dates[1].isoformat()
+            confidence["return_date"] = 0.95
+            fields["num_days"] = (dates[1] - dates[0]).days + 1
+            confidence["num_days"] = 0.85
+        if len(dates) > 2 or (len(dates) == 2 and dates[1] <= dates[0]):
+            confidence["departure_date"] = confidence["return_date"] = 0.3
+
+        m = re.search(rf"\b(?:for\s+)?{NUMBER}[\s-]+(days?|nights?)\b", text)
+        if m:
+            days = _to_int(m[1]) + (1 if m[2].startswith("night") else 0)
+            if fields["num_days"] not in (None, days):
+                confidence["num_days"] = 0.3
+            else:
+                fields["num_days"] = days
+                confidence["num_days"] = 0.95 if m[2].startswith("day") else 0.8
+
+        fields["num_travelers"], confidence["num_travelers"] = self._find_travelers(text)
+
+        m = BUDGET_PATTERN.search(text)
+        if m:
+            fields["budget"] = m[1].strip()
+            confidence["budget"] = 0.85
+
+        preferences = list(dict.fromkeys(PREFERENCE_PATTERN.findall(text)))
+        if preferences:
+            fields["preferences"] = ", ".join(preferences)
+            confidence["preferences"] = 0.8
+
+        if AMBIGUOUS_PATTERN.search(text):
+            confidence = {field: min(value, 0.5) for field, value in confidence.items()}
+        return fields, confidence
+
+    def is_confident(self, fields, confidence) -> bool:
+        """
+        True when the rules can stand in for the LLM: a destination, either dates or a
+        duration, and every filled field at or above `min_confidence`.
+        """
+        if not fields.get("destination_city"):
+            return False
+        if not (fields.get("departure_date") or fields.get("num_days")):
+            return False
+        return all(value >= self.min_confidence for value in confidence.values())
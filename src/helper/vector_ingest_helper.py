@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import time
+
+from src.tools.logger import logger
+
+INGEST_BATCH_SIZE = int(os.getenv("VECTOR_INGEST_BATCH_SIZE", 64))
+MANIFEST_FILENAME = "ingest_manifest.json"
+
+
+def content_hash(text, metadata) -> str:
+    payload = json.dumps({"text": text, "metadata": metadata}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class VectorIngestor:
+    """
+    Incrementally syncs a Chroma collection with a set of documents.
+
+    Every document has a stable id and a content hash. Only new or changed documents
+    are embedded, documents no longer in the source are deleted, and embeddings are
+    written in bounded batches. The manifest of indexed hashes is saved after each
+    batch, so an interrupted sync resumes where it stopped.
+    """
+
+    def __init__(self, db, manifest_path, batch_size=INGEST_BATCH_SIZE):
+        self.db = db
+        self.manifest_path = manifest_path
+        self.batch_size = batch_size
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> dict:
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, encoding="utf-8") as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.exception(f"❌ Unreadable ingest manifest, re-indexing from scratch: {e}")
+        return {"documents": {}}
+
+    def _save_manifest(self):
+        self.manifest["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def sync(self, ids, texts, metadatas) -> dict:
+        """Bring the collection in line with the given documents. Returns counts per change type."""
+        indexed = self.manifest.setdefault("documents", {})
+        stored_ids = set(self.db.get(include=[])["ids"])
+        target = {doc_id: (text, meta, content_hash(text, meta)) for doc_id, text, meta in zip(ids, texts, metadatas)}
+
+        # Anything in the collection that is not a current document: removed sources or untracked legacy rows
+        stale_ids = sorted(stored_ids - set(target))
+        for start in range(0, len(stale_ids), self.batch_size):
+            batch = stale_ids[start:start + self.batch_size]
+            self.db.delete(ids=batch)
+            for doc_id in batch:
+                indexed.pop(doc_id, None)
+            self._save_manifest()
+        for doc_id in set(indexed) - set(target):
+            indexed.pop(doc_id)
+
+        pending = [
+            doc_id for doc_id, (_, _, digest) in target.items()
+            if indexed.get(doc_id) != digest or doc_id not in stored_ids
+        ]
+        added = sum(1 for doc_id in pending if doc_id not in indexed)
+        changed = len(pending) - added
+
+        logger.info(
+            f"🧮 Vector ingest plan: {added} new, {changed} changed, {len(stale_ids)} removed, "
+            f"{len(target) - len(pending)} unchanged"
+        )
+
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start:start + self.batch_size]
+            self.db.add_texts(
+                texts=[target[doc_id][0] for doc_id in batch],
+                metadatas=[target[doc_id][1] for doc_id in batch],
+                ids=batch
+            )
+            for doc_id in batch:
+                indexed[doc_id] = target[doc_id][2]
+            self._save_manifest()
+            logger.info(f"📥 Embedded {min(start + self.batch_size, len(pending))}/{len(pending)} documents")
+
+        if not pending and not stale_ids:
+            self._save_manifest()
+
+        return {
+            "added": added,
+            "changed": changed,
+            "removed": len(stale_ids),
+            "unchanged": len(target) - len(pending)
+        }
@@ -0,0 +1,124 @@
+import threading
+
+from src.LLMs.embeddingprovider import EmbeddingProvider
+from src.helper.city_index_helper import CityChunkIndex
+from src.helper.poi_index_helper import PoiIndex, ATTR_TOP_K
+from src.tools.tools_for_attr import AttractionTools
+from src.tools.logger import logger
+from src.tools.metrics import timed
+
+
+class AttractionStore:
+    """Bundle of the attractions dataset, embedding client, Chroma handles and lookup indexes loaded together."""
+
+    def __init__(self, tools, embedding, db, poi_db=None):
+        self.tools = tools
+        self.embedding = embedding
+        self.db = db
+        self.retriever = db.as_retriever() if db is not None else None
+        self.city_index = CityChunkIndex.from_chroma(db) if db is not None else CityChunkIndex()
+        self.poi_index = PoiIndex(poi_db) if poi_db is not None else None
+
+    def get_city_chunk(self, city_name):
+        """Exact/alias city lookup first; semantic search only on a miss."""
+        document = self.city_index.lookup(city_name)
+        if document is not None:
+            logger.info(f"🗂️ City index hit for '{city_name}'")
+            return document
+        logger.info(f"🔍 City index miss for '{city_name}', falling back to semantic search")
+        with timed("external", "chroma.city_search"):
+            results = self.retriever.invoke(city_name)
+        return results[0] if results else None
+
+    async def aget_city_chunk(self, city_name):
+        document = self.city_index.lookup(city_name)
+        if document is not None:
+            logger.info(f"🗂️ City index hit for '{city_name}'")
+            return document
+        logger.info(f"🔍 City index miss for '{city_name}', falling back to semantic search")
+        with timed("external", "chroma.city_search"):
+            results = await self.retriever.ainvoke(city_name)
+        return results[0] if results else None
+
+    def get_city_pois(self, city_name, preferences=None, k=ATTR_TOP_K):
+        """
+        Top-k attractions for a city filtered by the categories implied by `preferences`.
+        The city is resolved through the city chunk first so aliases and misspellings
+        map to the dataset's own name. Returns `(city_chunk, pois)` so callers can fall
+        back to the chunk without resolving the city again; `pois` is empty when no POI
+        index is loaded.
+        """
+        city_chunk = self.get_city_chunk(city_name)
+        if self.poi_index is None or city_chunk is None:
+            return city_chunk, []
+        return city_chunk, self.poi_index.search(city_chunk.metadata.get("city", city_name), preferences, k=k)
+
+    async def aget_city_pois(self, city_name, preferences=None, k=ATTR_TOP_K):
+        city_chunk = await self.aget_city_chunk(city_name)
+        if self.poi_index is None or city_chunk is None:
+            return city_chunk, []
+        return city_chunk, await self.poi_index.asearch(city_chunk.metadata.get("city", city_name), preferences, k=k)
+
+
+class AttractionStoreRegistry:
+    """
+    Process-wide registry for the attraction vector store.
+
+    The store is loaded once and shared by every session and Streamlit rerun.
+    Readers grab the current `AttractionStore` reference without locking; `reload`
+    builds a replacement off to the side and swaps it in, so in-flight requests keep
+    using the store they started with.
+    """
+
+    _store = None
+    _load_lock = threading.Lock()
+    _reload_lock = threading.Lock()
+
+    @staticmethod
+    def _build_store():
+        logger.info("📦 Loading attraction dataset, embeddings and vector DB...")
+        tools = AttractionTools()
+        embedding = EmbeddingProvider.get_embedding()
+        vector_db_path = EmbeddingProvider.get_vector_db_path()
+        db = tools.create_vector_db(embedding=embedding, vector_db_path=vector_db_path)
+        if db is None:
+            raise RuntimeError("Attraction vector DB could not be loaded")
+        poi_db = tools.create_poi_db(embedding=embedding, vector_db_path=vector_db_path)
+        if poi_db is None:
+            logger.warning("⚠️ POI collection unavailable, attraction retrieval will use whole-city chunks")
+        logger.info("✅ Attraction store loaded")
+        return AttractionStore(tools, embedding, db, poi_db)
+
+    @classmethod
+    def get_store(cls) -> AttractionStore:
+        store = cls._store
+        if store is None:
+            with cls._load_lock:
+                if cls._store is None:
+                    cls._store = cls._build_store()
+                store = cls._store
+        return store
+
+    @classmethod
+    def get_retriever(cls):
+        return cls.get_store().retriever
+
+    @classmethod
+    def warm_up(cls):
+        """Load the store eagerly at startup. Safe to call more than once."""
+        try:
+            cls.get_store()
+            return True
+        except Exception as e:
+            logger.exception(f"❌ Attraction store warm-up failed: {e}")
+            return False
+
+    @classmethod
+    def reload(cls):
+        """Rebuild the store and swap it in without blocking readers."""
+        with cls._reload_lock:
+            logger.info("🔄 Reloading attraction store...")
+            new_store = cls._build_store()
+            cls._store = new_store
+            logger.info("✅ Attraction store swapped in")
+            return new_store
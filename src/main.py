@@ -2,8 +2,8 @@ import streamlit as st
 import logging
 
 from src.ui.streamlitui.loadui import LoadStreamlitUI
-from src.LLMs.openaillm import OpenAiLLM
-from src.graphs.graph_builder import GraphBuilder
+from src.graphs.graph_registry import GraphRegistry
+from src.graphs.plan_session import PlanSession
 from src.ui.streamlitui.displayresult import DisplayResultStreamlit
 from src.tools.logger import logger  # Shared logger import
 
@@ -11,9 +11,9 @@ from src.tools.logger import logger  # Shared logger import
 def load_travel_planner_agent():
     """
     Loads and runs the LangGraph AgenticAI application with Streamlit UI.
-    This function initializes the UI, handles user input, configures the LLM model,
-    sets up the graph based on the selected use case, and displays the output while
-    implementing exception handling for robustness.
+    This function initializes the UI, handles user input, fetches the cached compiled
+    graph (built once per model config), and displays the output while implementing
+    exception handling for robustness.
     """
     logger.info("Starting travel planner agent...")
 
@@ -21,29 +21,27 @@ def load_travel_planner_agent():
     user_inp = ui.load_streamlit_ui()
     logger.info("Streamlit UI loaded successfully.")
 
+    if not GraphRegistry.self_check():
+        st.error("Error: Travel planner failed its startup self-check. See travel_agent.log for details.")
+        return
+
+    graph = GraphRegistry.get_graph()
+    logger.info("Compiled graph retrieved successfully.")
+    # The thread id lives in the URL so a page reload keeps the session's checkpointed plan;
+    # later messages refine that plan until the user starts a new trip
+    new_trip = st.sidebar.button("🆕 New trip")
+    if new_trip or "thread" not in st.query_params:
+        st.query_params["thread"] = PlanSession(graph).thread_id
+    session = PlanSession(graph, st.query_params["thread"])
+
+    resume = bool(session.pending_nodes()) and st.button("🔁 Resume last plan")
     user_msg = st.chat_input("Enter your message:")
-    if user_msg:
-        logger.info("User input received: %s", user_msg)
+    if user_msg or resume:
+        logger.info("User input received: %s", user_msg or "<resume>")
         try:
-            model = OpenAiLLM.get_llm_model()
-            if not model:
-                logger.error("Failed to load LLM model.")
-                st.error("Error: Failed to load LLM model.")
-                return
-
-            logger.info("LLM model loaded successfully.")
-            graph_builder = GraphBuilder(model)
-
-            try:
-                graph = graph_builder.setup_graph()
-                logger.info("Graph setup completed successfully.")
-                # st.image(img, caption="Generated Graph")
-                DisplayResultStreamlit(graph, user_msg).render_result_on_ui()
-                logger.info("Result displayed successfully on Streamlit UI.")
-            except Exception as e:
-                logger.exception("Error while setting up graph: %s", str(e))
-                st.error(f"Error: Failed to set up graph: {str(e)}")
-                return
+            # st.image(img, caption="Generated Graph")
+            DisplayResultStreamlit(graph, user_msg, session=session).render_result_on_ui()
+            logger.info("Result displayed successfully on Streamlit UI.")
 
         except Exception as ex:
             logger.exception("Unexpected error during travel planner execution: %s", str(ex))
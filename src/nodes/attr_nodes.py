@@ -1,13 +1,24 @@
+import asyncio
 from pydantic import BaseModel, Field
 from typing import List
 from langchain_core.prompts import ChatPromptTemplate
 
 from src.state.state import TravelPlanState
 from src.LLMs.openaillm import OpenAiLLM
-from src.tools.tools_for_attr import AttractionTools
+from src.helper.vector_store_helper import AttractionStoreRegistry
+from src.helper.poi_index_helper import format_poi_context
 from src.tools.logger import logger
 
 
+class POIRecommendation(BaseModel):
+    name: str = Field(..., description="Name of the place of interest")
+    category: str = Field(..., description="Category of the attraction, e.g. Cultural, Nature, Entertainment")
+
+
+class DestinationRecommendations(BaseModel):
+    recommendations: List[POIRecommendation]
+
+
 class AttractionNodes:
     def __init__(self, llm):
         self.llm = llm
@@ -22,10 +33,12 @@ class AttractionNodes:
             destination_city = user_data.get("destination_city")
             logger.info(f"Fetching attraction details for city: {destination_city}")
 
-            tools_for_attr = AttractionTools()
-            retriever = tools_for_attr.create_retriever()
-            retriever_results = retriever.invoke(destination_city)
-            dest_data = retriever_results[0].page_content
+            store = AttractionStoreRegistry.get_store()
+            city_chunk, pois = store.get_city_pois(destination_city, user_data.get("preferences"))
+            if pois:
+                dest_data = format_poi_context(destination_city, pois)
+            else:
+                dest_data = city_chunk.page_content
 
             logger.info(f"Retrieved attraction details for {destination_city} successfully")
 
@@ -39,77 +52,136 @@ class AttractionNodes:
             logger.exception(f"Error occurred while fetching attraction details: {e}")
             raise
 
-    def summarize_attr_data(self, state: TravelPlanState) -> dict:
+    async def afetch_attr_data(self, state: TravelPlanState) -> dict:
         """
-        Generate top attraction recommendations based on user's travel details.
+        Async variant of `fetch_attr_data`.
         """
         try:
-            logger.info("Starting top attraction recommendations generation")
+            user_data = state["user_data"]
+            destination_city = user_data.get("destination_city")
+            logger.info(f"Fetching attraction details for city (async): {destination_city}")
 
-            class POIRecommendation(BaseModel):
-                name: str = Field(..., description="Name of the place of interest")
-                category: str = Field(..., description="Category of the attraction, e.g. Cultural, Nature, Entertainment")
+            store = await asyncio.to_thread(AttractionStoreRegistry.get_store)
+            city_chunk, pois = await store.aget_city_pois(destination_city, user_data.get("preferences"))
+            if pois:
+                dest_data = format_poi_context(destination_city, pois)
+            else:
+                dest_data = city_chunk.page_content
 
-            class DestinationRecommendations(BaseModel):
-                recommendations: List[POIRecommendation]
+            logger.info(f"Retrieved attraction details for {destination_city} successfully")
 
-            llm = self.llm.with_structured_output(DestinationRecommendations)
-            logger.info("Structured LLM model prepared for top attraction recommendations")
+            return {
+                "attractions": {
+                    "all_attr_data": dest_data,
+                    "top_attr_data": ""
+                }
+            }
+        except Exception as e:
+            logger.exception(f"Error occurred while fetching attraction details: {e}")
+            raise
 
-            user_data = state["user_data"]
-            dest_data = state["attractions"]["all_attr_data"]
+    def _build_summary_chain(self, state: TravelPlanState):
+        """
+        Build the structured-output chain and its inputs for attraction summarization.
+        """
+        llm = self.llm.with_structured_output(DestinationRecommendations)
+        logger.info("Structured LLM model prepared for top attraction recommendations")
 
-            system = """
-            You are a travel planner AI specializing in finding tourist attractions for a given set of travel details like number of days and reason of travel.
+        user_data = state["user_data"]
+        dest_data = state["attractions"]["all_attr_data"]
 
-            You are provided below:
-            - A list of tourist attractions for a specific city (including names, categories, and descriptions)
-            - Details about the user’s trip (e.g., duration, travel reason, and preferences)
+        system = """
+        You are a travel planner AI specializing in finding tourist attractions for a given set of travel details like number of days and reason of travel.
 
-            Your goal is to generate a list of the **top recommended places to visit** for a traveler, 
-            structured according to the `DestinationRecommendations` schema. 
+        You are provided below:
+        - A list of tourist attractions for a specific city (including names, categories, and descriptions),
+          pre-selected for relevance to the user's preferences
+        - Details about the user’s trip (e.g., duration, travel reason, and preferences)
 
-            Guidelines:
-            - Choose as many recommendations as the need be based on the user's preferences and travel time.
-            - Ensure a good balance of categories (e.g., Cultural, Nature, Entertainment, Religious, Adventure, etc.) if available
-            - Do not hallucinate names or places not present in `dest_data`. If fewer attractions match well, recommend only those with strong relevance.
-            - Be concise, avoid repetition, and prefer quality over quantity.
-            - Only select from the given data context.
-            - The details provided by the user are very important and should never be ignored.
-            - Output must strictly follow the `DestinationRecommendations` schema.
+        Your goal is to generate a list of the **top recommended places to visit** for a traveler,
+        structured according to the `DestinationRecommendations` schema.
 
-            List of All tourist attractions:
-            {context}
+        Guidelines:
+        - Choose as many recommendations as the need be based on the user's preferences and travel time.
+        - Ensure a good balance of categories (e.g., Cultural, Nature, Entertainment, Religious, Adventure, etc.) if available
+        - Do not hallucinate names or places not present in `dest_data`. If fewer attractions match well, recommend only those with strong relevance.
+        - Be concise, avoid repetition, and prefer quality over quantity.
+        - Only select from the given data context.
+        - The details provided by the user are very important and should never be ignored.
+        - Output must strictly follow the `DestinationRecommendations` schema.
 
-            Details about the user’s trip:
-            {query}
-            """
-            query = (
-                f"Travelling to {user_data['destination_city']} for {user_data['num_days']} days "
-                f"with {user_data['num_travelers']} people, my preferences are {user_data['preferences']}"
-            )
+        List of All tourist attractions:
+        {context}
 
-            prompt = ChatPromptTemplate.from_template(system)
-            get_top_results_chain = prompt | llm
+        Details about the user’s trip:
+        {query}
+        """
+        query = (
+            f"Travelling to {user_data['destination_city']} for {user_data['num_days']} days "
+            f"with {user_data['num_travelers']} people, my preferences are {user_data['preferences']}"
+        )
+
+        prompt = ChatPromptTemplate.from_template(system)
+        get_top_results_chain = prompt | llm
+        return get_top_results_chain, {"context": dest_data, "query": query}
+
+    @staticmethod
+    def _summary_fallback(state: TravelPlanState) -> dict:
+        return {
+            "attractions": {
+                "all_attr_data": state["attractions"].get("all_attr_data", []),
+                "top_attr_data": "[No attraction recommendations available — limited or missing destination data.]"
+            }
+        }
 
-            logger.info(f"Invoking LLM for top attractions in {user_data['destination_city']}")
-            top_attr_details = get_top_results_chain.invoke({"context": dest_data, "query": query})
+    def summarize_attr_data(self, state: TravelPlanState) -> dict:
+        """
+        Generate top attraction recommendations based on user's travel details.
+        """
+        try:
+            logger.info("Starting top attraction recommendations generation")
+
+            chain, inputs = self._build_summary_chain(state)
+            city = state["user_data"]["destination_city"]
 
-            logger.info(f"Successfully generated top attraction recommendations for {user_data['destination_city']}")
+            logger.info(f"Invoking LLM for top attractions in {city}")
+            top_attr_details = chain.invoke(inputs)
+
+            logger.info(f"Successfully generated top attraction recommendations for {city}")
 
             return {
                 "attractions": {
-                    "all_attr_data": dest_data,
+                    "all_attr_data": inputs["context"],
                     "top_attr_data": top_attr_details
                 }
             }
 
         except Exception as e:
             logger.exception(f"Attraction recommendation summarization failed. Using fallback message.")
+            return self._summary_fallback(state)
+
+    async def asummarize_attr_data(self, state: TravelPlanState) -> dict:
+        """
+        Async variant of `summarize_attr_data`.
+        """
+        try:
+            logger.info("Starting top attraction recommendations generation (async)")
+
+            chain, inputs = self._build_summary_chain(state)
+            city = state["user_data"]["destination_city"]
+
+            logger.info(f"Invoking LLM for top attractions in {city}")
+            top_attr_details = await chain.ainvoke(inputs)
+
+            logger.info(f"Successfully generated top attraction recommendations for {city}")
 
             return {
                 "attractions": {
-                    "all_attr_data": state["attractions"].get("all_attr_data", []),
-                    "top_attr_data": "[No attraction recommendations available — limited or missing destination data.]"
+                    "all_attr_data": inputs["context"],
+                    "top_attr_data": top_attr_details
                 }
             }
+
+        except Exception as e:
+            logger.exception(f"Attraction recommendation summarization failed. Using fallback message.")
+            return self._summary_fallback(state)
@@ -1,3 +1,4 @@
+import asyncio
 from pydantic import BaseModel, Field
 from typing import List
 from langchain_core.prompts import ChatPromptTemplate
@@ -5,13 +6,29 @@ from langchain_core.prompts import ChatPromptTemplate
 from src.state.state import TravelPlanState
 from src.LLMs.openaillm import OpenAiLLM
 from src.tools.tools_for_flights import FlightTools
-from src.tools.logger import logger 
+from src.helper.flight_ranker_helper import FLIGHT_SUMMARY_MODE, rank_flights
+from src.tools.logger import logger
+
+
+class FlightOption(BaseModel):
+    airline: str = Field(..., description="Airline name or carrier code")
+    origin: str = Field(..., description="Departure airport code")
+    destination: str = Field(..., description="Arrival airport code")
+    price: float = Field(..., description="Total price of the flight")
+    currency: str = Field(..., description="Currency of the price")
+    duration: str = Field(..., description="Flight duration")
+    stops: int = Field(..., description="Number of stops")
+
+
+class FlightRecommendations(BaseModel):
+    recommendations: List[FlightOption]
 
 
 class FlightNodes:
-    def __init__(self, llm):
+    def __init__(self, llm, summary_mode=FLIGHT_SUMMARY_MODE):
         self.llm = llm
-        logger.info("FlightNodes initialized with LLM instance")
+        self.summary_mode = summary_mode
+        logger.info(f"FlightNodes initialized with LLM instance (summary mode: {summary_mode})")
 
     # -------------------------------------------------------
     # 1️⃣ Retrieve flight details
@@ -34,16 +51,11 @@ class FlightNodes:
             )
 
             flight_tool = FlightTools()
-            outbound_flights = flight_tool.fetch_flights(
-                origin_city, destination_city, departure_date, adults, top_n=5
+            outbound_flights, return_flights = flight_tool.fetch_round_trip_flights(
+                origin_city, destination_city, departure_date, return_date, adults, top_n=5
             )
             logger.info(f"Retrieved {len(outbound_flights)} outbound flight options")
-
-            return_flights = []
             if return_date:
-                return_flights = flight_tool.fetch_return_flights(
-                    origin_city, destination_city, return_date, adults, top_n=5
-                )
                 logger.info(f"Retrieved {len(return_flights)} return flight options")
 
             logger.info("Flight data fetched successfully")
@@ -60,97 +72,152 @@ class FlightNodes:
             logger.exception(f"Error occurred while fetching flight data: {e}")
             raise
 
+    async def afetch_flight_data(self, state: TravelPlanState) -> dict:
+        """
+        Async variant of `fetch_flight_data`. The Amadeus SDK is blocking, so the
+        lookups run in worker threads and the event loop stays free.
+        """
+        return await asyncio.to_thread(self.fetch_flight_data, state)
+
     # -------------------------------------------------------
-    # 2️⃣ Summarize top flights with LLM
+    # 2️⃣ Summarize top flights (deterministic ranking or LLM)
     # -------------------------------------------------------
-    def summarize_flight_data(self, state: TravelPlanState) -> dict:
+    @staticmethod
+    def _rank_summary(state: TravelPlanState) -> dict:
         """
-        Use Azure LLM to generate summarized flight recommendations.
+        Pick top flights with the deterministic scorer instead of an LLM call.
         """
-        try:
-            logger.info("Starting top flight summary generation")
-
-            class FlightOption(BaseModel):
-                airline: str = Field(..., description="Airline name or carrier code")
-                origin: str = Field(..., description="Departure airport code")
-                destination: str = Field(..., description="Arrival airport code")
-                price: float = Field(..., description="Total price of the flight")
-                currency: str = Field(..., description="Currency of the price")
-                duration: str = Field(..., description="Flight duration")
-                stops: int = Field(..., description="Number of stops")
+        outbound_flights = state["flights"]["outbound_flights"]
+        return_flights = state["flights"]["return_flights"]
+        picks = rank_flights(outbound_flights, return_flights, top_n=3)
+        return {
+            "flights": {
+                "outbound_flights": outbound_flights,
+                "return_flights": return_flights,
+                "top_flight_summary": FlightRecommendations(
+                    recommendations=[FlightOption(**pick) for pick in picks]
+                )
+            }
+        }
 
-            class FlightRecommendations(BaseModel):
-                recommendations: List[FlightOption]
+    def _build_summary_chain(self, state: TravelPlanState):
+        """
+        Build the structured-output chain and its inputs for flight summarization.
+        """
+        llm = self.llm.with_structured_output(FlightRecommendations)
+        logger.info("Structured LLM model prepared for flight recommendations")
 
-            llm = self.llm.with_structured_output(FlightRecommendations)
-            logger.info("Structured LLM model prepared for flight recommendations")
+        user_data = state["user_data"]
+        outbound_flights = state["flights"]["outbound_flights"]
+        return_flights = state["flights"]["return_flights"]
 
-            user_data = state["user_data"]
-            outbound_flights = state["flights"]["outbound_flights"]
-            return_flights = state["flights"]["return_flights"]
+        system = """
+        You are a travel planner AI that helps users choose the best flight options.
 
-            system = """
-            You are a travel planner AI that helps users choose the best flight options.
+        You are provided:
+        - Outbound and (if available) return flight data with airline, timing, price, and stops.
+        - User trip details and preferences.
 
-            You are provided:
-            - Outbound and (if available) return flight data with airline, timing, price, and stops.
-            - User trip details and preferences.
+        Your task:
+        - Recommend top flights based on affordability, duration, and minimal stops.
+        - Prefer direct flights if prices are close.
+        - Choose only from the given flight data (no hallucination).
+        - Output must strictly follow the `FlightRecommendations` schema.
 
-            Your task:
-            - Recommend top flights based on affordability, duration, and minimal stops.
-            - Prefer direct flights if prices are close.
-            - Choose only from the given flight data (no hallucination).
-            - Output must strictly follow the `FlightRecommendations` schema.
+        Outbound Flights:
+        {outbound_context}
 
-            Outbound Flights:
-            {outbound_context}
+        Return Flights (if available):
+        {return_context}
 
-            Return Flights (if available):
-            {return_context}
+        User Trip Details:
+        {query}
+        """
 
-            User Trip Details:
-            {query}
-            """
+        query = (
+            f"Flying from {user_data['origin_city']} to {user_data['destination_city']} "
+            f"on {user_data['departure_date']}."
+        )
+        if user_data.get("return_date"):
+            query += f" Returning on {user_data['return_date']}."
+        query += (
+            f" {user_data['num_travelers']} traveller(s). "
+            f"Preferences: {user_data.get('preferences', 'None')}."
+        )
+
+        prompt = ChatPromptTemplate.from_template(system)
+        chain = prompt | llm
+        return chain, {
+            "outbound_context": outbound_flights,
+            "return_context": return_flights,
+            "query": query
+        }
+
+    @staticmethod
+    def _summary_fallback(state: TravelPlanState) -> dict:
+        return {
+            "flights": {
+                "outbound_flights": state["flights"].get("outbound_flights", []),
+                "return_flights": state["flights"].get("return_flights", []),
+                "top_flight_summary": "[No flight details available due to temporary data issues. "
+                                    "Please book flights manually based on your preferred timing.]"
+            }
+        }
 
-            query = (
-                f"Flying from {user_data['origin_city']} to {user_data['destination_city']} "
-                f"on {user_data['departure_date']}."
-            )
-            if user_data.get("return_date"):
-                query += f" Returning on {user_data['return_date']}."
-            query += (
-                f" {user_data['num_travelers']} traveller(s). "
-                f"Preferences: {user_data.get('preferences', 'None')}."
-            )
+    def summarize_flight_data(self, state: TravelPlanState) -> dict:
+        """
+        Generate flight recommendations, by deterministic ranking unless the LLM mode is configured.
+        """
+        try:
+            logger.info("Starting top flight summary generation")
+            if self.summary_mode != "llm":
+                return self._rank_summary(state)
 
-            prompt = ChatPromptTemplate.from_template(system)
-            chain = prompt | llm
+            chain, inputs = self._build_summary_chain(state)
+            user_data = state["user_data"]
 
             logger.info(f"Invoking LLM for flight summary | Route: {user_data['origin_city']} → {user_data['destination_city']}")
-            top_flight_summary = chain.invoke({
-                "outbound_context": outbound_flights,
-                "return_context": return_flights,
-                "query": query
-            })
+            top_flight_summary = chain.invoke(inputs)
 
             logger.info("Successfully generated top flight summary")
-            # print(f"Top Flight Summary: {top_flight_summary}")  # ✅ removed in favor of logger
 
             return {
                 "flights": {
-                    "outbound_flights": outbound_flights,
-                    "return_flights": return_flights,
+                    "outbound_flights": inputs["outbound_context"],
+                    "return_flights": inputs["return_context"],
                     "top_flight_summary": top_flight_summary
                 }
             }
 
         except Exception as e:
             logger.exception(f"⚠️ Flight summary generation failed. Using fallback message.")
+            return self._summary_fallback(state)
+
+    async def asummarize_flight_data(self, state: TravelPlanState) -> dict:
+        """
+        Async variant of `summarize_flight_data`.
+        """
+        try:
+            logger.info("Starting top flight summary generation (async)")
+            if self.summary_mode != "llm":
+                return self._rank_summary(state)
+
+            chain, inputs = self._build_summary_chain(state)
+            user_data = state["user_data"]
+
+            logger.info(f"Invoking LLM for flight summary | Route: {user_data['origin_city']} → {user_data['destination_city']}")
+            top_flight_summary = await chain.ainvoke(inputs)
+
+            logger.info("Successfully generated top flight summary")
+
             return {
                 "flights": {
-                    "outbound_flights": state["flights"].get("outbound_flights", []),
-                    "return_flights": state["flights"].get("return_flights", []),
-                    "top_flight_summary": "[No flight details available due to temporary data issues. "
-                                        "Please book flights manually based on your preferred timing.]"
+                    "outbound_flights": inputs["outbound_context"],
+                    "return_flights": inputs["return_context"],
+                    "top_flight_summary": top_flight_summary
                 }
             }
+
+        except Exception as e:
+            logger.exception(f"⚠️ Flight summary generation failed. Using fallback message.")
+            return self._summary_fallback(state)
@@ -1,13 +1,27 @@
+import asyncio
 from pydantic import BaseModel, Field
 from typing import List
 from langchain_core.prompts import ChatPromptTemplate
 
 from src.tools.tools_for_hotels import HotelTools
+from src.helper.hotel_payload_helper import build_hotel_candidates, format_hotel_context, stay_nights
 from src.state.state import TravelPlanState
 from src.LLMs.openaillm import OpenAiLLM
 from src.tools.logger import logger  # ✅ shared logger
 
 
+class HotelRecommendation(BaseModel):
+    name: str = Field(..., description="Hotel name")
+    rating: str = Field(..., description="Hotel rating or 'N/A'")
+    address: str = Field(..., description="Full address")
+    price: float = Field(..., description="Price as listed for the hotel (stay total or per night)")
+    currency: str = Field(..., description="Currency code")
+
+
+class HotelRecommendations(BaseModel):
+    recommendations: List[HotelRecommendation]
+
+
 class HotelNodes:
     def __init__(self, llm):
         self.llm = llm
@@ -42,10 +56,14 @@ class HotelNodes:
 
             logger.info(f"Retrieved {len(hotels) if hotels else 0} hotels for {city_name}")
 
+            # Keep only the ranked, compact fields the summarizer needs
+            candidates, context_report = build_hotel_candidates(hotels, currency="USD", nights=stay_nights(check_in, check_out))
+
             return {
                 "hotels": {
-                    "all_hotel_data": hotels,
-                    "top_hotel_data": ""
+                    "all_hotel_data": candidates,
+                    "top_hotel_data": "",
+                    "context_report": context_report
                 }
             }
 
@@ -53,6 +71,64 @@ class HotelNodes:
             logger.exception(f"Error occurred while fetching hotel data: {e}")
             raise
 
+    async def afetch_hotel_data(self, state: TravelPlanState) -> dict:
+        """
+        Async variant of `fetch_hotel_data`. SerpAPI's `GoogleSearch` is blocking, so the
+        search runs in a worker thread and the event loop stays free.
+        """
+        return await asyncio.to_thread(self.fetch_hotel_data, state)
+
+    def _build_summary_chain(self, state: TravelPlanState):
+        """
+        Build the structured-output chain and its inputs for hotel summarization.
+        """
+        llm = self.llm.with_structured_output(HotelRecommendations)
+        logger.info("Structured LLM model prepared for hotel recommendations")
+
+        user_data = state["user_data"]
+        hotel_data = state["hotels"]["all_hotel_data"]
+
+        system = """
+        You are a travel assistant that summarizes hotel options for a given city.
+        You are provided:
+        - A pre-ranked list of available hotels, one per line, with name, rating, address and price
+          (for the whole stay unless it is labelled per night).
+        - The user's travel details (city, duration, preferences).
+
+        Your goal:
+        - Recommend the top hotels for the user.
+        - Ensure a balance between affordability and quality.
+        - Highlight hotels suitable for the user's preferences.
+        - Strictly choose from the given hotel list (do not hallucinate).
+        - Follow the `HotelRecommendations` schema.
+
+        Hotel Data:
+        {context}
+
+        User Trip Details:
+        {query}
+        """
+
+        query = (
+            f"Travelling to {user_data['destination_city']} from {user_data['departure_date']} "
+            f"to {user_data['return_date']} with {user_data['num_travelers']} people. "
+            f"Preferences: {user_data['preferences']}."
+        )
+
+        prompt = ChatPromptTemplate.from_template(system)
+        chain = prompt | llm
+        return chain, {"context": format_hotel_context(hotel_data), "query": query}
+
+    @staticmethod
+    def _summary_fallback(state: TravelPlanState) -> dict:
+        return {
+            "hotels": {
+                **state["hotels"],
+                "all_hotel_data": state["hotels"].get("all_hotel_data", []),
+                "top_hotel_data": "[No hotel recommendations available — consider adjusting dates, filters or searching manually.]"
+            }
+        }
+
     def summarize_hotel_data(self, state: TravelPlanState) -> dict:
         """
         Use Azure LLM to generate summarized top hotel recommendations.
@@ -60,74 +136,47 @@ class HotelNodes:
         try:
             logger.info("Starting top hotel recommendations generation")
 
-            class HotelRecommendation(BaseModel):
-                name: str = Field(..., description="Hotel name")
-                rating: str = Field(..., description="Hotel rating or 'N/A'")
-                address: str = Field(..., description="Full address")
-                price: float = Field(..., description="Total price")
-                currency: str = Field(..., description="Currency code")
-
-            class HotelRecommendations(BaseModel):
-                recommendations: List[HotelRecommendation]
+            chain, inputs = self._build_summary_chain(state)
+            city = state["user_data"]["destination_city"]
 
-            llm = self.llm.with_structured_output(HotelRecommendations)
-            logger.info("Structured LLM model prepared for hotel recommendations")
+            logger.info(f"Invoking LLM for top hotels in {city}")
+            top_hotels = chain.invoke(inputs)
 
-            user_data = state["user_data"]
-            hotel_data = state["hotels"]["all_hotel_data"]
-
-            system = """
-            You are a travel assistant that summarizes hotel options for a given city.
-            You are provided:
-            - A list of available hotels with names, ratings, addresses, and prices.
-            - The user's travel details (city, duration, preferences).
-
-            Your goal:
-            - Recommend the top hotels for the user.
-            - Ensure a balance between affordability and quality.
-            - Highlight hotels suitable for the user's preferences.
-            - Strictly choose from the given hotel list (do not hallucinate).
-            - Follow the `HotelRecommendations` schema.
-
-            Hotel Data:
-            {context}
-
-            User Trip Details:
-            {query}
-            """
-
-            query = (
-                f"Travelling to {user_data['destination_city']} from {user_data['departure_date']} "
-                f"to {user_data['return_date']} with {user_data['num_travelers']} people. "
-                f"Preferences: {user_data['preferences']}."
-            )
-
-            prompt = ChatPromptTemplate.from_template(system)
-            chain = prompt | llm
-
-            logger.info(f"Invoking LLM for top hotels in {user_data['destination_city']}")
-            top_hotels = chain.invoke({
-                "context": hotel_data,
-                "query": query
-            })
-
-            logger.info(f"Successfully generated top hotel recommendations for {user_data['destination_city']}")
-            # print(top_hotels)  # ✅ removed in favor of logging
+            logger.info(f"Successfully generated top hotel recommendations for {city}")
 
             return {
                 "hotels": {
-                    "all_hotel_data": hotel_data,
+                    **state["hotels"],
                     "top_hotel_data": top_hotels
                 }
             }
 
         except Exception as e:
             logger.exception(f"Hotel recommendation summarization failed. Using fallback message.")
+            return self._summary_fallback(state)
+
+    async def asummarize_hotel_data(self, state: TravelPlanState) -> dict:
+        """
+        Async variant of `summarize_hotel_data`.
+        """
+        try:
+            logger.info("Starting top hotel recommendations generation (async)")
+
+            chain, inputs = self._build_summary_chain(state)
+            city = state["user_data"]["destination_city"]
+
+            logger.info(f"Invoking LLM for top hotels in {city}")
+            top_hotels = await chain.ainvoke(inputs)
+
+            logger.info(f"Successfully generated top hotel recommendations for {city}")
 
             return {
                 "hotels": {
-                    "all_hotel_data": state["hotels"].get("all_hotel_data", []),
-                    "top_hotel_data": "[No hotel recommendations available — consider adjusting dates, filters or searching manually.]"
+                    **state["hotels"],
+                    "top_hotel_data": top_hotels
                 }
             }
 
+        except Exception as e:
+            logger.exception(f"Hotel recommendation summarization failed. Using fallback message.")
+            return self._summary_fallback(state)
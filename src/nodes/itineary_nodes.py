@@ -1,12 +1,10 @@
 import logging
 from typing import Dict
 from langchain_core.messages import AIMessage
-from langchain_core.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
-import json
-from datetime import datetime, timedelta
 
 from src.state.state import TravelPlanState
+from src.helper.itinerary_prompt_helper import ItineraryPrompt, build_itinerary_prompt
 from src.tools.logger import logger
 
 class ItineraryNodes:
@@ -14,67 +12,54 @@ class ItineraryNodes:
         self.llm = llm
         logger.info("Initialized ItineraryNodes with provided LLM instance.")
 
-    def generate_itinerary(self, state: TravelPlanState) -> Dict:
-        logger.info("Starting itinerary generation process.")
-
-        try:
-            prompt = PromptTemplate(
-                input_variables=["user_data", "top_flight_data", "top_hotel_data", "top_attr_data"],
-                template="""
-                    You are a travel planning agent. Using only the provided information, create a **clear and structured** final travel itinerary.
-
-                    User Preferences:
-                    {user_data}
-
-                    Top Selected Flights:
-                    {top_flight_data}
-
-                    Best Matched Hotels:
-                    {top_hotel_data}
+    def _build_prompt(self, state: TravelPlanState) -> ItineraryPrompt:
+        prompt = build_itinerary_prompt(state)
+        logger.info("Prompt template for itinerary successfully created.")
+        logger.debug(f"Itinerary prompt: {prompt.text[:1500]}")
+        return prompt
 
-                    Major Attractions to Visit:
-                    {top_attr_data}
+    @staticmethod
+    def _itinerary_result(state: TravelPlanState, response) -> Dict:
+        final_itinerary = response.content if isinstance(response, AIMessage) else response
+        logger.info("Successfully generated itinerary from LLM response.")
+        logger.debug(f"Generated Itinerary: {final_itinerary[:1000]}")
 
-                    Guidelines:
-                    - Organize by **Day 1, Day 2, …**
-                    - Include flight timings, hotel check-in/out
-                    - Include 2-3 attractions per day with travel flow.
-                    - Mention what do at the attractions.
-                    - Add short tips (travel mode, time to spend).
-                    - Format neatly using bullet points + bold headers
-                    - Do not mention the total cost or anything like that.
-                    - Mention the total travel time at the end of the itinerary.
+        return {
+            **state,
+            "final_itinerary": final_itinerary,
+        }
 
-                    Now create the **final itinerary**.
-                """
-            )
-
-            logger.info("Prompt template for itinerary successfully created.")
+    def generate_itinerary(self, state: TravelPlanState) -> Dict:
+        """
+        Generate the itinerary with token streaming, so `stream_mode="messages"` consumers
+        receive it as it is written. The returned state holds the full text.
+        """
+        logger.info("Starting itinerary generation process.")
 
-            # Log user data context (truncated to avoid giant logs)
-            logger.debug(f"User Data: {json.dumps(state.get('user_data', {}), indent=2)[:500]}")
-            logger.debug(f"Top Flight Data: {str(state.get('flights', {}).get('top_flight_summary', ''))[:300]}")
-            logger.debug(f"Top Hotel Data: {str(state.get('hotels', {}).get('top_hotel_data', ''))[:300]}")
-            logger.debug(f"Top Attraction Data: {str(state.get('attractions', {}).get('top_attr_data', ''))[:300]}")
+        try:
+            prompt = self._build_prompt(state)
+            response = None
+            for chunk in self.llm.stream(prompt.text, max_completion_tokens=prompt.max_completion_tokens):
+                response = chunk if response is None else response + chunk
+            return self._itinerary_result(state, response.content if response is not None else "")
 
-            response = self.llm.invoke(
-                prompt.format(
-                    user_data=state["user_data"],
-                    top_flight_data=state["flights"]["top_flight_summary"],
-                    top_hotel_data=state["hotels"]["top_hotel_data"],
-                    top_attr_data=state["attractions"]["top_attr_data"],
-                ), max_completion_tokens=3000
-            )
+        except Exception as e:
+            logger.exception(f"Error while generating itinerary: {e}")
+            raise
 
-            final_itinerary = response.content if isinstance(response, AIMessage) else response
-            logger.info("Successfully generated itinerary from LLM response.")
-            logger.debug(f"Generated Itinerary: {final_itinerary[:1000]}")
+    async def agenerate_itinerary(self, state: TravelPlanState) -> Dict:
+        """
+        Async variant of `generate_itinerary`.
+        """
+        logger.info("Starting itinerary generation process (async).")
 
-            return {
-                **state,
-                "final_itinerary": final_itinerary,
-            }
+        try:
+            prompt = self._build_prompt(state)
+            response = None
+            async for chunk in self.llm.astream(prompt.text, max_completion_tokens=prompt.max_completion_tokens):
+                response = chunk if response is None else response + chunk
+            return self._itinerary_result(state, response.content if response is not None else "")
 
         except Exception as e:
             logger.exception(f"Error while generating itinerary: {e}")
-            raise
\ No newline at end of file
+            raise
@@ -1,11 +1,25 @@
 # src/nodes/user_nodes.py
 import logging
+import os
+import re
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 
 from src.state.state import TravelPlanState
+from src.LLMs.embeddingprovider import EmbeddingProvider
+from src.helper.semantic_cache_helper import SemanticCache, message_numbers
+from src.helper.trip_rules_helper import RuleBasedTripExtractor
+from src.helper.replan_helper import plan_refinement
 from src.tools.logger import logger
 
+# Bump whenever the extraction prompt or `UserDetails` changes so cached parses are not reused.
+EXTRACTION_PROMPT_VERSION = "v1"
+PARSE_CACHE_EMBEDDING_PROVIDER = os.getenv("PARSE_CACHE_EMBEDDING_PROVIDER", "local")
+# The local embedding is an order-invariant n-gram bag, so near-identical messages can
+# describe different trips; the similarity tier is opt-in and guarded by place mentions.
+PARSE_CACHE_SEMANTIC = os.getenv("PARSE_CACHE_SEMANTIC", "false").lower() == "true"
+USE_RULE_EXTRACTOR = os.getenv("USE_RULE_EXTRACTOR", "true").lower() == "true"
+
 class UserDetails(BaseModel):
     origin_city: str | None = Field(None, description="Starting city if mentioned")
     destination_city: str = Field(..., description="City where the user wants to go")
@@ -17,23 +31,77 @@ class UserDetails(BaseModel):
     preferences: str | None = Field(None, description="Trip type (relaxing, adventurous, cultural, etc.)")
 
 
+PLACE_MARKER_PATTERN = re.compile(r"\b(?:from|to|in|visit|visiting|at)\s+([a-z]+)")
+
+
+def _create_parse_cache():
+    if not PARSE_CACHE_SEMANTIC:
+        return SemanticCache("user_parse")
+    try:
+        embedding = EmbeddingProvider.get_embedding(PARSE_CACHE_EMBEDDING_PROVIDER)
+    except Exception as e:
+        logger.warning(f"⚠️ Parse cache embedding unavailable, exact matches only: {e}")
+        return SemanticCache("user_parse")
+
+    gazetteer = RULE_EXTRACTOR or RuleBasedTripExtractor()
+
+    def signature(normalized):
+        # Numbers, known places and words after place markers, all in order, so swapped
+        # or substituted origin/destination never reuse another trip's parse
+        return (message_numbers(normalized), gazetteer.place_mentions(normalized),
+                tuple(PLACE_MARKER_PATTERN.findall(normalized)))
+
+    return SemanticCache("user_parse", embedding=embedding, signature=signature)
+
+
+RULE_EXTRACTOR = RuleBasedTripExtractor() if USE_RULE_EXTRACTOR else None
+USER_PARSE_CACHE = _create_parse_cache()
+
+
 class UserNodes:
-    def __init__(self, llm):
+    def __init__(self, llm, parse_cache=USER_PARSE_CACHE, rule_extractor=RULE_EXTRACTOR):
         self.llm = llm
+        self.parse_cache = parse_cache
+        self.rule_extractor = rule_extractor
+        model_name = getattr(llm, "deployment_name", None) or getattr(llm, "model_name", None) or type(llm).__name__
+        self.cache_namespace = f"{model_name}|t={getattr(llm, 'temperature', None)}|{EXTRACTION_PROMPT_VERSION}"
         logger.info("Initialized UserNodes with provided LLM instance.")
 
-    def parse_user_input(self, state: TravelPlanState):
+    def _cached_user_data(self, user_message):
+        if self.parse_cache is None:
+            return None
+        user_data, tier = self.parse_cache.get(self.cache_namespace, user_message)
+        if user_data is None:
+            return None
+        logger.info(f"♻️ Reusing parsed user details ({tier} cache hit), skipping extraction LLM call.")
+        return dict(user_data)
+
+    def _rule_based_user_data(self, user_message):
+        """Deterministic extraction for formulaic messages; None when the LLM is needed."""
+        if self.rule_extractor is None:
+            return None
+        user_data, confidence = self.rule_extractor.extract(user_message)
+        logger.debug(f"Rule-based extraction confidence: {confidence}")
+        if not self.rule_extractor.is_confident(user_data, confidence):
+            logger.info("Rule-based extraction not confident, falling back to LLM.")
+            return None
+        logger.info(f"⚡ Rule-based extraction succeeded, skipping extraction LLM call. Confidence: {confidence}")
+        return user_data
+
+    def _store_user_data(self, user_message, user_data):
+        if self.parse_cache is not None and user_data:
+            self.parse_cache.set(self.cache_namespace, user_message, dict(user_data))
+
+    def _prepare_extraction(self, state: TravelPlanState):
         """
-        Extract structured travel details from user's free-text input using the LLM.
-        Output is stored in state['user_data'] as a dict.
+        Return the raw user message, extraction prompt and structured LLM.
         """
         user_message = state.get("user_data", "")
         logger.info("Starting user data extraction process.")
         logger.debug(f"Raw user message: {user_message}")
 
         if not user_message:
-            logger.warning("No user message found in state; returning empty user_data.")
-            return {"user_data": {}}
+            return user_message, None, None
 
         prompt = ChatPromptTemplate.from_messages([
             ("system", """
@@ -53,16 +121,131 @@ class UserNodes:
         structured_llm = self.llm.with_structured_output(UserDetails)
         logger.debug("Structured LLM instance created with UserDetails schema.")
 
+        return user_message, prompt, structured_llm
+
+    def _prepare_refinement(self, state: TravelPlanState):
+        """
+        Return the follow-up message, previous trip details, refinement prompt and structured LLM.
+        """
+        user_message = state.get("user_data", "")
+        previous = state.get("previous_user_data") or {}
+        logger.info("Starting follow-up refinement of the previous trip.")
+        logger.debug(f"Follow-up message: {user_message} | Previous details: {previous}")
+
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", """
+            You are a travel assistant updating an already planned trip from a follow-up message.
+
+            Rules:
+            - Start from the current trip details and apply only what the follow-up changes.
+            - Keep every field the follow-up does not mention exactly as it is.
+            - Resolve relative changes, e.g. "one more traveler" adds 1 to num_travelers.
+            - If the follow-up describes a different trip altogether, return only its details.
+            - Return all fields according to the schema.
+            """),
+            ("human", "Current trip details:\n{previous}\n\nFollow-up message:\n{user_message}")
+        ])
+
+        structured_llm = self.llm.with_structured_output(UserDetails)
+        return user_message, previous, prompt, structured_llm
+
+    def _refinement_result(self, previous, user_details):
+        user_data, branches = plan_refinement(previous, user_details.dict(), user_details.model_fields_set)
+        logger.info("✅ USER DATA REFINEMENT COMPLETED")
+        return {"user_data": user_data, "replan_branches": branches, "previous_user_data": None}
+
+    @staticmethod
+    def _refinement_fallback(previous, error):
+        # Keep the previous plan's branches and only regenerate the itinerary
+        logger.exception(f"Error refining user details, keeping the previous trip: {error}")
+        return {"user_data": previous, "replan_branches": [], "previous_user_data": None}
+
+    def refine_user_input(self, state: TravelPlanState):
+        """
+        Apply a follow-up message to the previous trip and select the branches to re-plan.
+        """
+        user_message, previous, prompt, structured_llm = self._prepare_refinement(state)
+        try:
+            messages = prompt.format_messages(previous=previous, user_message=user_message)
+            return self._refinement_result(previous, structured_llm.invoke(messages))
+        except Exception as e:
+            return self._refinement_fallback(previous, e)
+
+    async def arefine_user_input(self, state: TravelPlanState):
+        """
+        Async variant of `refine_user_input`.
+        """
+        user_message, previous, prompt, structured_llm = self._prepare_refinement(state)
+        try:
+            messages = prompt.format_messages(previous=previous, user_message=user_message)
+            return self._refinement_result(previous, await structured_llm.ainvoke(messages))
+        except Exception as e:
+            return self._refinement_fallback(previous, e)
+
+    def parse_user_input(self, state: TravelPlanState):
+        """
+        Extract structured travel details from user's free-text input using the LLM.
+        Output is stored in state['user_data'] as a dict. A follow-up to a finished plan
+        (`previous_user_data` set) is handled by `refine_user_input` instead.
+        """
+        if state.get("previous_user_data") and state.get("user_data"):
+            return self.refine_user_input(state)
+
+        user_message, prompt, structured_llm = self._prepare_extraction(state)
+        if not user_message:
+            logger.warning("No user message found in state; returning empty user_data.")
+            return {"user_data": {}}
+
+        fast_user_data = self._cached_user_data(user_message) or self._rule_based_user_data(user_message)
+        if fast_user_data is not None:
+            logger.info("✅ USER DATA EXTRACTION COMPLETED")
+            return {"user_data": fast_user_data}
+
         try:
             messages = prompt.format_messages(user_message=user_message)
             logger.info("Prompting LLM for user detail extraction.")
             logger.debug(f"Prompt Messages: {messages}")
-
             user_details = structured_llm.invoke(messages)
             logger.info("Successfully received structured user details from LLM.")
             logger.debug(f"Extracted details: {user_details}")
 
             user_data = user_details.dict()
+            self._store_user_data(user_message, user_data)
+            logger.info("User data successfully extracted and parsed.")
+        except Exception as e:
+            logger.exception(f"Error extracting user details: {e}")
+            user_data = {}
+
+        logger.info("✅ USER DATA EXTRACTION COMPLETED")
+        return {"user_data": user_data}
+
+    async def aparse_user_input(self, state: TravelPlanState):
+        """
+        Async variant of `parse_user_input`.
+        """
+        if state.get("previous_user_data") and state.get("user_data"):
+            return await self.arefine_user_input(state)
+
+        user_message, prompt, structured_llm = self._prepare_extraction(state)
+        if not user_message:
+            logger.warning("No user message found in state; returning empty user_data.")
+            return {"user_data": {}}
+
+        fast_user_data = self._cached_user_data(user_message) or self._rule_based_user_data(user_message)
+        if fast_user_data is not None:
+            logger.info("✅ USER DATA EXTRACTION COMPLETED")
+            return {"user_data": fast_user_data}
+
+        try:
+            messages = prompt.format_messages(user_message=user_message)
+            logger.info("Prompting LLM for user detail extraction (async).")
+            logger.debug(f"Prompt Messages: {messages}")
+            user_details = await structured_llm.ainvoke(messages)
+            logger.info("Successfully received structured user details from LLM.")
+            logger.debug(f"Extracted details: {user_details}")
+
+            user_data = user_details.dict()
+            self._store_user_data(user_message, user_data)
             logger.info("User data successfully extracted and parsed.")
         except Exception as e:
             logger.exception(f"Error extracting user details: {e}")
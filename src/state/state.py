@@ -20,4 +20,6 @@ class TravelPlanState(TypedDict):
     flights: FlightsState
     hotels: HotelsState
     attractions: AttractionsState
-    final_itinerary: str
\ No newline at end of file
+    final_itinerary: str
+    replan_branches: list[str] | None
+    previous_user_data: dict | None
\ No newline at end of file
@@ -0,0 +1,289 @@
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import math
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.tools.logger import logger
+
+METRICS_JSONL_PATH = os.getenv("METRICS_JSONL_PATH", "travel_agent_metrics.jsonl")
+METRICS_SAMPLE_SIZE = int(os.getenv("METRICS_SAMPLE_SIZE", 2048))
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+
+# Correlates every event of one graph run; copied into worker threads with the context.
+RUN_ID = contextvars.ContextVar("run_id", default=None)
+
+
+def new_run_id() -> str:
+    run_id = uuid.uuid4().hex[:12]
+    RUN_ID.set(run_id)
+    return run_id
+
+
+def payload_size(value) -> int:
+    """Approximate size in bytes of a node or API payload."""
+    try:
+        return len(json.dumps(value, default=str))
+    except Exception:
+        return len(str(value))
+
+
+class _Series:
+    """Counters plus a bounded window of latency samples for one (kind, name)."""
+
+    def __init__(self, sample_size):
+        self.samples = deque(maxlen=sample_size)
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.payload_bytes = 0
+
+    def quantile(self, q):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+class MetricsRegistry:
+    """
+    In-process latency/token/error accounting for graph nodes and external calls.
+
+    Every event is appended as a JSON line to `jsonl_path` (with the run id) and folded
+    into per-(kind, name) series that back `quantile`, `snapshot` and the Prometheus
+    text exposition served by `start_metrics_server`. Lines are queued and written in
+    batches by a daemon thread, so recording never does file I/O on the caller's thread
+    (or event loop); `flush` waits for the queue to drain and also runs at exit.
+    """
+
+    def __init__(self, jsonl_path=METRICS_JSONL_PATH, sample_size=METRICS_SAMPLE_SIZE):
+        self.jsonl_path = jsonl_path
+        self.sample_size = sample_size
+        self._series = {}
+        self._lock = threading.Lock()
+        self._pending = queue.Queue()
+        self._writer = None
+
+    def record(self, kind, name, seconds, error=None, prompt_tokens=0, completion_tokens=0, payload_bytes=0, **extra):
+        event = {
+            "ts": round(time.time(), 3),
+            "run_id": RUN_ID.get(),
+            "kind": kind,
+            "name": name,
+            "seconds": round(seconds, 4),
+            "error": error,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "payload_bytes": payload_bytes,
+            **extra
+        }
+        if self.jsonl_path:
+            self._enqueue(json.dumps(event, default=str) + "\n")
+        with self._lock:
+            series = self._series.get((kind, name))
+            if series is None:
+                series = self._series[(kind, name)] = _Series(self.sample_size)
+            series.samples.append(seconds)
+            series.count += 1
+            series.errors += error is not None
+            series.total_seconds += seconds
+            series.prompt_tokens += prompt_tokens
+            series.completion_tokens += completion_tokens
+            series.payload_bytes += payload_bytes
+
+    def _enqueue(self, line):
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._write_loop, daemon=True, name="metrics-writer")
+                    self._writer.start()
+                    atexit.register(self.flush)
+        self._pending.put(line)
+
+    def _write_loop(self):
+        while True:
+            lines = [self._pending.get()]
+            while True:
+                try:
+                    lines.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not write {len(lines)} metrics events: {e}")
+            finally:
+                for _ in lines:
+                    self._pending.task_done()
+
+    def flush(self):
+        """Block until every recorded event has been written to `jsonl_path`."""
+        if self._writer is not None:
+            self._pending.join()
+
+    def quantile(self, kind, name, q) -> float:
+        with self._lock:
+            series = self._series.get((kind, name))
+            return series.quantile(q) if series else 0.0
+
+    def snapshot(self) -> list:
+        """One row per (kind, name), slowest p95 first."""
+        with self._lock:
+            rows = [
+                {
+                    "kind": kind, "name": name, "count": s.count, "errors": s.errors,
+                    "p50_s": s.quantile(0.5), "p95_s": s.quantile(0.95), "total_s": s.total_seconds,
+                    "prompt_tokens": s.prompt_tokens, "completion_tokens": s.completion_tokens,
+                    "payload_bytes": s.payload_bytes,
+                }
+                for (kind, name), s in self._series.items()
+            ]
+        return sorted(rows, key=lambda row: -row["p95_s"])
+
+    def prometheus_text(self) -> str:
+        lines = [
+            "# TYPE wandermind_latency_seconds summary",
+            "# TYPE wandermind_errors_total counter",
+            "# TYPE wandermind_tokens_total counter",
+            "# TYPE wandermind_payload_bytes_total counter",
+        ]
+        for row in self.snapshot():
+            labels = f'kind="{row["kind"]}",name="{row["name"]}"'
+            lines += [
+                f'wandermind_latency_seconds{{{labels},quantile="0.5"}} {row["p50_s"]:.6f}',
+                f'wandermind_latency_seconds{{{labels},quantile="0.95"}} {row["p95_s"]:.6f}',
+                f"wandermind_latency_seconds_sum{{{labels}}} {row['total_s']:.6f}",
+                f"wandermind_latency_seconds_count{{{labels}}} {row['count']}",
+                f"wandermind_errors_total{{{labels}}} {row['errors']}",
+                f'wandermind_tokens_total{{{labels},type="prompt"}} {row["prompt_tokens"]}',
+                f'wandermind_tokens_total{{{labels},type="completion"}} {row["completion_tokens"]}',
+                f"wandermind_payload_bytes_total{{{labels}}} {row['payload_bytes']}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+METRICS = MetricsRegistry()
+
+
+@contextmanager
+def timed(kind, name, **extra):
+    """Record wall time and any exception of the wrapped block; the exception is re-raised."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        METRICS.record(kind, name, time.perf_counter() - start, error=type(e).__name__, **extra)
+        raise
+    METRICS.record(kind, name, time.perf_counter() - start, **extra)
+
+
+def instrument_node(name, node_fn):
+    """Wrap a sync or async graph node so each call records its latency, output size and errors."""
+    if inspect.iscoroutinefunction(node_fn):
+        @functools.wraps(node_fn)
+        async def wrapper(state):
+            start = time.perf_counter()
+            try:
+                update = await node_fn(state)
+            except Exception as e:
+                METRICS.record("node", name, time.perf_counter() - start, error=type(e).__name__)
+                raise
+            METRICS.record("node", name, time.perf_counter() - start, payload_bytes=payload_size(update))
+            return update
+    else:
+        @functools.wraps(node_fn)
+        def wrapper(state):
+            start = time.perf_counter()
+            try:
+                update = node_fn(state)
+            except Exception as e:
+                METRICS.record("node", name, time.perf_counter() - start, error=type(e).__name__)
+                raise
+            METRICS.record("node", name, time.perf_counter() - start, payload_bytes=payload_size(update))
+            return update
+    return wrapper
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """LangChain callback recording latency and token usage of every chat model call, tagged with its graph node."""
+
+    def __init__(self):
+        self._started = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._started[run_id] = (time.perf_counter(), (metadata or {}).get("langgraph_node", "unknown"))
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._started[run_id] = (time.perf_counter(), (metadata or {}).get("langgraph_node", "unknown"))
+
+    @staticmethod
+    def _usage(response):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt, completion = usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+        if not (prompt or completion):
+            for generations in response.generations:
+                for generation in generations:
+                    meta = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                    prompt += meta.get("input_tokens", 0)
+                    completion += meta.get("output_tokens", 0)
+        return prompt, completion
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        start, node = self._started.pop(run_id, (time.perf_counter(), "unknown"))
+        prompt, completion = self._usage(response)
+        METRICS.record("llm", node, time.perf_counter() - start, prompt_tokens=prompt, completion_tokens=completion)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        start, node = self._started.pop(run_id, (time.perf_counter(), "unknown"))
+        METRICS.record("llm", node, time.perf_counter() - start, error=type(error).__name__)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") not in ("/metrics", ""):
+            self.send_error(404)
+            return
+        body = METRICS.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=METRICS_PORT):
+    """Serve `/metrics` in Prometheus text format on a daemon thread. No-op if `port` is 0 or already started."""
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(("0.0.0.0", port), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True, name="metrics-server").start()
+            logger.info(f"📈 Metrics endpoint listening on :{port}/metrics")
+    return _server
@@ -1,47 +1,29 @@
 import os
-import pandas as pd
 from langchain_chroma import Chroma
 
 from src.LLMs.openaillm import OpenAiLLM
+from src.helper.attr_chunk_helper import build_city_chunks
+from src.helper.attr_dataset_helper import load_attractions, ATTR_DATA_PATH
+from src.helper.place_name_helper import normalize_place_name
+from src.helper.poi_index_helper import build_poi_records, POI_COLLECTION_NAME, POI_MANIFEST_FILENAME
+from src.helper.vector_ingest_helper import VectorIngestor, MANIFEST_FILENAME
 from src.tools.logger import logger
 
 
 class AttractionTools:
-    def __init__(self):
+    def __init__(self, attractions_df=None, data_path=ATTR_DATA_PATH):
+        if attractions_df is not None:
+            self.attractions_df = attractions_df
+            return
         try:
-            df = pd.read_csv("src\\Data\\combined.csv")
-            self.attractions_df = df[["name", "main_category", "categories", "city", "country", "state", "broader_category"]]
-            logger.info("✅ Successfully loaded attractions dataset from combined.csv")
+            self.attractions_df = load_attractions(data_path)
+            logger.info(f"✅ Successfully loaded attractions dataset from {data_path}")
         except Exception as e:
             logger.exception(f"❌ Failed to load attractions dataset: {e}")
 
     def create_chunks(self):
         try:
-            grouped = self.attractions_df.groupby('city')
-            chunks, metadata = [], []
-
-            for city, city_df in grouped:
-                state = city_df["state"].iloc[0]
-                country = city_df["country"].iloc[0]
-
-                text = (
-                    f"Tourist attractions in {city}, {state}, {country} include: " +
-                    " ".join(
-                        f"{row['name']} ({row['main_category']}, {row['broader_category']}) — "
-                        f"{row['categories']}."
-                        for _, row in city_df.iterrows()
-                    )
-                )
-
-                chunks.append(text)
-                metadata.append({
-                    "city": city,
-                    "state": state,
-                    "country": country,
-                    "num_attractions": len(city_df),
-                    "unique_categories": ", ".join(city_df["broader_category"].unique())
-                })
-
+            chunks, metadata = build_city_chunks(self.attractions_df)
             logger.info(f"🧩 Created text chunks and metadata for {len(chunks)} cities.")
             return chunks, metadata
 
@@ -49,27 +31,31 @@ class AttractionTools:
             logger.exception(f"❌ Error while creating attraction chunks: {e}")
             return [], []
 
-    def create_vector_db(self):
+    def create_vector_db(self, embedding=None, sync=True, vector_db_path="./vector_db/"):
+        """
+        Open the persisted Chroma store and, if `sync` is set, incrementally re-index it
+        against the dataset: only new or changed cities are embedded and removed cities
+        are deleted.
+        """
         try:
-            embedding = OpenAiLLM.get_llm_embedding()
-            vector_db_path = "./vector_db/"
+            embedding = embedding or OpenAiLLM.get_llm_embedding()
 
             if os.path.exists(vector_db_path):
                 logger.info("📁 Existing vector database found, loading from disk.")
-                db = Chroma(
-                    embedding_function=embedding,
-                    persist_directory=vector_db_path
-                )
             else:
                 logger.info("🚀 No vector database found. Creating a new one.")
+            db = Chroma(
+                embedding_function=embedding,
+                persist_directory=vector_db_path
+            )
+
+            if sync and getattr(self, "attractions_df", None) is not None:
                 chunks, metadata = self.create_chunks()
-                db = Chroma.from_texts(
-                    texts=chunks,
-                    embedding=embedding,
-                    metadatas=metadata,
-                    persist_directory=vector_db_path
-                )
-                logger.info(f"✅ Vector DB created with {len(chunks)} city chunks.")
+                if chunks:
+                    ids = [f"city:{normalize_place_name(meta['city'])}" for meta in metadata]
+                    ingestor = VectorIngestor(db, os.path.join(vector_db_path, MANIFEST_FILENAME))
+                    report = ingestor.sync(ids, chunks, metadata)
+                    logger.info(f"✅ Vector DB in sync with dataset: {report}")
 
             return db
 
@@ -77,6 +63,34 @@ class AttractionTools:
             logger.exception(f"❌ Error while creating or loading vector DB: {e}")
             return None
 
+    def create_poi_db(self, embedding=None, sync=True, vector_db_path="./vector_db/"):
+        """
+        Open the per-POI Chroma collection (one document per attraction, with `city_key`,
+        `broader_category` and `main_category` metadata for filtering) and incrementally
+        sync it against the dataset.
+        """
+        try:
+            embedding = embedding or OpenAiLLM.get_llm_embedding()
+            db = Chroma(
+                collection_name=POI_COLLECTION_NAME,
+                embedding_function=embedding,
+                persist_directory=vector_db_path
+            )
+
+            if sync and getattr(self, "attractions_df", None) is not None:
+                ids, texts, metadata = build_poi_records(self.attractions_df)
+                logger.info(f"🧩 Built {len(ids)} POI documents")
+                if ids:
+                    ingestor = VectorIngestor(db, os.path.join(vector_db_path, POI_MANIFEST_FILENAME))
+                    report = ingestor.sync(ids, texts, metadata)
+                    logger.info(f"✅ POI collection in sync with dataset: {report}")
+
+            return db
+
+        except Exception as e:
+            logger.exception(f"❌ Error while creating or loading POI collection: {e}")
+            return None
+
     def create_retriever(self):
         try:
             retriever = self.create_vector_db().as_retriever()
@@ -1,10 +1,28 @@
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
 from amadeus import ResponseError
 from src.helper.amadeus_helper import AmadeusHelper
+from src.helper.airport_index_helper import AirportIndex
+from src.helper.cache_helper import ResponseCache
+from src.helper.rate_limit_helper import RateLimiterRegistry
 from src.tools.logger import logger
+from src.tools.metrics import timed
+
+# Shared across FlightTools instances so repeated routes/dates skip the live search.
+FLIGHT_OFFERS_CACHE = ResponseCache(
+    "flight_offers",
+    ttl=int(os.getenv("FLIGHT_CACHE_TTL_SECONDS", 600)),
+    max_entries=int(os.getenv("FLIGHT_CACHE_MAX_ENTRIES", 512)),
+    stale_ttl=int(os.getenv("FLIGHT_CACHE_STALE_TTL_SECONDS", 3600)),
+)
 
 
 class FlightTools:
     def __init__(self):
+        self.airport_index = AirportIndex.get_shared()
         try:
             self.amadeus = AmadeusHelper.create_client(hostname="test")
             logger.info("✈️ Initialized Amadeus client successfully (test environment).")
@@ -13,23 +31,31 @@ class FlightTools:
             self.amadeus = None
 
     def fetch_airport_code(self, city_name: str) -> str:
-        """Convert city name to IATA airport code using Amadeus API."""
+        """Convert city name to IATA airport code, using the local index before the Amadeus API."""
+        code = self.airport_index.lookup(city_name)
+        if code:
+            logger.info(f"🛫 Found airport code for {city_name} in local index: {code}")
+            return code
+
         if not self.amadeus:
             logger.error("❌ Amadeus client not initialized. Cannot fetch airport code.")
             return None
 
         try:
-            response = self.amadeus.reference_data.locations.get(
-                keyword=city_name, subType="AIRPORT"
-            )
+            RateLimiterRegistry.throttle("amadeus")
+            with timed("external", "amadeus.locations"):
+                response = self.amadeus.reference_data.locations.get(
+                    keyword=city_name, subType="AIRPORT"
+                )
             if response.data:
                 code = response.data[0].get("iataCode")
                 if code:
                     logger.info(f"🛫 Found airport code for {city_name}: {code}")
+                    self.airport_index.remember(city_name, code)
                     return code
 
-            logger.warning(f"⚠️ No airport code found for '{city_name}', using city name fallback.")
-            return city_name[:3].upper()
+            logger.warning(f"⚠️ No airport code found for '{city_name}'.")
+            return None
 
         except ResponseError as e:
             logger.exception(f"❌ Amadeus API error while fetching airport code for '{city_name}': {e}")
@@ -51,9 +77,37 @@ class FlightTools:
             logger.error(f"❌ Invalid airport codes: {origin_city}={origin_code}, {destination_city}={destination_code}")
             return []
 
+        return self.fetch_flights_by_code(origin_code, destination_code, departure_date, adults, top_n, currency)
+
+    def fetch_flights_by_code(self, origin_code, destination_code, departure_date, adults=1, top_n=3, currency="USD"):
+        """Fetch top N cheapest flights between two already-resolved IATA codes."""
+        if not self.amadeus:
+            logger.error("❌ Amadeus client not initialized. Cannot fetch flights.")
+            return []
+
+        key = (origin_code, destination_code, departure_date, adults, currency)
         try:
-            logger.info(f"🔍 Fetching flights from {origin_code} → {destination_code} on {departure_date} for {adults} adult(s).")
+            flights = FLIGHT_OFFERS_CACHE.get_or_fetch(
+                key,
+                lambda: self._search_flight_offers(origin_code, destination_code, departure_date, adults, currency)
+            )
+            sorted_flights = flights[:top_n]
+            logger.info(f"✅ Retrieved {len(sorted_flights)} flight(s) for route {origin_code} → {destination_code}.")
+            return sorted_flights
 
+        except ResponseError as e:
+            logger.exception(f"❌ Amadeus API error while fetching flights: {e}")
+            return []
+        except Exception as e:
+            logger.exception(f"❌ Unexpected error while fetching flights: {e}")
+            return []
+
+    def _search_flight_offers(self, origin_code, destination_code, departure_date, adults, currency):
+        """Run a live Amadeus flight offers search and return all offers sorted by price. Raises on API errors."""
+        logger.info(f"🔍 Fetching flights from {origin_code} → {destination_code} on {departure_date} for {adults} adult(s).")
+
+        RateLimiterRegistry.throttle("amadeus")
+        with timed("external", "amadeus.flight_offers"):
             response = self.amadeus.shopping.flight_offers_search.get(
                 originLocationCode=origin_code,
                 destinationLocationCode=destination_code,
@@ -63,50 +117,46 @@ class FlightTools:
                 max=10
             )
 
-            if not response.data:
-                logger.warning(f"⚠️ No flight offers found for route {origin_code} → {destination_code}.")
-                return []
-
-            flights = []
-            for offer in response.data:
-                price = offer.get("price", {}).get("total", 0.0)
-                currency_code = offer.get("price", {}).get("currency", currency)
-                itineraries = offer.get("itineraries", [])
-                if not itineraries:
-                    continue
-
-                segments = itineraries[0].get("segments", [])
-                if not segments:
-                    continue
-
-                departure = segments[0]["departure"]["iataCode"]
-                arrival = segments[-1]["arrival"]["iataCode"]
-                airline = segments[0]["carrierCode"]
-                duration = itineraries[0].get("duration", "N/A")
-
-                flights.append({
-                    "airline": airline,
-                    "origin": departure,
-                    "destination": arrival,
-                    "price": float(price),
-                    "currency": currency_code,
-                    "duration": duration,
-                    "stops": len(segments) - 1,
-                    "departure_time": segments[0]["departure"]["at"],
-                    "arrival_time": segments[-1]["arrival"]["at"]
-                })
-
-            sorted_flights = sorted(flights, key=lambda x: x["price"])[:top_n]
-            logger.info(f"✅ Retrieved {len(sorted_flights)} flight(s) for route {origin_code} → {destination_code}.")
-            return sorted_flights
-
-        except ResponseError as e:
-            logger.exception(f"❌ Amadeus API error while fetching flights: {e}")
-            return []
-        except Exception as e:
-            logger.exception(f"❌ Unexpected error while fetching flights: {e}")
+        if not response.data:
+            logger.warning(f"⚠️ No flight offers found for route {origin_code} → {destination_code}.")
             return []
 
+        flights = []
+        for offer in response.data:
+            price = offer.get("price", {}).get("total", 0.0)
+            currency_code = offer.get("price", {}).get("currency", currency)
+            itineraries = offer.get("itineraries", [])
+            if not itineraries:
+                continue
+
+            segments = itineraries[0].get("segments", [])
+            if not segments:
+                continue
+
+            departure = segments[0]["departure"]["iataCode"]
+            arrival = segments[-1]["arrival"]["iataCode"]
+            airline = segments[0]["carrierCode"]
+            duration = itineraries[0].get("duration", "N/A")
+
+            flights.append({
+                "airline": airline,
+                "origin": departure,
+                "destination": arrival,
+                "price": float(price),
+                "currency": currency_code,
+                "duration": duration,
+                "stops": len(segments) - 1,
+                "departure_time": segments[0]["departure"]["at"],
+                "arrival_time": segments[-1]["arrival"]["at"]
+            })
+
+        return sorted(flights, key=lambda x: x["price"])
+
+    @staticmethod
+    def get_cache_stats() -> dict:
+        """Hit/miss/coalesce counters for the shared flight offers cache."""
+        return FLIGHT_OFFERS_CACHE.stats()
+
     def fetch_return_flights(self, origin_city, destination_city, return_date, adults=1, top_n=3, currency="USD"):
         """Fetch return flights (destination → origin)."""
         try:
@@ -115,3 +165,68 @@ class FlightTools:
         except Exception as e:
             logger.exception(f"❌ Error while fetching return flights: {e}")
             return []
+
+    def fetch_round_trip_flights(self, origin_city, destination_city, departure_date, return_date=None,
+                                 adults=1, top_n=3, currency="USD", max_concurrency=2, timeout=20.0):
+        """
+        Fetch outbound and return flights together.
+
+        Each city's IATA code is resolved once, then both legs are searched concurrently
+        with at most `max_concurrency` Amadeus calls in flight. `timeout` is a deadline in
+        seconds for each phase; a leg that misses it comes back empty.
+        Returns `(outbound_flights, return_flights)`.
+        """
+        if not self.amadeus:
+            logger.error("❌ Amadeus client not initialized. Cannot fetch flights.")
+            return [], []
+
+        executor = ThreadPoolExecutor(max_workers=max(1, max_concurrency), thread_name_prefix="amadeus")
+        try:
+            origin_code, destination_code = self._collect(
+                [
+                    self._submit(executor, self.fetch_airport_code, origin_city),
+                    self._submit(executor, self.fetch_airport_code, destination_city),
+                ],
+                timeout, default=None, label="airport code lookup"
+            )
+            if not origin_code or not destination_code:
+                logger.error(f"❌ Invalid airport codes: {origin_city}={origin_code}, {destination_city}={destination_code}")
+                return [], []
+
+            legs = [self._submit(executor, self.fetch_flights_by_code, origin_code, destination_code,
+                                 departure_date, adults, top_n, currency)]
+            if return_date:
+                logger.info(f"🔄 Fetching return flights for {destination_code} → {origin_code} on {return_date}.")
+                legs.append(self._submit(executor, self.fetch_flights_by_code, destination_code, origin_code,
+                                         return_date, adults, top_n, currency))
+
+            results = self._collect(legs, timeout, default=[], label="flight search")
+            outbound_flights = results[0]
+            return_flights = results[1] if return_date else []
+            return outbound_flights, return_flights
+
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _submit(executor, fn, *args):
+        """Submit `fn` in a copy of the caller's context so worker metrics keep the run id."""
+        return executor.submit(contextvars.copy_context().run, fn, *args)
+
+    @staticmethod
+    def _collect(futures, timeout, default, label):
+        """Wait for futures against a shared deadline, substituting `default` on timeout or error."""
+        deadline = time.monotonic() + timeout
+        results = []
+        for future in futures:
+            remaining = max(0.0, deadline - time.monotonic())
+            try:
+                results.append(future.result(timeout=remaining))
+            except FutureTimeoutError:
+                logger.warning(f"⚠️ {label} exceeded {timeout}s deadline.")
+                future.cancel()
+                results.append(default)
+            except Exception as e:
+                logger.exception(f"❌ Error during {label}: {e}")
+                results.append(default)
+        return results
@@ -2,7 +2,11 @@ from amadeus import ResponseError
 from serpapi import GoogleSearch
 
 from src.helper.amadeus_helper import AmadeusHelper
+from src.helper.cache_helper import ResponseCache, MemoryCacheBackend, SQLiteCacheBackend
+from src.helper.place_name_helper import normalize_place_name
+from src.helper.rate_limit_helper import RateLimiterRegistry
 from src.tools.logger import logger
+from src.tools.metrics import timed
 
 import os
 import dotenv
@@ -10,6 +14,25 @@ import dotenv
 dotenv.load_dotenv()
 SERP_API_KEY = os.getenv("SERP_API_KEY")
 
+HOTEL_CACHE_TTL_SECONDS = int(os.getenv("HOTEL_CACHE_TTL_SECONDS", 3600))
+HOTEL_CACHE_MAX_ENTRIES = int(os.getenv("HOTEL_CACHE_MAX_ENTRIES", 1024))
+HOTEL_CACHE_BACKEND = os.getenv("HOTEL_CACHE_BACKEND", "memory")  # "memory" or "sqlite"
+HOTEL_CACHE_PATH = os.getenv("HOTEL_CACHE_PATH", os.path.join("cache", "hotel_cache.sqlite3"))
+
+
+def _create_hotel_cache():
+    if HOTEL_CACHE_BACKEND == "sqlite":
+        backend = SQLiteCacheBackend(HOTEL_CACHE_PATH, max_entries=HOTEL_CACHE_MAX_ENTRIES)
+    else:
+        backend = MemoryCacheBackend(max_entries=HOTEL_CACHE_MAX_ENTRIES)
+    logger.info(f"Hotel search cache using {type(backend).__name__} (ttl={HOTEL_CACHE_TTL_SECONDS}s)")
+    return ResponseCache("hotel_search", ttl=HOTEL_CACHE_TTL_SECONDS,
+                         max_entries=HOTEL_CACHE_MAX_ENTRIES, backend=backend)
+
+
+# Shared across HotelTools instances; SerpAPI is billed per call.
+HOTEL_SEARCH_CACHE = _create_hotel_cache()
+
 class HotelTools:
     def __init__(self):
         self.amadeus = AmadeusHelper.create_client(hostname="test")
@@ -21,6 +44,21 @@ class HotelTools:
             f"Fetching hotels for {name} | check-in: {check_in}, check-out: {check_out}, adults: {adults}"
         )
 
+        # Same city however it was typed ("Goa", "goa ") shares one cache entry
+        key = (normalize_place_name(name), check_in, check_out, adults, currency)
+        try:
+            properties = HOTEL_SEARCH_CACHE.get_or_fetch(
+                key, lambda: self._search_hotels(name, check_in, check_out, adults, currency)
+            )
+            logger.info(f"✅ Retrieved {len(properties)} hotel results for {name}")
+            return properties
+
+        except Exception as e:
+            logger.error(f"❌ Error fetching hotels for {name}: {e}", exc_info=True)
+            return []
+
+    def _search_hotels(self, name, check_in, check_out, adults, currency):
+        """Run a live Google Hotels search via SerpAPI. Raises if SerpAPI reports an error."""
         params = {
             "engine": "google_hotels",
             "q": name,
@@ -31,13 +69,15 @@ class HotelTools:
             "api_key": SERP_API_KEY
         }
 
-        try:
+        RateLimiterRegistry.throttle("serpapi")
+        with timed("external", "serpapi.google_hotels"):
             search = GoogleSearch(params)
             results = search.get_dict()
-            properties = results.get("properties", [])
-            logger.info(f"✅ Retrieved {len(properties)} hotel results for {name}")
-            return properties
+        if results.get("error"):
+            raise RuntimeError(f"SerpAPI error: {results['error']}")
+        return results.get("properties", [])
 
-        except Exception as e:
-            logger.error(f"❌ Error fetching hotels for {name}: {e}", exc_info=True)
-            return []
+    @staticmethod
+    def get_cache_stats() -> dict:
+        """Hit/miss/coalesce counters for the shared hotel search cache."""
+        return HOTEL_SEARCH_CACHE.stats()
@@ -6,17 +6,27 @@ from reportlab.lib.enums import TA_LEFT
 import markdown2
 from bs4 import BeautifulSoup
 from io import BytesIO
+import time
 
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
 
 from src.helper.output_check_helper import _extract_recos
 from src.tools.logger import logger
+from src.tools.metrics import new_run_id
+
+# summarize node -> (state branch, recommendations key, label); shown as soon as the node finishes
+BRANCH_RESULTS = {
+    "summarize_flight_data": ("flights", "top_flight_summary", "✈️ Flight options"),
+    "summarize_hotel_data": ("hotels", "top_hotel_data", "🏨 Hotel options"),
+    "summarize_attr_data": ("attractions", "top_attr_data", "📍 Top attractions"),
+}
 
 
 class DisplayResultStreamlit:
-    def __init__(self, graph, user_message):
+    def __init__(self, graph, user_message, session=None):
         self.graph = graph
         self.user_message = user_message
+        self.session = session
         logger.info("DisplayResultStreamlit initialized with new user message")
 
     def generate_pdf(self, markdown_text: str) -> bytes:
@@ -68,71 +78,139 @@ class DisplayResultStreamlit:
             logger.error(f"❌ Error generating itinerary PDF: {e}", exc_info=True)
             return b""
 
+    @staticmethod
+    def _render_warnings(state):
+        """Show fallback warnings for branches that failed or came back empty."""
+        # ⚠️ Show fallback warnings *only if triggered*
+        flights = state.get("flights", {})
+        if isinstance(flights.get("top_flight_summary"), str) and (flights["top_flight_summary"].startswith("[No") or flights["top_flight_summary"].find('[')== flights["top_flight_summary"].find(']')-1):
+            st.warning("✈️ Live flight data unavailable — showing itinerary without flight recommendations.")
+
+        hotels = state.get("hotels", {})
+        if isinstance(hotels.get("top_hotel_data"), str) and hotels["top_hotel_data"].startswith("[No"):
+            st.warning("🏨 Hotel data unavailable — some accommodation details could not be fetched.")
+
+        attractions = state.get("attractions", {})
+        if isinstance(attractions.get("top_attr_data"), str) and attractions["top_attr_data"].startswith("[No"):
+            st.warning("📍 Attraction recommendations limited — results based on available local data.")
+
+        # 2) warnings for *empty* but valid structured outputs
+        if not isinstance(flights.get("top_flight_summary"), str) and len(_extract_recos(flights.get("top_flight_summary"))) == 0:
+            st.warning("✈️ No flight options retrieved. Please review availability manually.")
+        if not isinstance(hotels.get("top_hotel_data"), str) and len(_extract_recos(hotels.get("top_hotel_data"))) == 0:
+            st.warning("🏨 No hotel options retrieved.")
+        if not isinstance(attractions.get("top_attr_data"), str) and len(_extract_recos(attractions.get("top_attr_data"))) == 0:
+            st.warning("📍 No attraction options retrieved.")
+
+    @staticmethod
+    def _render_branch_result(node, value):
+        """Show a branch's recommendations as soon as its summarize node finishes."""
+        branch_key, result_key, title = BRANCH_RESULTS[node]
+        result = value.get(branch_key, {}).get(result_key)
+        recos = _extract_recos(result)
+
+        with st.expander(f"{title} ({len(recos)})", expanded=False):
+            if isinstance(result, str):
+                st.caption(result or "No recommendations.")
+            for reco in recos:
+                st.write(reco.model_dump() if hasattr(reco, "model_dump") else reco)
+        logger.info(f"Partial result displayed for {node}")
+
+    def _render_final_itinerary(self, state, itinerary_placeholder):
+        itinerary = state["final_itinerary"]
+        self._render_warnings(state)
+
+        # 🧳 Replace the streamed text with the final itinerary
+        itinerary_placeholder.markdown(itinerary)
+
+        # ✅ Generate and show PDF download button
+        pdf_data = self.generate_pdf(itinerary)
+        st.download_button(
+            label="📄 Download Itinerary as PDF",
+            data=pdf_data,
+            file_name="travel_itinerary.pdf",
+            mime="application/pdf"
+        )
+        logger.info("Final itinerary displayed and PDF download enabled")
+
     def render_result_on_ui(self):
-        """Stream results from LangGraph and render them on Streamlit UI."""
+        """
+        Stream results from LangGraph and render them on Streamlit UI.
+
+        Uses `stream_mode=["updates", "messages"]`: branch recommendations are shown as
+        each summarize node finishes, and itinerary tokens are rendered as they arrive.
+        With a `PlanSession` and no user message, the session's checkpointed run is
+        continued instead of starting a new one.
+        """
         graph = self.graph
         user_message = self.user_message
-        logger.info("Displaying results on Streamlit UI")
-
-        with st.chat_message("user"):
-            st.write(user_message)
-            logger.debug(f"User message displayed: {user_message}")
-        with st.spinner("⌛Creating your itinerary..."):
-            try:
-                for event in graph.stream({"user_data": user_message}):
-                    for key, value in event.items():
+        run_id = new_run_id()
+        logger.info(f"Displaying results on Streamlit UI (run {run_id})")
+
+        if self.session is not None:
+            graph_input, config = self.session.run_input(user_message), self.session.config
+        else:
+            graph_input, config = {"user_data": user_message}, None
+
+        if user_message is not None:
+            with st.chat_message("user"):
+                st.write(user_message)
+                logger.debug(f"User message displayed: {user_message}")
+
+        assistant = st.chat_message("assistant")
+        with assistant:
+            status = st.empty()
+            status.caption("⌛Creating your itinerary...")
+        itinerary_placeholder = None
+        itinerary_text = ""
+        start = time.perf_counter()
+        first_content_at = None
+        rendered = False
+
+        try:
+            for mode, payload in graph.stream(graph_input, config, stream_mode=["updates", "messages"]):
+                if mode == "messages":
+                    chunk, metadata = payload
+                    if metadata.get("langgraph_node") != "generate_itinerary" or not getattr(chunk, "content", ""):
+                        continue
+                    if itinerary_placeholder is None:
+                        with assistant:
+                            st.markdown("### ✈️ Final Itinerary")
+                            itinerary_placeholder = st.empty()
+                    itinerary_text += chunk.content
+                    itinerary_placeholder.markdown(itinerary_text + "▌")
+                    rendered = True
+
+                else:
+                    for key, value in payload.items():
                         if not value:
                             continue
-
-                        if isinstance(value, dict) and "final_itinerary" in value:
-                            itinerary = value["final_itinerary"]
-
-                            # 🔍 Access the full state object
-                            state = value  # this dict contains flights, hotels, attractions, final_itinerary
-
-                            with st.chat_message("assistant"):
-
-                                # ⚠️ Show fallback warnings *only if triggered*
-                                flights = state.get("flights", {})
-                                if isinstance(flights.get("top_flight_summary"), str) and (flights["top_flight_summary"].startswith("[No") or flights["top_flight_summary"].find('[')== flights["top_flight_summary"].find(']')-1):
-                                    st.warning("✈️ Live flight data unavailable — showing itinerary without flight recommendations.")
-
-                                hotels = state.get("hotels", {})
-                                if isinstance(hotels.get("top_hotel_data"), str) and hotels["top_hotel_data"].startswith("[No"):
-                                    st.warning("🏨 Hotel data unavailable — some accommodation details could not be fetched.")
-
-                                attractions = state.get("attractions", {})
-                                if isinstance(attractions.get("top_attr_data"), str) and attractions["top_attr_data"].startswith("[No"):
-                                    st.warning("📍 Attraction recommendations limited — results based on available local data.")
-
-                                        # 2) warnings for *empty* but valid structured outputs
-                                if not isinstance(flights.get("top_flight_summary"), str) and len(_extract_recos(flights.get("top_flight_summary"))) == 0:
-                                    st.warning("✈️ No flight options retrieved. Please review availability manually.")
-                                if not isinstance(hotels.get("top_hotel_data"), str) and len(_extract_recos(hotels.get("top_hotel_data"))) == 0:
-                                    st.warning("🏨 No hotel options retrieved.")
-                                if not isinstance(attractions.get("top_attr_data"), str) and len(_extract_recos(attractions.get("top_attr_data"))) == 0:
-                                    st.warning("📍 No attraction options retrieved.")
-
-                                # 🧳 Now show the final itinerary
-                                st.markdown("### ✈️ Final Itinerary")
-                                print(itinerary)
-                                st.write(itinerary)
-
-
-                                # ✅ Generate and show PDF download button
-                                pdf_data = self.generate_pdf(itinerary)
-                                st.download_button(
-                                    label="📄 Download Itinerary as PDF",
-                                    data=pdf_data,
-                                    file_name="travel_itinerary.pdf",
-                                    mime="application/pdf"
-                                )
-                            logger.info("Final itinerary displayed and PDF download enabled")
-
+                        if key in BRANCH_RESULTS:
+                            with assistant:
+                                self._render_branch_result(key, value)
+                        elif isinstance(value, dict) and "final_itinerary" in value:
+                            with assistant:
+                                if itinerary_placeholder is None:
+                                    st.markdown("### ✈️ Final Itinerary")
+                                    itinerary_placeholder = st.empty()
+                                self._render_final_itinerary(value, itinerary_placeholder)
                         elif hasattr(value, "content"):
-                            with st.chat_message("assistant"):
+                            with assistant:
                                 st.write(value.content)
                             logger.debug("Assistant message displayed in stream")
+                        else:
+                            continue
+                        rendered = True
+                        status.caption(f"⌛Creating your itinerary... ({key} done)")
+
+                if first_content_at is None and rendered:
+                    first_content_at = time.perf_counter() - start
+                    logger.info(f"⏱️ Time to first content: {first_content_at:.2f}s")
 
-            except Exception as e:
-                logger.error(f"❌ Error during UI streaming or rendering: {e}", exc_info=True)
+            status.empty()
+            logger.info(f"⏱️ Itinerary streamed in {time.perf_counter() - start:.2f}s")
+
+        except Exception as e:
+            logger.error(f"❌ Error during UI streaming or rendering: {e}", exc_info=True)
+            if self.session is not None and self.session.pending_nodes():
+                status.caption("⚠️ Planning stopped part-way. Completed steps are saved; use 🔁 Resume last plan to continue.")